@@ -22,9 +22,17 @@ Ejemplo de uso:
 __version__ = "1.0.0"
 __author__ = "Agustín Estévez Domínguez"
 
-# Exportar los módulos principales para fácil acceso
-from . import entities
-from . import use_cases
-from . import adapters
+# Exportar los módulos principales para fácil acceso; se importan al primer uso (PEP 562)
+import importlib
 
-__all__ = ['entities', 'use_cases', 'adapters']
\ No newline at end of file
+__all__ = ['entities', 'use_cases', 'adapters']
+
+
+def __getattr__(name):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return importlib.import_module(f'.{name}', __name__)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,25 @@
+# Bulk import/export module
+# Importación perezosa (PEP 562): la importación en paralelo carga concurrent.futures solo si se usa
+import importlib
+
+_EXPORTS = {
+    'UserImporter': 'user_importer',
+    'ParallelUserImporter': 'parallel_user_importer',
+    'UserExporter': 'user_exporter',
+    'JobReport': 'job_stats',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
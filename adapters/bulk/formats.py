@@ -0,0 +1,82 @@
+import csv
+import json
+import os
+from itertools import islice
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+
+FIELDS = ('username', 'lastname', 'dni')
+FORMATS = ('csv', 'jsonl')
+
+
+def detect_format(path: str, fmt: Optional[str] = None) -> str:
+    if fmt:
+        if fmt not in FORMATS:
+            raise ValueError(f"Formato no soportado: {fmt}")
+        return fmt
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    raise ValueError(f"No se puede deducir el formato de {path}; indica 'csv' o 'jsonl'")
+
+
+def read_rows(file: IO[str], fmt: str) -> Iterator[Tuple[str, str, str]]:
+    # Generador fila a fila: nunca se carga el archivo completo en memoria
+    if fmt == 'csv':
+        for record in csv.DictReader(file):
+            yield tuple(record.get(name) for name in FIELDS)
+    else:
+        yield from parse_jsonl_lines(file)
+
+
+class RowError:
+    """Línea que no se pudo convertir en fila; el importador la cuenta como error de esa fila."""
+
+    __slots__ = ('message',)
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+def parse_jsonl_lines(lines: Iterable[str], first_line: int = 1) -> Iterator[Tuple[str, str, str]]:
+    # first_line numera los errores cuando las líneas son un bloque del archivo.
+    # Una línea dañada no detiene la importación: se emite un RowError en su lugar
+    for line_number, line in enumerate(lines, start=first_line):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield RowError(f"Línea {line_number} no es JSON válido: {e}")
+            continue
+        if not isinstance(record, dict):
+            yield RowError(f"Línea {line_number} no es un objeto JSON")
+            continue
+        yield tuple(record.get(name) for name in FIELDS)
+
+
+class RowWriter:
+    def __init__(self, file: IO[str], fmt: str):
+        self.file = file
+        self.fmt = fmt
+        if fmt == 'csv':
+            self._csv = csv.writer(file)
+            self._csv.writerow(FIELDS)
+
+    def write_rows(self, rows: Iterable[Tuple[str, str, str]]) -> None:
+        if self.fmt == 'csv':
+            self._csv.writerows(rows)
+        else:
+            self.file.writelines(
+                json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False) + '\n' for row in rows
+            )
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,41 @@
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import List
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_bytes() -> int:
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux devuelve KiB, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+@dataclass
+class JobReport:
+    rows: int = 0
+    written: int = 0
+    errors: int = 0
+    error_samples: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+    peak_rss: int = 0
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def finish(self) -> 'JobReport':
+        self.elapsed = time.perf_counter() - self._started
+        self.peak_rss = peak_rss_bytes()
+        return self
+
+    def __str__(self):
+        return (f"{self.rows} filas, {self.written} escritas, {self.errors} errores en {self.elapsed:.2f}s "
+                f"({self.rows_per_sec:,.0f} filas/s, pico RSS {self.peak_rss / 2**20:.1f} MiB)")
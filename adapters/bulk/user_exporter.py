@@ -0,0 +1,27 @@
+from typing import IO, Optional
+from use_cases import UserRepositoryInterface
+from .formats import RowWriter, chunked, detect_format
+from .job_stats import JobReport
+
+
+class UserExporter:
+    """Exporta usuarios a CSV o JSONL recorriendo el repositorio sin construir la lista completa."""
+
+    def __init__(self, repository: UserRepositoryInterface, chunk_size: int = 10000):
+        self.repository = repository
+        self.chunk_size = chunk_size
+
+    def export_file(self, path: str, fmt: Optional[str] = None) -> JobReport:
+        fmt = detect_format(path, fmt)
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            return self.export_stream(file, fmt)
+
+    def export_stream(self, file: IO[str], fmt: str) -> JobReport:
+        report = JobReport()
+        writer = RowWriter(file, fmt)
+        rows = ((user._username, user._lastname, user._dni) for user in self.repository.iter_users())
+        for chunk in chunked(rows, self.chunk_size):
+            writer.write_rows(chunk)
+            report.rows += len(chunk)
+            report.written += len(chunk)
+        return report.finish()
@@ -0,0 +1,56 @@
+from typing import IO, Iterable, Optional, Sequence
+from use_cases import BulkCreateResult, BulkCreateUsersUseCase, BulkRowError, UserRepositoryInterface
+from .formats import RowError, chunked, detect_format, read_rows
+from .job_stats import JobReport
+
+
+class UserImporter:
+    """Importa usuarios desde CSV o JSONL por bloques y con memoria acotada.
+
+    Cada bloque se valida a través de User y se escribe con save_many del
+    repositorio en lotes de batch_size.
+    """
+
+    def __init__(self, repository: UserRepositoryInterface, chunk_size: int = 10000,
+                 batch_size: int = 1000, max_error_samples: int = 100):
+        self.repository = repository
+        self.chunk_size = chunk_size
+        self.max_error_samples = max_error_samples
+        # La detección de duplicados obligaría a recordar todos los DNIs importados
+        self.bulk_create = BulkCreateUsersUseCase(repository, batch_size=batch_size, detect_duplicates=False)
+
+    def import_file(self, path: str, fmt: Optional[str] = None) -> JobReport:
+        fmt = detect_format(path, fmt)
+        with open(path, newline='', encoding='utf-8') as file:
+            return self.import_stream(file, fmt)
+
+    def import_stream(self, file: IO[str], fmt: str) -> JobReport:
+        return self.import_rows(read_rows(file, fmt))
+
+    def import_rows(self, rows: Iterable[Sequence[str]]) -> JobReport:
+        report = JobReport()
+        for chunk in chunked(rows, self.chunk_size):
+            self._add_chunk(report, len(chunk), self._execute_chunk(chunk))
+        return report.finish()
+
+    def _execute_chunk(self, chunk: list) -> BulkCreateResult:
+        if not any(type(row) is RowError for row in chunk):
+            return self.bulk_create.execute(chunk)
+        # Las líneas ilegibles se apartan y las filas de los errores se llevan a su posición en el bloque
+        positions = [index for index, row in enumerate(chunk) if type(row) is not RowError]
+        result = self.bulk_create.execute([chunk[index] for index in positions])
+        for error in result.errors:
+            error.row = positions[error.row]
+        result.errors.extend(BulkRowError(index, '', row.message)
+                             for index, row in enumerate(chunk) if type(row) is RowError)
+        result.errors.sort(key=lambda error: error.row)
+        return result
+
+    def _add_chunk(self, report: JobReport, rows: int, result: BulkCreateResult) -> None:
+        # Las filas de result son relativas al bloque
+        for error in result.errors:
+            if len(report.error_samples) < self.max_error_samples:
+                report.error_samples.append(f"fila {report.rows + error.row + 1}: {error.error}")
+        report.rows += rows
+        report.written += result.created
+        report.errors += len(result.errors)
@@ -1 +1,27 @@
-# Controllers module
\ No newline at end of file
+# Controllers module
+# Importación perezosa (PEP 562): usar UserController no carga http.server
+import importlib
+
+_EXPORTS = {
+    'UserController': 'user_controller',
+    'CreateBatcher': 'user_controller',
+    'HttpError': 'user_controller',
+    'UserHTTPServer': 'http_server',
+    'make_server': 'http_server',
+    'serve': 'http_server',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
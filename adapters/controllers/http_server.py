@@ -0,0 +1,133 @@
+import os
+import signal
+import socket
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List
+from urllib.parse import parse_qsl, urlsplit
+from .user_controller import JSON_CONTENT_TYPE, UserController
+
+
+class UserRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1: las conexiones se mantienen abiertas (keep-alive) entre peticiones
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    controller: UserController = None
+
+    def _dispatch(self):
+        url = urlsplit(self.path)
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            # Sin una longitud válida no se sabe dónde acaba el cuerpo: se responde y se cierra la conexión
+            self.close_connection = True
+            error = {'error': f"Content-Length no válido: {self.headers.get('Content-Length')}"}
+            self._send(400, JSON_CONTENT_TYPE, self.controller.serializer.dumps(error))
+            return
+        body = self.rfile.read(length) if length else b''
+        status, content_type, data = self.controller.respond(self.command, url.path, dict(parse_qsl(url.query)),
+                                                             body)
+        self._send(status, content_type, data)
+
+    def _send(self, status: int, content_type: str, data: bytes) -> None:
+        self.send_response(status)
+        if data:
+            self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _dispatch
+
+    def log_message(self, format, *args):
+        # Sin log por petición: escribir en stderr limita el throughput
+        pass
+
+
+class UserHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def make_server(controller: UserController, host: str = '127.0.0.1', port: int = 8000,
+                listen_socket: socket.socket = None) -> UserHTTPServer:
+    """Crea el servidor; con listen_socket reutiliza un socket ya abierto (pre-fork)."""
+    handler = type('BoundUserRequestHandler', (UserRequestHandler,), {'controller': controller})
+    if listen_socket is None:
+        return UserHTTPServer((host, port), handler)
+    server = UserHTTPServer(listen_socket.getsockname()[:2], handler, bind_and_activate=False)
+    server.socket.close()
+    server.socket = listen_socket
+    server.server_address = listen_socket.getsockname()
+    return server
+
+
+def serve(controller_factory: Callable[[], UserController], host: str = '127.0.0.1', port: int = 8000,
+          workers: int = 1) -> None:
+    """Sirve la API. Con workers > 1 se hace pre-fork: todos los procesos aceptan del mismo socket.
+
+    controller_factory se llama dentro de cada worker para que cada proceso abra
+    su propio repositorio (en modo multiproceso si comparten archivo).
+    """
+    listen_socket = socket.create_server((host, port), backlog=UserHTTPServer.request_queue_size)
+    if workers <= 1:
+        _run_worker(controller_factory, listen_socket)
+        return
+    if not hasattr(os, 'fork'):
+        raise RuntimeError("El modo pre-fork requiere os.fork (sistemas POSIX)")
+    children: List[int] = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            # Hasta que el worker tenga servidor, SIGTERM lo detiene como un Ctrl+C
+            signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+            status = 0
+            try:
+                _run_worker(controller_factory, listen_socket)
+            except KeyboardInterrupt:
+                pass
+            except BaseException:
+                status = 1
+            finally:
+                os._exit(status)
+        children.append(pid)
+    # SIGTERM al proceso padre detiene también a los workers
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        while children:
+            os.waitpid(children[0], 0)
+            children.pop(0)
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except (ChildProcessError, ProcessLookupError):
+                pass
+        listen_socket.close()
+
+
+def _raise_keyboard_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def _run_worker(controller_factory: Callable[[], UserController], listen_socket: socket.socket) -> None:
+    controller = controller_factory()
+    server = make_server(controller, listen_socket=listen_socket)
+    if threading.current_thread() is threading.main_thread():
+        # SIGTERM (p. ej. el del proceso padre) termina serve_forever con normalidad: el repositorio
+        # se cierra y vuelca lo pendiente (write-behind, journal). shutdown() espera a que
+        # serve_forever salga, así que no puede llamarse desde el propio manejador
+        signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=server.shutdown).start())
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        close = getattr(controller.repository, 'close', None)
+        if close is not None:
+            close()
@@ -0,0 +1,249 @@
+import logging
+import re
+import threading
+from dataclasses import asdict
+from typing import Dict, List, Optional, Tuple
+from use_cases import (BulkCreateUsersUseCase, CreateUserUseCase, DeleteUserUseCase, FindUserUseCase,
+                       ListUsersUseCase, ReadOnlyRepositoryError, UpdateUserUseCase, UserRepositoryInterface)
+from entities import User
+from adapters.metrics import InstrumentedUserRepository, MetricsRegistry, instrument_use_case
+from adapters.repositories import ChangeFeed, ChangeFeedGapError, ChangeFeedUserRepository
+from adapters.repositories.serializers import get_serializer
+
+logger = logging.getLogger(__name__)
+
+_USER_PATH = re.compile(r'^/users/([^/]+)$')
+_LIST_PARAMS = ('cursor', 'lastname_prefix', 'username_contains')
+JSON_CONTENT_TYPE = 'application/json; charset=utf-8'
+METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class CreateBatcher:
+    """Agrupa las altas concurrentes en un único save_many (group commit).
+
+    El primer hilo que encuentra la cola libre hace de líder: confirma todo lo
+    pendiente en lotes de max_batch mientras los demás hilos esperan su turno.
+    """
+
+    def __init__(self, repository: UserRepositoryInterface, max_batch: int = 1000):
+        self.repository = repository
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._pending: List[list] = []
+        self._flushing = False
+
+    def submit(self, user: User) -> User:
+        # [usuario, evento de confirmación, error]
+        entry = [user, threading.Event(), None]
+        with self._lock:
+            self._pending.append(entry)
+            leader = not self._flushing
+            self._flushing = True
+        if leader:
+            self._drain()
+        entry[1].wait()
+        if entry[2] is not None:
+            raise entry[2]
+        return user
+
+    def _drain(self) -> None:
+        while True:
+            with self._lock:
+                batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+                if not batch:
+                    self._flushing = False
+                    return
+            error = None
+            try:
+                self.repository.save_many([entry[0] for entry in batch])
+            except Exception as e:
+                error = e
+            for entry in batch:
+                entry[2] = error
+                entry[1].set()
+
+
+class UserController:
+    """Expone los casos de uso como endpoints JSON, sin depender de ningún framework.
+
+        POST   /users          alta            GET    /users/{dni}   consulta
+        GET    /users          listado         PUT    /users/{dni}   actualización
+        POST   /users/bulk     alta masiva     DELETE /users/{dni}   baja
+        GET    /metrics        métricas en formato Prometheus (solo con metrics)
+        GET    /changes        cambios con seq > since, entrega at-most-once (solo con change_feed)
+
+    handle() recibe método, ruta, parámetros de consulta y cuerpo, y devuelve
+    (estado HTTP, cuerpo JSON ya serializado).
+    """
+
+    def __init__(self, repository: UserRepositoryInterface, batch_creates: bool = False,
+                 serializer: Optional[str] = None, metrics: Optional[MetricsRegistry] = None,
+                 change_feed: Optional[ChangeFeed] = None):
+        self.metrics = metrics
+        self.change_feed = change_feed
+        if change_feed is not None:
+            repository = ChangeFeedUserRepository(repository, change_feed)
+        if metrics is not None:
+            repository = InstrumentedUserRepository(repository, metrics)
+        self.repository = repository
+        self.serializer = get_serializer(serializer)
+        self.create_user = CreateUserUseCase(repository)
+        self.find_user = FindUserUseCase(repository)
+        self.list_users = ListUsersUseCase(repository)
+        self.update_user = UpdateUserUseCase(repository)
+        self.delete_user = DeleteUserUseCase(repository)
+        self.bulk_create = BulkCreateUsersUseCase(repository)
+        if metrics is not None:
+            for use_case in (self.create_user, self.find_user, self.list_users, self.update_user,
+                             self.delete_user, self.bulk_create):
+                instrument_use_case(use_case, metrics)
+        self.batcher = CreateBatcher(repository) if batch_creates else None
+
+    def handle(self, method: str, path: str, query: Dict[str, str], body: bytes) -> Tuple[int, bytes]:
+        status, _, data = self.respond(method, path, query, body)
+        return status, data
+
+    def respond(self, method: str, path: str, query: Dict[str, str], body: bytes) -> Tuple[int, str, bytes]:
+        """Como handle(), pero devuelve también el Content-Type de la respuesta."""
+        if path == '/metrics' and method == 'GET' and self.metrics is not None:
+            return 200, METRICS_CONTENT_TYPE, self.metrics.export_prometheus().encode('utf-8')
+        try:
+            status, payload = self._route(method, path, query, body)
+        except HttpError as e:
+            status, payload = e.status, {'error': str(e)}
+        except ReadOnlyRepositoryError as e:
+            # Réplica de solo lectura: las mutaciones se envían al escritor
+            status, payload = 405, {'error': str(e)}
+        except Exception:
+            # Un fallo inesperado del repositorio no debe cortar la conexión ni devolver HTML
+            logger.exception("Error al atender %s %s", method, path)
+            status, payload = 500, {'error': "Error interno del servidor"}
+        return status, JSON_CONTENT_TYPE, b'' if payload is None else self.serializer.dumps(payload)
+
+    def _route(self, method: str, path: str, query: Dict[str, str], body: bytes):
+        if path == '/users':
+            if method == 'POST':
+                return self.create(self._json(body))
+            if method == 'GET':
+                return self.list(query)
+            raise HttpError(405, f"Método {method} no permitido en {path}")
+        if path == '/users/bulk':
+            if method == 'POST':
+                return self.bulk(self._json(body))
+            raise HttpError(405, f"Método {method} no permitido en {path}")
+        if path == '/changes' and self.change_feed is not None:
+            if method == 'GET':
+                return self.changes(query)
+            raise HttpError(405, f"Método {method} no permitido en {path}")
+        match = _USER_PATH.match(path)
+        if match is None:
+            raise HttpError(404, f"Ruta no encontrada: {path}")
+        dni = match.group(1)
+        if method == 'GET':
+            return self.find(dni)
+        if method == 'PUT':
+            return self.update(dni, self._json(body))
+        if method == 'DELETE':
+            return self.delete(dni)
+        raise HttpError(405, f"Método {method} no permitido en {path}")
+
+    def _json(self, body: bytes):
+        try:
+            return self.serializer.loads(body)
+        except self.serializer.decode_errors:
+            raise HttpError(400, "El cuerpo de la petición no es JSON válido")
+
+    def create(self, data) -> tuple:
+        username, lastname, dni = _user_fields(data, ('username', 'lastname', 'dni'))
+        if self.batcher is None:
+            try:
+                user = self.create_user.execute(username, lastname, dni)
+            except ValueError as e:
+                raise HttpError(422, str(e))
+        else:
+            user = self.batcher.submit(_validated_user(username, lastname, dni))
+        return 201, _to_dict(user)
+
+    def find(self, dni: str) -> tuple:
+        try:
+            return 200, _to_dict(self.find_user.execute(dni))
+        except ValueError as e:
+            raise HttpError(404, str(e))
+
+    def list(self, query: Dict[str, str]) -> tuple:
+        params = {name: query[name] for name in _LIST_PARAMS if query.get(name)}
+        try:
+            for name in ('offset', 'limit'):
+                if query.get(name):
+                    params[name] = int(query[name])
+            users = self.list_users.execute(**params)
+        except ValueError as e:
+            raise HttpError(400, str(e))
+        return 200, {'users': [_to_dict(user) for user in users],
+                     'next_cursor': getattr(users, 'next_cursor', None)}
+
+    def update(self, dni: str, data) -> tuple:
+        username, lastname = _user_fields(data, ('username', 'lastname'))
+        # Los datos se validan antes para distinguir un cuerpo inválido (422) de un DNI inexistente (404)
+        _validated_user(username, lastname, dni)
+        try:
+            return 200, _to_dict(self.update_user.execute(dni, username, lastname))
+        except ValueError as e:
+            raise HttpError(404, str(e))
+
+    def delete(self, dni: str) -> tuple:
+        try:
+            self.delete_user.execute(dni)
+        except ValueError as e:
+            raise HttpError(404, str(e))
+        return 204, None
+
+    def changes(self, query: Dict[str, str]) -> tuple:
+        try:
+            since = int(query.get('since') or 0)
+            limit = int(query['limit']) if query.get('limit') else None
+        except ValueError:
+            raise HttpError(400, "since y limit deben ser enteros")
+        try:
+            events = self.change_feed.changes_since(since, limit)
+        except ChangeFeedGapError as e:
+            # El consumidor se ha quedado atrás: debe resincronizar con un listado completo
+            raise HttpError(410, str(e))
+        return 200, {'events': [asdict(event) for event in events], 'last_seq': self.change_feed.last_seq,
+                     'delivery': self.change_feed.delivery}
+
+    def bulk(self, data) -> tuple:
+        if not isinstance(data, list):
+            raise HttpError(400, "Se esperaba una lista de usuarios")
+        rows = ((item.get('username'), item.get('lastname'), item.get('dni')) if isinstance(item, dict) else ()
+                for item in data)
+        result = self.bulk_create.execute(rows)
+        return 200, {'created': result.created,
+                     'errors': [{'row': error.row, 'dni': error.dni, 'error': error.error}
+                                for error in result.errors]}
+
+
+def _user_fields(data, names: tuple) -> tuple:
+    if not isinstance(data, dict):
+        raise HttpError(400, "Se esperaba un objeto JSON")
+    missing = [name for name in names if name not in data]
+    if missing:
+        raise HttpError(422, f"Faltan campos: {', '.join(missing)}")
+    return tuple(data[name] for name in names)
+
+
+def _validated_user(username, lastname, dni) -> User:
+    try:
+        return User(username, lastname, dni)
+    except ValueError as e:
+        raise HttpError(422, str(e))
+
+
+def _to_dict(user: User) -> dict:
+    return {'username': user._username, 'lastname': user._lastname, 'dni': user._dni}
@@ -0,0 +1,6 @@
+# Metrics module
+from .registry import REGISTRY, DEFAULT_BUCKETS, Histogram, MetricsRegistry
+from .instrumentation import InstrumentedUserRepository, instrument_use_case, timed
+
+__all__ = ['REGISTRY', 'DEFAULT_BUCKETS', 'Histogram', 'MetricsRegistry', 'InstrumentedUserRepository',
+           'instrument_use_case', 'timed']
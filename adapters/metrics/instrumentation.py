@@ -0,0 +1,140 @@
+import functools
+import threading
+import weakref
+from time import perf_counter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from use_cases import UserRepositoryInterface
+from entities import User
+from .registry import REGISTRY, MetricsRegistry, OperationKey
+
+# Repositorios instrumentados que publican bytes_written, por registro. Un único callback por
+# registro los recorre; el WeakSet no mantiene vivos los repositorios ya descartados
+_bytes_written_sources: 'weakref.WeakKeyDictionary[MetricsRegistry, weakref.WeakSet]' = weakref.WeakKeyDictionary()
+_sources_lock = threading.Lock()
+
+
+def timed(registry: MetricsRegistry, key: OperationKey, function: Callable) -> Callable:
+    """Envuelve function para registrar llamadas, latencia y errores bajo key."""
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        # Desactivado solo cuesta esta comprobación y la llamada extra
+        if not registry.enabled:
+            return function(*args, **kwargs)
+        start = perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as e:
+            registry.observe(key, perf_counter() - start, e)
+            raise
+        registry.observe(key, perf_counter() - start)
+        return result
+
+    return wrapper
+
+
+def instrument_use_case(use_case, registry: Optional[MetricsRegistry] = None):
+    """Instrumenta el execute de un caso de uso (en la propia instancia) y lo devuelve."""
+    registry = REGISTRY if registry is None else registry
+    use_case.execute = timed(registry, ('use_case', type(use_case).__name__, 'execute'), use_case.execute)
+    return use_case
+
+
+class InstrumentedUserRepository(UserRepositoryInterface):
+    """Decorador que mide cada método de otro repositorio.
+
+    Si el repositorio envuelto lleva la cuenta de bytes escritos
+    (bytes_written), se publica también como métrica del registro.
+    """
+
+    def __init__(self, repository: UserRepositoryInterface, registry: Optional[MetricsRegistry] = None,
+                 name: Optional[str] = None):
+        self.repository = repository
+        self.registry = REGISTRY if registry is None else registry
+        self.name = name or type(repository).__name__
+        self._methods: Dict[str, Callable] = {}
+        if hasattr(repository, 'bytes_written'):
+            _track_bytes_written(self.registry, self)
+
+    def _method(self, operation: str) -> Callable:
+        method = self._methods.get(operation)
+        if method is None:
+            method = self._methods[operation] = timed(self.registry, ('repository', self.name, operation),
+                                                      getattr(self.repository, operation))
+        return method
+
+    def save(self, user: User) -> User:
+        return self._method('save')(user)
+
+    def get(self, dni: str) -> Optional[User]:
+        return self._method('get')(dni)
+
+    def exists(self, dni: str) -> bool:
+        return self._method('exists')(dni)
+
+    def delete(self, dni: str) -> None:
+        return self._method('delete')(dni)
+
+    def update(self, dni: str, new_username: str, new_last_name: str) -> Optional[User]:
+        return self._method('update')(dni, new_username, new_last_name)
+
+    def list(self, offset: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None,
+             lastname_prefix: Optional[str] = None, username_contains: Optional[str] = None) -> List[User]:
+        if not (offset or limit is not None or cursor or lastname_prefix or username_contains):
+            return self._method('list')()
+        return self._method('list')(offset=offset, limit=limit, cursor=cursor,
+                                    lastname_prefix=lastname_prefix, username_contains=username_contains)
+
+    def save_many(self, users: Iterable[User]) -> List[User]:
+        return self._method('save_many')(users)
+
+    def get_many(self, dnis: Iterable[str]) -> Dict[str, User]:
+        return self._method('get_many')(dnis)
+
+    def delete_many(self, dnis: Iterable[str]) -> int:
+        return self._method('delete_many')(dnis)
+
+    def iter_users(self) -> Iterator[User]:
+        registry, key = self.registry, ('repository', self.name, 'iter_users')
+        iterator = iter(self.repository.iter_users())
+        if not registry.enabled:
+            yield from iterator
+            return
+        # Se mide el recorrido, no la creación del iterador; solo cuenta el tiempo dentro
+        # del repositorio, no el que el consumidor pasa entre usuario y usuario
+        elapsed, error = 0.0, None
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    user = next(iterator)
+                except StopIteration:
+                    return
+                except BaseException as e:
+                    error = e
+                    raise
+                finally:
+                    elapsed += perf_counter() - start
+                yield user
+        finally:
+            registry.observe(key, elapsed, error)
+
+    def search(self, lastname_prefix: Optional[str] = None, username_prefix: Optional[str] = None,
+               limit: Optional[int] = None) -> List[User]:
+        return self._method('search')(lastname_prefix=lastname_prefix, username_prefix=username_prefix, limit=limit)
+
+    def close(self) -> None:
+        close = getattr(self.repository, 'close', None)
+        if close is not None:
+            close()
+
+
+def _track_bytes_written(registry: MetricsRegistry, repository: InstrumentedUserRepository) -> None:
+    with _sources_lock:
+        sources = _bytes_written_sources.get(registry)
+        if sources is None:
+            sources = _bytes_written_sources[registry] = weakref.WeakSet()
+            registry.register_callback(
+                'users_repository_bytes_written_total', 'Bytes de snapshot escritos por el repositorio.',
+                lambda: [({'name': source.name}, source.repository.bytes_written) for source in list(sources)])
+        sources.add(repository)
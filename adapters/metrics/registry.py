@@ -0,0 +1,159 @@
+import bisect
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Límites superiores (segundos) de los buckets de latencia: de 10 µs a 10 s
+DEFAULT_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# (tipo de componente, nombre, operación): ('use_case', 'CreateUserUseCase', 'execute')
+OperationKey = Tuple[str, str, str]
+
+
+class Histogram:
+    """Histograma de buckets fijos al estilo Prometheus (no thread-safe: lo protege el registro)."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        # Un contador por bucket más el de +Inf (no acumulados)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """[(límite, observaciones <= límite)], terminando en (inf, count)."""
+        total, result = 0, []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, fraction: float) -> float:
+        # Estimación por interpolación lineal dentro del bucket, como histogram_quantile
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        lower, seen = 0.0, 0
+        for bound, count in zip(self.buckets, self.counts):
+            if count and seen + count >= rank:
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return self.buckets[-1]
+
+
+class _Operation:
+    __slots__ = ('calls', 'errors', 'latency')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.calls = 0
+        self.errors: Dict[str, int] = {}
+        self.latency = Histogram(buckets)
+
+
+class MetricsRegistry:
+    """Registro de métricas de las operaciones instrumentadas.
+
+    Cada operación acumula llamadas, errores por tipo de excepción y un
+    histograma de latencias. Con enabled a False los envoltorios llaman
+    directamente a la operación sin medir nada.
+    """
+
+    def __init__(self, enabled: bool = True, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._operations: Dict[OperationKey, _Operation] = {}
+        # nombre -> (ayuda, tipo, función que devuelve [(etiquetas, valor)])
+        self._callbacks: Dict[str, Tuple[str, str, List[Callable[[], Iterable[Tuple[dict, float]]]]]] = {}
+
+    def observe(self, key: OperationKey, seconds: float, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            operation = self._operations.get(key)
+            if operation is None:
+                operation = self._operations[key] = _Operation(self.buckets)
+            operation.calls += 1
+            operation.latency.observe(seconds)
+            if error is not None:
+                name = type(error).__name__
+                operation.errors[name] = operation.errors.get(name, 0) + 1
+
+    def register_callback(self, name: str, help_text: str, callback: Callable[[], Iterable[Tuple[dict, float]]],
+                          metric_type: str = 'counter') -> None:
+        """Métrica cuyo valor se lee al exportar (p. ej. contadores que ya lleva un repositorio)."""
+        with self._lock:
+            self._callbacks.setdefault(name, (help_text, metric_type, []))[2].append(callback)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._operations.clear()
+
+    def snapshot(self) -> dict:
+        """Copia de las métricas actuales como diccionarios y números."""
+        with self._lock:
+            operations = {
+                '.'.join(key[1:]): {
+                    'kind': key[0], 'calls': operation.calls, 'errors': dict(operation.errors),
+                    'latency_sum': operation.latency.sum,
+                    'latency_p50': operation.latency.quantile(0.50),
+                    'latency_p99': operation.latency.quantile(0.99),
+                    'latency_buckets': operation.latency.cumulative(),
+                }
+                for key, operation in self._operations.items()
+            }
+            callbacks = list(self._callbacks.items())
+        values = {name: [(labels, value) for function in functions for labels, value in function()]
+                  for name, (_, _, functions) in callbacks}
+        return {'operations': operations, 'values': values}
+
+    def export_prometheus(self) -> str:
+        """Métricas en el formato de texto de Prometheus (versión 0.0.4)."""
+        with self._lock:
+            operations = sorted((key, operation.calls, dict(operation.errors), operation.latency.cumulative(),
+                                 operation.latency.sum, operation.latency.count)
+                                for key, operation in self._operations.items())
+            callbacks = sorted(self._callbacks.items())
+        lines = ['# HELP users_operation_calls_total Llamadas por operación.',
+                 '# TYPE users_operation_calls_total counter']
+        lines += [f'users_operation_calls_total{_labels(key)} {calls}' for key, calls, *_ in operations]
+        lines += ['# HELP users_operation_errors_total Errores por operación y tipo de excepción.',
+                  '# TYPE users_operation_errors_total counter']
+        lines += [f'users_operation_errors_total{_labels(key, exception=name)} {count}'
+                  for key, _, errors, *_ in operations for name, count in sorted(errors.items())]
+        lines += ['# HELP users_operation_duration_seconds Latencia por operación.',
+                  '# TYPE users_operation_duration_seconds histogram']
+        for key, _, _, buckets, total, count in operations:
+            lines += [f'users_operation_duration_seconds_bucket{_labels(key, le=_format_bound(bound))} {cumulative}'
+                      for bound, cumulative in buckets]
+            lines.append(f'users_operation_duration_seconds_sum{_labels(key)} {total!r}')
+            lines.append(f'users_operation_duration_seconds_count{_labels(key)} {count}')
+        for name, (help_text, metric_type, functions) in callbacks:
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {metric_type}']
+            lines += [f'{name}{_format_labels(labels)} {value!r}'
+                      for function in functions for labels, value in function()]
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(key: OperationKey, **extra: str) -> str:
+    return _format_labels({'kind': key[0], 'name': key[1], 'operation': key[2], **extra})
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for value in labels.values())
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + '}'
+
+
+def _format_bound(bound: float) -> str:
+    return '+Inf' if bound == float('inf') else repr(bound)
+
+
+# Registro por defecto del proceso
+REGISTRY = MetricsRegistry()
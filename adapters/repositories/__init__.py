@@ -1,4 +1,48 @@
 # Repositories module
-from .file_user_repository import FileUserRepository
+# Cada nombre se importa desde su submódulo al primer acceso (PEP 562): importar el paquete
+# no arrastra sqlite3, asyncio ni el resto de backends que el proceso no use
+import importlib
 
-__all__ = ['FileUserRepository']
\ No newline at end of file
+_EXPORTS = {
+    'FileUserRepository': 'file_user_repository',
+    'DatabaseUserRepository': 'database_user_repository',
+    'ColumnarUserRepository': 'columnar_user_repository',
+    'CachingUserRepository': 'caching_user_repository',
+    'CacheStats': 'caching_user_repository',
+    'BinaryUserRepository': 'binary_user_repository',
+    'ShardedFileUserRepository': 'sharded_file_user_repository',
+    'ReplicaFileUserRepository': 'replica_file_user_repository',
+    'ReplicaStats': 'replica_file_user_repository',
+    'ReadOnlyRepositoryError': 'replica_file_user_repository',
+    'BloomFilter': 'bloom_filter',
+    'BloomGuardedUserRepository': 'bloom_guarded_user_repository',
+    'BloomStats': 'bloom_guarded_user_repository',
+    'ChangeEvent': 'change_feed',
+    'ChangeFeed': 'change_feed',
+    'ChangeFeedGapError': 'change_feed',
+    'JsonlChangeSink': 'change_feed',
+    'read_jsonl_changes': 'change_feed',
+    'ChangeFeedUserRepository': 'change_feed_user_repository',
+    'AsyncFileUserRepository': 'async_user_repository',
+    'AsyncUserRepositoryAdapter': 'async_user_repository',
+    'BACKENDS': 'backends',
+    'register_backend': 'backends',
+    'get_backend': 'backends',
+    'create_repository': 'backends',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    # Los siguientes accesos ya no pasan por aquí
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
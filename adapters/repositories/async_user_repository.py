@@ -0,0 +1,175 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from use_cases import AsyncUserRepositoryInterface, UserPage, UserRepositoryInterface
+from entities import User
+from .file_user_repository import FileUserRepository
+from .user_journal import delete_record, put_record
+
+
+class AsyncUserRepositoryAdapter(AsyncUserRepositoryInterface):
+    """Expone un repositorio síncrono como asíncrono ejecutando cada llamada en un hilo."""
+
+    def __init__(self, repository: UserRepositoryInterface, executor: Optional[Executor] = None):
+        self.repository = repository
+        self._own_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=4, thread_name_prefix='user-repo')
+
+    async def _run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    async def save(self, user: User) -> User:
+        return await self._run(self.repository.save, user)
+
+    async def get(self, dni: str) -> Optional[User]:
+        return await self._run(self.repository.get, dni)
+
+    async def delete(self, dni: str) -> None:
+        await self._run(self.repository.delete, dni)
+
+    async def update(self, dni: str, new_username: str, new_last_name: str) -> Optional[User]:
+        return await self._run(self.repository.update, dni, new_username, new_last_name)
+
+    async def list(self, offset: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None,
+                   lastname_prefix: Optional[str] = None, username_contains: Optional[str] = None) -> UserPage:
+        if not (offset or limit is not None or cursor or lastname_prefix or username_contains):
+            return await self._run(self.repository.list)
+        return await self._run(lambda: self.repository.list(offset, limit, cursor, lastname_prefix,
+                                                            username_contains))
+
+    async def save_many(self, users: Iterable[User]) -> List[User]:
+        return await self._run(self.repository.save_many, list(users))
+
+    async def get_many(self, dnis: Iterable[str]) -> Dict[str, User]:
+        return await self._run(self.repository.get_many, list(dnis))
+
+    async def delete_many(self, dnis: Iterable[str]) -> int:
+        return await self._run(self.repository.delete_many, list(dnis))
+
+    async def search(self, lastname_prefix: Optional[str] = None, username_prefix: Optional[str] = None,
+                     limit: Optional[int] = None) -> List[User]:
+        return await self._run(self.repository.search, lastname_prefix, username_prefix, limit)
+
+    async def close(self) -> None:
+        close = getattr(self.repository, 'close', None)
+        if close is not None:
+            await self._run(close)
+        if self._own_executor:
+            self._executor.shutdown(wait=True)
+
+
+class AsyncFileUserRepository(AsyncUserRepositoryAdapter):
+    """FileUserRepository asíncrono con agrupación de escrituras (group commit).
+
+    Las escrituras que llegan mientras otra se está persistiendo se acumulan y
+    se confirman juntas en un único _apply (un solo snapshot o una sola línea de
+    journal) en un hilo aparte. Cada corrutina recibe su propio resultado.
+    """
+
+    def __init__(self, file_path: str = 'users.json', executor: Optional[Executor] = None,
+                 max_batch: int = 10000, **options):
+        super().__init__(FileUserRepository(file_path, **options), executor)
+        self.max_batch = max_batch
+        self._pending: list = []
+        self._flush_task: Optional[asyncio.Task] = None
+        # En modo multiproceso cada lectura puede tomar el flock y recargar el archivo: va al executor
+        self._blocking_reads = self.repository._file_lock is not None
+
+    async def get(self, dni: str) -> Optional[User]:
+        if self._blocking_reads:
+            return await self._run(self.repository.get, dni)
+        # Consulta en memoria: no compensa el salto a otro hilo
+        return self.repository.get(dni)
+
+    async def get_many(self, dnis: Iterable[str]) -> Dict[str, User]:
+        if self._blocking_reads:
+            return await self._run(self.repository.get_many, list(dnis))
+        return self.repository.get_many(dnis)
+
+    async def save(self, user: User) -> User:
+        return await self._submit(('save', user))
+
+    async def delete(self, dni: str) -> None:
+        await self._submit(('delete', dni))
+
+    async def update(self, dni: str, new_username: str, new_last_name: str) -> Optional[User]:
+        # Se validan los nuevos datos antes de encolarlos: un error solo afecta a esta petición
+        return await self._submit(('update', User(new_username, new_last_name, dni)))
+
+    async def save_many(self, users: Iterable[User]) -> List[User]:
+        return list(await asyncio.gather(*(self._submit(('save', user)) for user in users)))
+
+    async def delete_many(self, dnis: Iterable[str]) -> int:
+        # Por la misma cola que las demás escrituras: respeta el orden de los save/update ya encolados
+        return await self._submit(('delete_many', list(dict.fromkeys(dnis))))
+
+    async def _submit(self, operation: tuple):
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((operation, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(self._flush_pending())
+        return await future
+
+    async def _flush_pending(self) -> None:
+        try:
+            while self._pending:
+                batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+                try:
+                    results = await self._run(self._write_batch, [operation for operation, _ in batch])
+                except Exception as e:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            self._flush_task = None
+
+    def _write_batch(self, operations: List[tuple]) -> list:
+        # Se ejecuta en el hilo de escritura: resuelve cada operación en orden
+        # sobre el estado actual y confirma todos los registros de una vez
+        repository = self.repository
+        results, records, present = [], [], {}
+
+        def exists(dni: str) -> bool:
+            return present[dni] if dni in present else dni in repository.users
+
+        def delete(dni: str) -> bool:
+            if not exists(dni):
+                return False
+            records.append(delete_record(dni))
+            present[dni] = False
+            return True
+
+        with repository._exclusive():
+            for kind, value in operations:
+                if kind == 'save':
+                    records.append(put_record(value._username, value._lastname, value._dni))
+                    present[value._dni] = True
+                    results.append(value)
+                    continue
+                if kind == 'delete_many':
+                    results.append(sum(delete(dni) for dni in value))
+                    continue
+                if kind == 'delete':
+                    delete(value)
+                    results.append(None)
+                elif exists(value._dni):
+                    records.append(put_record(value._username, value._lastname, value._dni))
+                    results.append(value)
+                else:
+                    results.append(None)
+            if records:
+                repository._apply(records)
+        return results
+
+    async def flush(self) -> None:
+        """Espera a que se confirmen las escrituras pendientes."""
+        while self._flush_task is not None:
+            await asyncio.shield(self._flush_task)
+
+    async def close(self) -> None:
+        await self.flush()
+        await super().close()
@@ -0,0 +1,34 @@
+import importlib
+from typing import Dict
+
+# Nombre del backend -> 'módulo:Clase'. El módulo se importa solo al seleccionar el backend,
+# así que registrar uno con dependencias opcionales no encarece el arranque
+BACKENDS: Dict[str, str] = {
+    'file': 'adapters.repositories.file_user_repository:FileUserRepository',
+    'sharded': 'adapters.repositories.sharded_file_user_repository:ShardedFileUserRepository',
+    'replica': 'adapters.repositories.replica_file_user_repository:ReplicaFileUserRepository',
+    'binary': 'adapters.repositories.binary_user_repository:BinaryUserRepository',
+    'columnar': 'adapters.repositories.columnar_user_repository:ColumnarUserRepository',
+    'sqlite': 'adapters.repositories.database_user_repository:DatabaseUserRepository',
+    'async-file': 'adapters.repositories.async_user_repository:AsyncFileUserRepository',
+}
+
+
+def register_backend(name: str, target: str) -> None:
+    """Registra un backend como 'módulo:Clase' sin importarlo."""
+    if target.count(':') != 1:
+        raise ValueError(f"El backend debe indicarse como 'módulo:Clase': {target}")
+    BACKENDS[name] = target
+
+
+def get_backend(name: str) -> type:
+    """Importa y devuelve la clase del backend registrado con ese nombre."""
+    try:
+        module_name, class_name = BACKENDS[name].split(':')
+    except KeyError:
+        raise ValueError(f"Backend no registrado: {name} (disponibles: {', '.join(BACKENDS)})")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def create_repository(name: str, *args, **kwargs):
+    return get_backend(name)(*args, **kwargs)
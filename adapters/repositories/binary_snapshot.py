@@ -0,0 +1,191 @@
+import bisect
+import mmap
+import os
+import struct
+import sys
+import zlib
+from typing import Iterable, Iterator, Optional, Tuple
+from .user_snapshot import CorruptSnapshotError, _fsync_directory, load_snapshot
+
+# Formato binario de snapshot (little-endian):
+#   cabecera  magic, versión, tamaño de registro, nº de registros, offsets de las
+#             secciones de claves, registros y heap, y crc32 de todo lo que sigue
+#   claves    DNI empaquetados en int64 (número * 256 + letra), ordenados: su orden
+#             coincide con el de las cadenas, así que sirven de índice y de orden de listado
+#   registros de ancho fijo, en el mismo orden que las claves: offset en el heap y
+#             longitudes en bytes UTF-8 de nombre y apellido (que van seguidos en el heap)
+#   heap      cadenas UTF-8 de nombres y apellidos
+BINARY_MAGIC = b'USRSNAP\x00'
+BINARY_VERSION = 1
+HEADER = struct.Struct('<8sHHIQQQI4x')
+KEY = struct.Struct('<q')
+RECORD = struct.Struct('<QHH')
+MAX_STRING_BYTES = 0xFFFF
+
+
+def pack_dni_key(dni: str) -> Optional[int]:
+    # 8 dígitos ASCII + 1 carácter ASCII; None si el DNI no tiene esa forma
+    if type(dni) is not str or len(dni) != 9 or not dni.isascii() or not dni[:8].isdigit():
+        return None
+    return int(dni[:8]) * 256 + ord(dni[8])
+
+
+def unpack_dni_key(key: int) -> str:
+    return f"{key >> 8:08d}{chr(key & 0xFF)}"
+
+
+def write_binary_snapshot(path: str, rows: Iterable[Tuple[str, str, str]]) -> int:
+    """Escribe (username, lastname, dni) en formato binario, ordenado por DNI.
+
+    La escritura es atómica (temporal + fsync + rename). Devuelve los bytes escritos.
+    """
+    rows = sorted(rows, key=lambda row: row[2])
+    keys = bytearray(KEY.size * len(rows))
+    records = bytearray(RECORD.size * len(rows))
+    heap = bytearray()
+    previous = None
+    for index, (username, lastname, dni) in enumerate(rows):
+        key = pack_dni_key(dni)
+        if key is None:
+            raise ValueError(f"DNI no representable en el formato binario: {dni}")
+        if key == previous:
+            raise ValueError(f"DNI duplicado: {dni}")
+        previous = key
+        username_bytes, lastname_bytes = username.encode('utf-8'), lastname.encode('utf-8')
+        if len(username_bytes) > MAX_STRING_BYTES or len(lastname_bytes) > MAX_STRING_BYTES:
+            raise ValueError(f"Nombre o apellido demasiado largo para el DNI {dni}")
+        KEY.pack_into(keys, index * KEY.size, key)
+        RECORD.pack_into(records, index * RECORD.size, len(heap), len(username_bytes), len(lastname_bytes))
+        heap += username_bytes
+        heap += lastname_bytes
+    checksum = zlib.crc32(heap, zlib.crc32(records, zlib.crc32(keys)))
+    keys_offset = HEADER.size
+    records_offset = keys_offset + len(keys)
+    header = HEADER.pack(BINARY_MAGIC, BINARY_VERSION, RECORD.size, len(rows), keys_offset, records_offset,
+                         records_offset + len(records), checksum)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(header)
+        file.write(keys)
+        file.write(records)
+        file.write(heap)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+    _fsync_directory(path)
+    return len(header) + len(keys) + len(records) + len(heap)
+
+
+class _KeyView:
+    # Acceso a las claves en máquinas big-endian, donde no sirve memoryview.cast
+    def __init__(self, buffer, offset: int, count: int):
+        self._buffer, self._offset, self._count = buffer, offset, count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> int:
+        return KEY.unpack_from(self._buffer, self._offset + index * KEY.size)[0]
+
+
+class BinarySnapshot:
+    """Snapshot binario proyectado en memoria con mmap.
+
+    Abrirlo solo lee y valida la cabecera (O(1)); cada registro se decodifica
+    cuando se accede a él. Las páginas del archivo las comparte el sistema
+    operativo entre todos los procesos que lo abren.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self.checksum = 0
+        self._mmap = None
+        self._keys = ()
+        with open(path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size == 0:
+                return
+            if size < HEADER.size:
+                raise CorruptSnapshotError(f"Snapshot binario {path} truncado")
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, record_size, count, keys_offset, self._records, self._heap,
+         self.checksum) = HEADER.unpack_from(self._mmap, 0)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION or record_size != RECORD.size:
+            self.close()
+            raise CorruptSnapshotError(f"{path} no es un snapshot binario compatible")
+        if (self._records != keys_offset + count * KEY.size or self._heap != self._records + count * RECORD.size
+                or self._heap > size):
+            self.close()
+            raise CorruptSnapshotError(f"Snapshot binario {path} truncado")
+        self.count = count
+        self._data_offset = keys_offset
+        # Las claves se leen como un array de int64 sin copiarlas: bisect trabaja sobre el mmap
+        if sys.byteorder == 'little':
+            self._keys = memoryview(self._mmap)[keys_offset:self._records].cast('q')
+        else:
+            self._keys = _KeyView(self._mmap, keys_offset, count)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def verify(self) -> bool:
+        """Comprueba el crc32 completo (recorre todo el archivo: no se hace al abrir)."""
+        if self._mmap is None:
+            return True
+        with memoryview(self._mmap) as view:
+            return zlib.crc32(view[self._data_offset:]) == self.checksum
+
+    def bisect(self, dni: str, right: bool = False) -> int:
+        """Posición del primer registro con DNI >= dni (> dni si right)."""
+        key = pack_dni_key(dni)
+        if key is None:
+            # Cursor con otra forma: se compara como cadena con búsqueda binaria en Python
+            low, high = 0, self.count
+            while low < high:
+                middle = (low + high) // 2
+                current = unpack_dni_key(self._keys[middle])
+                if current < dni or (right and current == dni):
+                    low = middle + 1
+                else:
+                    high = middle
+            return low
+        return (bisect.bisect_right if right else bisect.bisect_left)(self._keys, key)
+
+    def row(self, index: int) -> Tuple[str, str, str]:
+        offset, username_size, lastname_size = RECORD.unpack_from(self._mmap, self._records + index * RECORD.size)
+        start = self._heap + offset
+        middle = start + username_size
+        return (self._mmap[start:middle].decode('utf-8'),
+                self._mmap[middle:middle + lastname_size].decode('utf-8'),
+                unpack_dni_key(self._keys[index]))
+
+    def find(self, dni: str) -> Optional[Tuple[str, str, str]]:
+        key = pack_dni_key(dni)
+        if key is None or not self.count:
+            return None
+        index = bisect.bisect_left(self._keys, key)
+        if index < self.count and self._keys[index] == key:
+            return self.row(index)
+        return None
+
+    def iter_rows(self, start: int = 0) -> Iterator[Tuple[str, str, str]]:
+        for index in range(start, self.count):
+            yield self.row(index)
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            # La vista de claves exporta el buffer del mmap: se libera antes de cerrarlo
+            if isinstance(self._keys, memoryview):
+                self._keys.release()
+            self._keys = ()
+            self._mmap.close()
+            self._mmap = None
+            self.count = 0
+
+
+def convert_json_to_binary(json_path: str, binary_path: str) -> int:
+    """Convierte un users.json (cualquier formato de snapshot) al formato binario."""
+    users, _, _ = load_snapshot(json_path)
+    return write_binary_snapshot(binary_path, ((data['username'], data['lastname'], dni)
+                                               for dni, data in users.items()))
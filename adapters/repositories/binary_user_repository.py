@@ -0,0 +1,176 @@
+import threading
+from heapq import merge
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from use_cases import UserPage, UserRepositoryInterface
+from use_cases.user_page import paginate
+from entities import User
+from .binary_snapshot import BinarySnapshot, write_binary_snapshot
+from .user_journal import UserJournal, batch_record, delete_record, put_record
+
+# Marca de borrado en la capa de cambios: el DNI existe en el snapshot pero ya no es válido
+_DELETED = None
+_MISSING = object()
+
+
+class _State:
+    """Snapshot y capa de cambios publicados juntos: compact() sustituye el objeto entero."""
+
+    __slots__ = ('snapshot', 'changes')
+
+    def __init__(self, snapshot: Optional[BinarySnapshot], changes: Dict[str, Optional[Tuple[str, str, str]]]):
+        self.snapshot = snapshot
+        # dni -> (username, lastname, dni) o _DELETED; solo se añaden claves (bajo el cerrojo)
+        self.changes = changes
+
+
+class BinaryUserRepository(UserRepositoryInterface):
+    """Repositorio sobre un snapshot binario proyectado en memoria (mmap).
+
+    El arranque no decodifica ningún registro: get busca por DNI en el archivo
+    con búsqueda binaria. Las mutaciones se guardan en un journal y en una capa
+    de cambios en memoria que tiene prioridad sobre el snapshot; compact()
+    reescribe el snapshot binario con los cambios incorporados.
+
+    Las lecturas no toman el cerrojo: leen snapshot y cambios del mismo
+    _State, y compact() publica uno nuevo sin cerrar el mmap anterior (se
+    libera cuando ninguna lectura en curso lo usa).
+    """
+
+    def __init__(self, file_path: str = 'users.bin', fsync: bool = False,
+                 compact_threshold: int = 16 * 1024 * 1024):
+        self.file_path = file_path
+        self.compact_threshold = compact_threshold
+        self._lock = threading.RLock()
+        self._state = _State(self._open_snapshot(), {})
+        self.journal = UserJournal(self.file_path + '.journal', fsync=fsync)
+        for record in self.journal.read_all():
+            self._apply_change(record)
+
+    @property
+    def snapshot(self) -> Optional[BinarySnapshot]:
+        return self._state.snapshot
+
+    def _open_snapshot(self) -> Optional[BinarySnapshot]:
+        try:
+            return BinarySnapshot(self.file_path)
+        except FileNotFoundError:
+            return None
+
+    def _apply_change(self, record: dict) -> None:
+        if record['op'] == 'batch':
+            for inner in record['records']:
+                self._apply_change(inner)
+        elif record['op'] == 'put':
+            self._state.changes[record['dni']] = (record['username'], record['lastname'], record['dni'])
+        else:
+            self._state.changes[record['dni']] = _DELETED
+
+    def _find(self, dni: str) -> Optional[Tuple[str, str, str]]:
+        state = self._state
+        row = state.changes.get(dni, _MISSING)
+        if row is not _MISSING:
+            return row
+        if state.snapshot is None:
+            return None
+        return state.snapshot.find(dni)
+
+    def _write(self, records: List[dict]) -> None:
+        with self._lock:
+            self.journal.append(records if len(records) == 1 else [batch_record(records)])
+            for record in records:
+                self._apply_change(record)
+            if self.journal.size >= self.compact_threshold:
+                self.compact()
+
+    def compact(self) -> None:
+        """Reescribe el snapshot binario con la capa de cambios incorporada."""
+        with self._lock:
+            self.journal.rotate()
+            write_binary_snapshot(self.file_path, self._iter_rows())
+            # El snapshot anterior no se cierra: una lectura concurrente puede estar usándolo
+            self._state = _State(self._open_snapshot(), {})
+            self.journal.discard_rotated()
+
+    def close(self) -> None:
+        self.journal.close()
+        if self.snapshot is not None:
+            self.snapshot.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            snapshot = self.snapshot
+            count = len(snapshot) if snapshot is not None else 0
+            for dni, row in self._state.changes.items():
+                in_snapshot = snapshot is not None and snapshot.find(dni) is not None
+                count += (row is not _DELETED) - in_snapshot
+            return count
+
+    def _iter_rows(self, cursor: Optional[str] = None, skip: int = 0) -> Iterator[Tuple[str, str, str]]:
+        # Mezcla ordenada por DNI del snapshot y de la capa de cambios. Los cambios se copian
+        # ya (con el cerrojo tomado); el snapshot se recorre bajo demanda y compact() no lo cierra
+        state = self._state
+        if state.snapshot is None:
+            base = iter(())
+        else:
+            start = state.snapshot.bisect(cursor, right=True) if cursor else 0
+            base = state.snapshot.iter_rows(start + skip)
+        changes = sorted((dni, row) for dni, row in state.changes.items() if not cursor or dni > cursor)
+        changed = {dni for dni, _ in changes}
+        base = ((row[2], row) for row in base if row[2] not in changed)
+        return (row for _, row in merge(base, changes, key=lambda item: item[0]) if row is not _DELETED)
+
+    def save(self, user: User) -> User:
+        self._write([put_record(user._username, user._lastname, user._dni)])
+        return user
+
+    def get(self, dni: str) -> Optional[User]:
+        row = self._find(dni)
+        return _to_user(row) if row else None
+
+    def delete(self, dni: str) -> None:
+        with self._lock:
+            if self._find(dni):
+                self._write([delete_record(dni)])
+
+    def update(self, dni: str, new_username: str, new_last_name: str) -> Optional[User]:
+        with self._lock:
+            if not self._find(dni):
+                return None
+            # Se validan los nuevos datos antes de persistirlos
+            updated_user = User(new_username, new_last_name, dni)
+            self._write([put_record(new_username, new_last_name, dni)])
+        return updated_user
+
+    def list(self, offset: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None,
+             lastname_prefix: Optional[str] = None, username_contains: Optional[str] = None) -> UserPage:
+        with self._lock:
+            if not (offset or limit is not None or cursor or lastname_prefix or username_contains):
+                return UserPage(map(_to_user, self._iter_rows()))
+            # Sin filtros ni cambios pendientes el offset se salta directamente en el snapshot
+            skip = 0 if self._state.changes or lastname_prefix or username_contains else max(offset, 0)
+            rows = self._iter_rows(cursor, skip)
+            return paginate(rows, _to_user, offset - skip, limit, lastname_prefix, username_contains)
+
+    def iter_users(self) -> Iterator[User]:
+        # Memoria acotada: solo se copia la capa de cambios, las filas del snapshot se leen al avanzar
+        with self._lock:
+            rows = self._iter_rows()
+        return map(_to_user, rows)
+
+    def save_many(self, users: Iterable[User]) -> List[User]:
+        users = list(users)
+        if users:
+            self._write([put_record(user._username, user._lastname, user._dni) for user in users])
+        return users
+
+    def delete_many(self, dnis: Iterable[str]) -> int:
+        with self._lock:
+            records = [delete_record(dni) for dni in dict.fromkeys(dnis) if self._find(dni)]
+            if records:
+                self._write(records)
+        return len(records)
+
+
+def _to_user(row: tuple) -> User:
+    # Los registros del snapshot ya se validaron al guardarse: no se revalida el DNI
+    return User.from_trusted(row[0], row[1], row[2])
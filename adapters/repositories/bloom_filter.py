@@ -0,0 +1,122 @@
+import math
+import os
+import struct
+import zlib
+from hashlib import blake2b
+from typing import Iterable, Optional, Tuple
+from .user_snapshot import _fsync_directory
+
+# Formato en disco (little-endian): magic, versión, nº de bits, nº de hashes,
+# elementos añadidos, capacidad, tasa de error objetivo, crc32 de los bits,
+# versión de los datos de origen (tres enteros) y a continuación los bits
+BLOOM_MAGIC = b'USRBLOOM'
+BLOOM_VERSION = 2
+HEADER = struct.Struct('<8sHxxQIQQdIxxxxqqq')
+_DIGEST = struct.Struct('<QQ')
+
+
+class BloomFilter:
+    """Filtro de Bloom de DNIs: "no está" es seguro, "puede estar" hay que confirmarlo.
+
+    Las posiciones salen de blake2b (doble hashing), no de hash(), para que el
+    filtro guardado en disco sirva en cualquier proceso. No admite borrados:
+    un DNI eliminado sigue dando positivo hasta que se reconstruye el filtro.
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.01):
+        if capacity <= 0:
+            raise ValueError("La capacidad del filtro debe ser mayor que cero.")
+        if not 0 < error_rate < 1:
+            raise ValueError("La tasa de falsos positivos debe estar entre 0 y 1.")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # Tamaño óptimo: m = -n·ln(p) / ln(2)², k = m/n · ln(2)
+        self.bit_count = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.bit_count / capacity * math.log(2)))
+        self.bits = bytearray((self.bit_count + 7) // 8)
+        # Inserciones (con repetidos): cota superior de los elementos distintos
+        self.count = 0
+        # Versión de los datos con los que se construyó (la fija quien mantiene el filtro)
+        self.source_version: Tuple[int, int, int] = (-1, -1, -1)
+
+    def _hashes(self, key: str) -> tuple:
+        first, step = _DIGEST.unpack(blake2b(key.encode('utf-8'), digest_size=16).digest())
+        # Doble hashing: la posición i es h1 + i·h2; se reducen antes para operar con enteros pequeños
+        return first % self.bit_count, step % self.bit_count
+
+    def add(self, key: str) -> None:
+        position, step = self._hashes(key)
+        bits, bit_count = self.bits, self.bit_count
+        for _ in range(self.hash_count):
+            bits[position >> 3] |= 1 << (position & 7)
+            position = (position + step) % bit_count
+        self.count += 1
+
+    def update(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        position, step = self._hashes(key)
+        bits, bit_count = self.bits, self.bit_count
+        for _ in range(self.hash_count):
+            # Se corta en el primer bit a 0: un negativo suele costar uno o dos accesos
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+            position = (position + step) % bit_count
+        return True
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self.bits)
+
+    def fill_ratio(self) -> float:
+        return bin(int.from_bytes(self.bits, 'little')).count('1') / self.bit_count
+
+    def estimated_false_positive_rate(self) -> float:
+        """Tasa de falsos positivos esperada con los bits que hay ahora a 1."""
+        return self.fill_ratio() ** self.hash_count
+
+    def to_bytes(self) -> bytes:
+        header = HEADER.pack(BLOOM_MAGIC, BLOOM_VERSION, self.bit_count, self.hash_count, self.count,
+                             self.capacity, self.error_rate, zlib.crc32(self.bits), *self.source_version)
+        return header + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'BloomFilter':
+        if len(data) < HEADER.size:
+            raise ValueError("Filtro de Bloom truncado")
+        (magic, version, bit_count, hash_count, count, capacity, error_rate, checksum,
+         *source_version) = HEADER.unpack_from(data)
+        bits = data[HEADER.size:]
+        if magic != BLOOM_MAGIC or version != BLOOM_VERSION:
+            raise ValueError("No es un filtro de Bloom de usuarios o la versión no está soportada")
+        if len(bits) != (bit_count + 7) // 8 or zlib.crc32(bits) != checksum:
+            raise ValueError("Filtro de Bloom dañado")
+        bloom = cls.__new__(cls)
+        bloom.capacity, bloom.error_rate = capacity, error_rate
+        bloom.bit_count, bloom.hash_count, bloom.count = bit_count, hash_count, count
+        bloom.source_version = tuple(source_version)
+        bloom.bits = bytearray(bits)
+        return bloom
+
+    def save(self, path: str) -> int:
+        """Guarda el filtro de forma atómica (temporal + fsync + rename). Devuelve los bytes escritos."""
+        data = self.to_bytes()
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+        _fsync_directory(path)
+        return len(data)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['BloomFilter']:
+        """Filtro guardado en path, o None si no existe o no es válido."""
+        try:
+            with open(path, 'rb') as file:
+                return cls.from_bytes(file.read())
+        except (FileNotFoundError, ValueError):
+            return None
@@ -0,0 +1,251 @@
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from use_cases import UserRepositoryInterface
+from entities import User
+from .bloom_filter import BloomFilter
+
+# Capacidad mínima al construir el filtro: evita reconstrucciones seguidas con pocos usuarios
+MIN_CAPACITY = 1024
+
+
+@dataclass
+class BloomStats:
+    # Consultas resueltas por el filtro sin llegar al repositorio
+    skipped: int = 0
+    # Positivos del filtro que el repositorio confirmó o desmintió
+    confirmed: int = 0
+    false_positives: int = 0
+    rebuilds: int = 0
+
+    @property
+    def observed_false_positive_rate(self) -> float:
+        # Sobre las consultas de DNIs inexistentes: las que el filtro no supo descartar
+        negatives = self.skipped + self.false_positives
+        return self.false_positives / negatives if negatives else 0.0
+
+
+class BloomGuardedUserRepository(UserRepositoryInterface):
+    """Decorador con un filtro de Bloom de todos los DNIs delante de otro repositorio.
+
+    get, exists, update y delete de un DNI que el filtro descarta responden
+    sin consultar el repositorio envuelto. El filtro se mantiene con cada alta
+    y, con path, se guarda al cerrar (p. ej. junto al snapshot); la primera
+    alta posterior borra el archivo, así que tras una caída se reconstruye
+    desde el repositorio en lugar de usar un filtro incompleto.
+
+    El filtro va ligado a la versión de los datos del repositorio envuelto
+    (data_version, si lo expone, como FileUserRepository): antes de responder "no existe" se comprueba y, si
+    alguien escribió sin pasar por aquí (otro proceso o el propio repositorio
+    envuelto), se reconstruye. Con repositorios sin versión, como SQLite, solo
+    es válido si todas las escrituras pasan por este decorador.
+
+    Los borrados no quitan bits: rebuild() recupera la tasa de falsos
+    positivos tras muchas bajas. Si las altas superan la capacidad, el filtro
+    se reconstruye con el doble.
+    """
+
+    def __init__(self, repository: UserRepositoryInterface, path: Optional[str] = None,
+                 capacity: Optional[int] = None, error_rate: float = 0.01):
+        self.repository = repository
+        self.path = path
+        self.error_rate = error_rate
+        # Las altas actualizan filtro y repositorio bajo el mismo cerrojo: una reconstrucción
+        # a mitad de un alta no puede perder su DNI
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = BloomStats()
+        bloom = BloomFilter.load(path) if path is not None else None
+        if bloom is not None and bloom.source_version != self._source_version():
+            # Guardado con otros datos: el repositorio cambió después de cerrar
+            bloom = None
+        # True cuando el archivo del filtro ya no refleja todas las altas
+        self._dirty = bloom is None
+        self.bloom = bloom if bloom is not None else self._build(capacity or 0)
+
+    @property
+    def stats(self) -> BloomStats:
+        with self._stats_lock:
+            return BloomStats(**vars(self._stats))
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.bloom.memory_bytes
+
+    def estimated_false_positive_rate(self) -> float:
+        return self.bloom.estimated_false_positive_rate()
+
+    def _source_version(self) -> Tuple[int, int, int]:
+        # Cambia con cualquier escritura en el repositorio envuelto; constante si no la expone
+        return getattr(self.repository, 'data_version', (-1, -1, -1))
+
+    def _build(self, capacity: int) -> BloomFilter:
+        version = self._source_version()
+        dnis = [user._dni for user in self.repository.iter_users()]
+        bloom = BloomFilter(max(capacity, 2 * len(dnis), MIN_CAPACITY), self.error_rate)
+        bloom.update(dnis)
+        bloom.source_version = version
+        with self._stats_lock:
+            self._stats.rebuilds += 1
+        return bloom
+
+    def rebuild(self, capacity: Optional[int] = None) -> None:
+        """Reconstruye el filtro desde el repositorio (descarta los bits de DNIs borrados)."""
+        with self._lock:
+            self.bloom = self._build(capacity or 0)
+            self._dirty = True
+
+    def save_filter(self) -> None:
+        """Guarda el filtro en path para no reconstruirlo al reabrir."""
+        with self._lock:
+            if self.path is None or not self._dirty:
+                return
+            self.bloom.save(self.path)
+            self._dirty = False
+
+    def _refresh_source(self) -> None:
+        refresh = getattr(self.repository, 'refresh', None)
+        if refresh is not None:
+            # Incorpora lo que hayan escrito otros procesos (no hace nada si no es multiproceso)
+            refresh()
+
+    def _rebuild_if_stale(self) -> None:
+        # Se llama con el cerrojo tomado
+        if self.bloom.source_version != self._source_version():
+            self.bloom = self._build(self.bloom.capacity)
+            self._dirty = True
+
+    def _sync(self) -> None:
+        """Reconstruye el filtro si el repositorio envuelto cambió sin pasar por este decorador."""
+        self._refresh_source()
+        if self.bloom.source_version == self._source_version():
+            return
+        with self._lock:
+            self._rebuild_if_stale()
+
+    @contextmanager
+    def _writing(self, dnis: List[str] = ()) -> Iterator[None]:
+        """Escritura propia: añade dnis al filtro y, al terminar, le asigna la nueva versión del repositorio.
+
+        La escritura del repositorio puede incorporar antes lo que hayan escrito
+        otros procesos (FileUserRepository en modo multiproceso cuenta esas
+        recargas en reloads): si ha ocurrido, esos DNIs no están en el filtro y
+        se reconstruye en lugar de darlo por al día.
+        """
+        with self._lock:
+            self._refresh_source()
+            self._rebuild_if_stale()
+            if dnis:
+                self._add(dnis)
+            reloads = getattr(self.repository, 'reloads', 0)
+            try:
+                yield
+            finally:
+                if getattr(self.repository, 'reloads', 0) == reloads:
+                    self.bloom.source_version = self._source_version()
+                else:
+                    self._rebuild_if_stale()
+
+    def _add(self, dnis: List[str]) -> None:
+        # Se llama con el cerrojo tomado, antes de escribir en el repositorio
+        if not self._dirty:
+            self._dirty = True
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+        if self.bloom.count + len(dnis) > self.bloom.capacity:
+            self.bloom = self._build(2 * (self.bloom.capacity + len(dnis)))
+        self.bloom.update(dnis)
+
+    def _might_exist(self, dni) -> bool:
+        if type(dni) is str and dni in self.bloom:
+            return True
+        if type(dni) is str:
+            self._sync()
+            if dni in self.bloom:
+                return True
+        with self._stats_lock:
+            self._stats.skipped += 1
+        return False
+
+    def _count_lookups(self, checked: int, found: int) -> None:
+        with self._stats_lock:
+            self._stats.confirmed += found
+            self._stats.false_positives += checked - found
+
+    def get(self, dni: str) -> Optional[User]:
+        if not self._might_exist(dni):
+            return None
+        user = self.repository.get(dni)
+        self._count_lookups(1, user is not None)
+        return user
+
+    def exists(self, dni: str) -> bool:
+        if not self._might_exist(dni):
+            return False
+        found = self.repository.exists(dni)
+        self._count_lookups(1, found)
+        return found
+
+    def get_many(self, dnis: Iterable[str]) -> Dict[str, User]:
+        candidates = [dni for dni in dict.fromkeys(dnis) if self._might_exist(dni)]
+        if not candidates:
+            return {}
+        found = self.repository.get_many(candidates)
+        self._count_lookups(len(candidates), len(found))
+        return found
+
+    def save(self, user: User) -> User:
+        with self._writing([user._dni]):
+            return self.repository.save(user)
+
+    def save_many(self, users: Iterable[User]) -> List[User]:
+        users = list(users)
+        with self._writing([user._dni for user in users]):
+            return self.repository.save_many(users)
+
+    def update(self, dni: str, new_username: str, new_last_name: str) -> Optional[User]:
+        if not self._might_exist(dni):
+            return None
+        with self._writing():
+            return self.repository.update(dni, new_username, new_last_name)
+
+    def delete(self, dni: str) -> None:
+        if self._might_exist(dni):
+            with self._writing():
+                self.repository.delete(dni)
+
+    def delete_many(self, dnis: Iterable[str]) -> int:
+        candidates = [dni for dni in dict.fromkeys(dnis) if self._might_exist(dni)]
+        if not candidates:
+            return 0
+        with self._writing():
+            return self.repository.delete_many(candidates)
+
+    def list(self, offset: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None,
+             lastname_prefix: Optional[str] = None, username_contains: Optional[str] = None) -> List[User]:
+        if not (offset or limit is not None or cursor or lastname_prefix or username_contains):
+            return self.repository.list()
+        return self.repository.list(offset=offset, limit=limit, cursor=cursor,
+                                    lastname_prefix=lastname_prefix, username_contains=username_contains)
+
+    def iter_users(self) -> Iterator[User]:
+        return self.repository.iter_users()
+
+    def search(self, lastname_prefix: Optional[str] = None, username_prefix: Optional[str] = None,
+               limit: Optional[int] = None) -> List[User]:
+        return self.repository.search(lastname_prefix=lastname_prefix, username_prefix=username_prefix, limit=limit)
+
+    def close(self) -> None:
+        flush = getattr(self.repository, 'flush', None)
+        if flush is not None:
+            # Con write_behind el volcado cambia la versión: el filtro se guarda con la definitiva
+            with self._writing():
+                flush()
+        self.save_filter()
+        close = getattr(self.repository, 'close', None)
+        if close is not None:
+            close()
@@ -0,0 +1,177 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from use_cases import UserRepositoryInterface
+from entities import User
+
+# Marca de caché negativa: el DNI se consultó y no existe
+_MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.negative_hits + self.misses
+        return (self.hits + self.negative_hits) / total if total else 0.0
+
+
+class CachingUserRepository(UserRepositoryInterface):
+    """Caché LRU de lectura (read-through) con TTL alrededor de cualquier repositorio.
+
+    Cachea también los DNIs inexistentes (caché negativa) y se invalida en
+    cada save, update y delete que pase por ella.
+    """
+
+    def __init__(self, repository: UserRepositoryInterface, max_size: int = 10000, ttl: float = 60.0,
+                 negative_ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        if max_size <= 0:
+            raise ValueError("El tamaño de la caché debe ser mayor que cero.")
+        self.repository = repository
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Cambia en cada invalidación: una lectura lenta no debe cachear un valor ya obsoleto
+        self._version = 0
+        self._stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(**vars(self._stats))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._version += 1
+
+    def _lookup(self, dni: str):
+        # Devuelve el User, _MISSING o None si no hay entrada válida (se llama con el lock tomado)
+        entry = self._entries.get(dni)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+        expires_at, value = entry
+        if self._clock() >= expires_at:
+            del self._entries[dni]
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return None
+        self._entries.move_to_end(dni)
+        if value is _MISSING:
+            self._stats.negative_hits += 1
+        else:
+            self._stats.hits += 1
+        return value
+
+    def _store(self, dni: str, user: Optional[User], version: int) -> None:
+        if version != self._version:
+            return
+        ttl = self.ttl if user is not None else self.negative_ttl
+        self._entries[dni] = (self._clock() + ttl, _MISSING if user is None else user)
+        self._entries.move_to_end(dni)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    def _invalidate(self, dnis: Iterable[str]) -> None:
+        with self._lock:
+            self._version += 1
+            for dni in dnis:
+                if self._entries.pop(dni, None) is not None:
+                    self._stats.invalidations += 1
+
+    def get(self, dni: str) -> Optional[User]:
+        with self._lock:
+            cached = self._lookup(dni)
+            version = self._version
+        if cached is not None:
+            return None if cached is _MISSING else cached
+        user = self.repository.get(dni)
+        with self._lock:
+            self._store(dni, user, version)
+        return user
+
+    def get_many(self, dnis: Iterable[str]) -> Dict[str, User]:
+        found, pending = {}, []
+        with self._lock:
+            for dni in dict.fromkeys(dnis):
+                cached = self._lookup(dni)
+                if cached is None:
+                    pending.append(dni)
+                elif cached is not _MISSING:
+                    found[dni] = cached
+            version = self._version
+        if pending:
+            fetched = self.repository.get_many(pending)
+            with self._lock:
+                for dni in pending:
+                    self._store(dni, fetched.get(dni), version)
+            found.update(fetched)
+        return found
+
+    def save(self, user: User) -> User:
+        try:
+            return self.repository.save(user)
+        finally:
+            self._invalidate([user._dni])
+
+    def update(self, dni: str, new_username: str, new_last_name: str) -> Optional[User]:
+        try:
+            return self.repository.update(dni, new_username, new_last_name)
+        finally:
+            self._invalidate([dni])
+
+    def delete(self, dni: str) -> None:
+        try:
+            self.repository.delete(dni)
+        finally:
+            self._invalidate([dni])
+
+    def save_many(self, users: Iterable[User]) -> List[User]:
+        users = list(users)
+        try:
+            return self.repository.save_many(users)
+        finally:
+            self._invalidate(user._dni for user in users)
+
+    def delete_many(self, dnis: Iterable[str]) -> int:
+        dnis = list(dnis)
+        try:
+            return self.repository.delete_many(dnis)
+        finally:
+            self._invalidate(dnis)
+
+    def list(self, offset: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None,
+             lastname_prefix: Optional[str] = None, username_contains: Optional[str] = None) -> List[User]:
+        if not (offset or limit is not None or cursor or lastname_prefix or username_contains):
+            return self.repository.list()
+        return self.repository.list(offset=offset, limit=limit, cursor=cursor,
+                                    lastname_prefix=lastname_prefix, username_contains=username_contains)
+
+    def iter_users(self) -> Iterator[User]:
+        return self.repository.iter_users()
+
+    def search(self, lastname_prefix: Optional[str] = None, username_prefix: Optional[str] = None,
+               limit: Optional[int] = None) -> List[User]:
+        return self.repository.search(lastname_prefix=lastname_prefix, username_prefix=username_prefix, limit=limit)
+
+    def close(self) -> None:
+        close = getattr(self.repository, 'close', None)
+        if close is not None:
+            close()
@@ -0,0 +1,170 @@
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Iterable, Iterator, List, Optional
+from .serializers import get_serializer
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    seq: int
+    # 'put' (alta o actualización) o 'delete'
+    op: str
+    dni: str
+    username: Optional[str] = None
+    lastname: Optional[str] = None
+    timestamp: float = 0.0
+
+
+class ChangeFeedGapError(LookupError):
+    """Los cambios pedidos ya salieron del buffer: hay que leerlos del sink o resincronizar."""
+
+
+class JsonlChangeSink:
+    """Escribe cada evento como una línea JSON en un archivo local (append)."""
+
+    def __init__(self, path: str, fsync: bool = False, serializer: Optional[str] = None):
+        self.path = path
+        self.fsync = fsync
+        self.serializer = get_serializer(serializer)
+        self._file = open(path, 'ab')
+        self._truncate_torn_tail()
+
+    def _truncate_torn_tail(self) -> None:
+        # Una línea sin '\n' final quedó a medio escribir: se descarta para no pegarle la siguiente
+        size = self._file.seek(0, os.SEEK_END)
+        if not size:
+            return
+        with open(self.path, 'rb') as file:
+            position = size
+            while position > 0:
+                start = max(position - 4096, 0)
+                file.seek(start)
+                block = file.read(position - start)
+                if position == size and block.endswith(b'\n'):
+                    return
+                newline = block.rfind(b'\n')
+                if newline >= 0:
+                    self._file.truncate(start + newline + 1)
+                    return
+                position = start
+        self._file.truncate(0)
+
+    def write(self, events: Iterable[ChangeEvent]) -> None:
+        self._file.write(b''.join(self.serializer.dumps_line(asdict(event)) + b'\n' for event in events))
+        # Se vacía en cada lote para que quien siga el archivo vea los eventos enseguida
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def last_seq(self) -> int:
+        """Último seq escrito (0 si el archivo está vacío), para continuar la numeración al reabrir."""
+        with open(self.path, 'rb') as file:
+            end = file.seek(0, os.SEEK_END)
+            chunk = 4096
+            while True:
+                start = max(end - chunk, 0)
+                file.seek(start)
+                lines = file.read(end - start).splitlines()
+                # La primera línea del bloque puede estar cortada; la última, a medio escribir
+                for line in reversed(lines if start == 0 else lines[1:]):
+                    try:
+                        return self.serializer.loads(line)['seq']
+                    except self.serializer.decode_errors + (KeyError,):
+                        continue
+                if start == 0:
+                    return 0
+                chunk *= 2
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def read_jsonl_changes(path: str, since: int = 0, serializer: Optional[str] = None) -> Iterator[ChangeEvent]:
+    """Eventos con seq > since de un archivo escrito por JsonlChangeSink."""
+    serializer = get_serializer(serializer)
+    with open(path, 'rb') as file:
+        for line in file:
+            try:
+                data = serializer.loads(line)
+            except serializer.decode_errors:
+                # Última línea a medio escribir
+                continue
+            if data['seq'] > since:
+                yield ChangeEvent(**data)
+
+
+class ChangeFeed:
+    """Secuencia ordenada de cambios con un buffer circular acotado.
+
+    Cada evento recibe un seq creciente. changes_since(seq) devuelve los
+    posteriores en O(cambios) mientras sigan en el buffer; los sinks
+    (p. ej. JsonlChangeSink) reciben todos los eventos en el mismo orden.
+
+    Entrega como mucho una vez: el evento se publica después de aplicar la
+    mutación, así que si el proceso cae entre ambas el cambio queda en el
+    repositorio sin evento. Un consumidor que necesite exactitud debe
+    resincronizar desde el snapshot tras una caída del escritor.
+    """
+
+    # Garantía de entrega que se anuncia a los consumidores (p. ej. en GET /changes)
+    delivery = 'at-most-once'
+
+    def __init__(self, capacity: int = 100_000, sinks: Iterable = (), start_seq: int = 0,
+                 clock=time.time):
+        if capacity <= 0:
+            raise ValueError("La capacidad del buffer debe ser mayor que cero.")
+        self.capacity = capacity
+        self.sinks = list(sinks)
+        self._clock = clock
+        # El evento con seq s ocupa la posición s % capacity
+        self._buffer: List[Optional[ChangeEvent]] = [None] * capacity
+        self._last_seq = start_seq
+        self._first_seq = start_seq + 1
+        self._condition = threading.Condition()
+
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    @property
+    def first_seq(self) -> int:
+        """seq más antiguo que sigue en el buffer."""
+        return self._first_seq
+
+    def publish(self, changes: Iterable[tuple]) -> List[ChangeEvent]:
+        """Publica (op, dni, username, lastname) en orden; devuelve los eventos con su seq."""
+        with self._condition:
+            timestamp = self._clock()
+            events = []
+            for op, dni, username, lastname in changes:
+                self._last_seq += 1
+                event = ChangeEvent(self._last_seq, op, dni, username, lastname, timestamp)
+                self._buffer[self._last_seq % self.capacity] = event
+                events.append(event)
+            if not events:
+                return events
+            self._first_seq = max(self._first_seq, self._last_seq - self.capacity + 1)
+            # Dentro del cerrojo: los sinks ven los eventos en el orden de los seq
+            for sink in self.sinks:
+                sink.write(events)
+            self._condition.notify_all()
+        return events
+
+    def changes_since(self, seq: int, limit: Optional[int] = None) -> List[ChangeEvent]:
+        with self._condition:
+            if seq < self._first_seq - 1:
+                raise ChangeFeedGapError(f"Los cambios posteriores a {seq} ya no están en el buffer "
+                                         f"(el más antiguo es {self._first_seq})")
+            stop = self._last_seq if limit is None else min(self._last_seq, seq + limit)
+            return [self._buffer[current % self.capacity] for current in range(seq + 1, stop + 1)]
+
+    def wait(self, seq: int, timeout: Optional[float] = None) -> bool:
+        """Espera a que haya eventos posteriores a seq; False si vence el timeout."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._last_seq > seq, timeout)
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
@@ -0,0 +1,87 @@
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional
+from use_cases import UserRepositoryInterface
+from entities import User
+from .change_feed import ChangeFeed
+
+
+class ChangeFeedUserRepository(UserRepositoryInterface):
+    """Decorador que publica en un ChangeFeed cada mutación de otro repositorio.
+
+    Las mutaciones y su publicación se hacen bajo el mismo cerrojo, así que
+    el orden de los seq es el orden en que se aplicaron los cambios. Solo se
+    publican cambios efectivos: ni update ni delete de un DNI inexistente.
+    El evento se publica tras aplicar la mutación: entrega como mucho una vez
+    (ver ChangeFeed).
+    """
+
+    def __init__(self, repository: UserRepositoryInterface, feed: Optional[ChangeFeed] = None):
+        self.repository = repository
+        self.feed = feed if feed is not None else ChangeFeed()
+        self._lock = threading.Lock()
+
+    def changes_since(self, seq: int, limit: Optional[int] = None):
+        return self.feed.changes_since(seq, limit)
+
+    def save(self, user: User) -> User:
+        with self._lock:
+            saved = self.repository.save(user)
+            self.feed.publish([('put', user._dni, user._username, user._lastname)])
+        return saved
+
+    def get(self, dni: str) -> Optional[User]:
+        return self.repository.get(dni)
+
+    def exists(self, dni: str) -> bool:
+        return self.repository.exists(dni)
+
+    def delete(self, dni: str) -> None:
+        with self._lock:
+            if self.repository.get(dni) is None:
+                return
+            self.repository.delete(dni)
+            self.feed.publish([('delete', dni, None, None)])
+
+    def update(self, dni: str, new_username: str, new_last_name: str) -> Optional[User]:
+        with self._lock:
+            updated = self.repository.update(dni, new_username, new_last_name)
+            if updated is not None:
+                self.feed.publish([('put', dni, new_username, new_last_name)])
+        return updated
+
+    def list(self, offset: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None,
+             lastname_prefix: Optional[str] = None, username_contains: Optional[str] = None) -> List[User]:
+        if not (offset or limit is not None or cursor or lastname_prefix or username_contains):
+            return self.repository.list()
+        return self.repository.list(offset=offset, limit=limit, cursor=cursor,
+                                    lastname_prefix=lastname_prefix, username_contains=username_contains)
+
+    def save_many(self, users: Iterable[User]) -> List[User]:
+        users = list(users)
+        with self._lock:
+            saved = self.repository.save_many(users)
+            self.feed.publish(('put', user._dni, user._username, user._lastname) for user in users)
+        return saved
+
+    def get_many(self, dnis: Iterable[str]) -> Dict[str, User]:
+        return self.repository.get_many(dnis)
+
+    def delete_many(self, dnis: Iterable[str]) -> int:
+        dnis = list(dict.fromkeys(dnis))
+        with self._lock:
+            existing = self.repository.get_many(dnis)
+            deleted = self.repository.delete_many(dnis)
+            self.feed.publish(('delete', dni, None, None) for dni in dnis if dni in existing)
+        return deleted
+
+    def iter_users(self) -> Iterator[User]:
+        return self.repository.iter_users()
+
+    def search(self, lastname_prefix: Optional[str] = None, username_prefix: Optional[str] = None,
+               limit: Optional[int] = None) -> List[User]:
+        return self.repository.search(lastname_prefix=lastname_prefix, username_prefix=username_prefix, limit=limit)
+
+    def close(self) -> None:
+        close = getattr(self.repository, 'close', None)
+        if close is not None:
+            close()
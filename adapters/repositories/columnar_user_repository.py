@@ -0,0 +1,355 @@
+import threading
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from use_cases import UserPage, UserRepositoryInterface
+from use_cases.user_page import normalize_text, paginate
+from entities import User
+from entities.dni import DNI_LETTERS
+from .sorted_index import SortedKeyIndex
+
+# Código de letra: 0..22 en mayúscula, 23..45 en minúscula (se conserva tal cual se guardó)
+_LETTER_CODES = {letter: code for code, letter in enumerate(DNI_LETTERS + DNI_LETTERS.lower())}
+_CODE_LETTERS = DNI_LETTERS + DNI_LETTERS.lower()
+_EMPTY = 0
+_TOMBSTONE = -1
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+def pack_dni(dni: str) -> Optional[int]:
+    # 8 dígitos * 64 + código de letra: cabe en un entero de 64 bits
+    if type(dni) is not str or len(dni) != 9:
+        return None
+    number, letter = dni[:8], dni[8]
+    if not (number.isascii() and number.isdigit()) or letter not in _LETTER_CODES:
+        return None
+    return int(number) * 64 + _LETTER_CODES[letter]
+
+
+def unpack_dni(packed: int) -> str:
+    return f"{packed >> 6:08d}{_CODE_LETTERS[packed & 63]}"
+
+
+class StringTable:
+    """Tabla de cadenas internadas: cada nombre distinto se guarda una sola vez.
+
+    Cada id lleva la cuenta de las filas que lo usan; al llegar a cero la
+    cadena se libera y el id se reutiliza, así que la tabla no crece con las
+    actualizaciones y bajas.
+    """
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._refs = array('I')
+        self._free_ids: List[int] = []
+
+    def intern(self, value: str) -> int:
+        """Id de value con una referencia más."""
+        string_id = self._ids.get(value)
+        if string_id is None:
+            if self._free_ids:
+                string_id = self._free_ids.pop()
+                self.strings[string_id] = value
+            else:
+                string_id = len(self.strings)
+                self.strings.append(value)
+                self._refs.append(0)
+            self._ids[value] = string_id
+        self._refs[string_id] += 1
+        return string_id
+
+    def release(self, string_id: int) -> None:
+        refs = self._refs[string_id] - 1
+        self._refs[string_id] = refs
+        if refs == 0:
+            del self._ids[self.strings[string_id]]
+            self.strings[string_id] = ''
+            self._free_ids.append(string_id)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class PackedHashIndex:
+    """Tabla hash de direccionamiento abierto (sondeo lineal) de DNI empaquetado -> fila.
+
+    Cada hueco guarda fila + 1 en un array de enteros de 64 bits: 0 es hueco
+    vacío y -1 una tumba dejada por un borrado.
+    """
+
+    MAX_LOAD = 0.7
+
+    def __init__(self, capacity_bits: int = 10):
+        self._bits = capacity_bits
+        self._slots = array('q', bytes(8 << capacity_bits))
+        self._used = 0
+
+    def _probe(self, packed: int, keys: array) -> Tuple[int, int]:
+        # Devuelve (hueco donde está la clave o -1, primer hueco libre para insertarla)
+        mask = (1 << self._bits) - 1
+        slot = ((packed * _HASH_MULTIPLIER) & _MASK64) >> (64 - self._bits)
+        free = -1
+        slots = self._slots
+        while True:
+            value = slots[slot]
+            if value == _EMPTY:
+                return -1, slot if free < 0 else free
+            if value == _TOMBSTONE:
+                if free < 0:
+                    free = slot
+            elif keys[value - 1] == packed:
+                return slot, free
+            slot = (slot + 1) & mask
+
+    def find(self, packed: int, keys: array) -> int:
+        slot, _ = self._probe(packed, keys)
+        return -1 if slot < 0 else self._slots[slot] - 1
+
+    def insert(self, packed: int, row: int, keys: array) -> None:
+        if self._used + 1 > self.MAX_LOAD * len(self._slots):
+            self._resize(keys)
+        slot, free = self._probe(packed, keys)
+        if slot >= 0:
+            self._slots[slot] = row + 1
+            return
+        if self._slots[free] == _EMPTY:
+            self._used += 1
+        self._slots[free] = row + 1
+
+    def remove(self, packed: int, keys: array) -> None:
+        slot, _ = self._probe(packed, keys)
+        if slot >= 0:
+            self._slots[slot] = _TOMBSTONE
+
+    def _resize(self, keys: array) -> None:
+        old_slots = self._slots
+        live = sum(1 for value in old_slots if value > 0)
+        # Se duplica solo si hace falta; si abundan las tumbas basta con reconstruir
+        if live + 1 > self.MAX_LOAD * (1 << self._bits) / 2:
+            self._bits += 1
+        self._slots = array('q', bytes(8 << self._bits))
+        self._used = 0
+        for value in old_slots:
+            if value > 0:
+                _, free = self._probe(keys[value - 1], keys)
+                self._slots[free] = value
+                self._used += 1
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._slots) * self._slots.itemsize
+
+
+class ColumnarUserRepository(UserRepositoryInterface):
+    """Repositorio en memoria con almacenamiento por columnas.
+
+    Cada usuario ocupa una fila en tres arrays (DNI empaquetado, id de nombre,
+    id de apellido) en lugar de un dict con tres claves.
+
+    Las lecturas también toman el cerrojo: las escrituras reconstruyen el
+    índice hash, reutilizan filas borradas y liberan cadenas en el sitio, y
+    una lectura sin cerrojo podría ver cualquiera de esos pasos a medias.
+    """
+
+    def __init__(self, users: Iterable[User] = ()):
+        self._lock = threading.RLock()
+        self._dnis = array('q')
+        self._username_ids = array('I')
+        self._lastname_ids = array('I')
+        self._free_rows: List[int] = []
+        self._names = StringTable()
+        self._index = PackedHashIndex()
+        self._count = 0
+        self._dni_index = None
+        self._lastname_index = None
+        self._username_index = None
+        for user in users:
+            self.save(user)
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> 'ColumnarUserRepository':
+        # Carga desde registros ya validados (p. ej. el dict de un FileUserRepository)
+        repository = cls()
+        for record in records:
+            repository._put(record['username'], record['lastname'], record['dni'])
+        return repository
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes ocupados por las columnas y el índice hash (sin contar las cadenas)."""
+        return (self._index.nbytes + self._dnis.itemsize * len(self._dnis)
+                + self._username_ids.itemsize * len(self._username_ids)
+                + self._lastname_ids.itemsize * len(self._lastname_ids))
+
+    def _row_user(self, row: int) -> User:
+        strings = self._names.strings
+        return User.from_trusted(strings[self._username_ids[row]], strings[self._lastname_ids[row]],
+                                 unpack_dni(self._dnis[row]))
+
+    def _find(self, dni: str) -> int:
+        packed = pack_dni(dni)
+        return -1 if packed is None else self._index.find(packed, self._dnis)
+
+    def _put(self, username: str, lastname: str, dni: str) -> None:
+        packed = pack_dni(dni)
+        if packed is None:
+            raise ValueError(f"DNI no empaquetable: {dni}")
+        with self._lock:
+            username_id = self._names.intern(username)
+            lastname_id = self._names.intern(lastname)
+            row = self._index.find(packed, self._dnis)
+            if row >= 0:
+                self._unindex_names(row)
+                old_ids = self._username_ids[row], self._lastname_ids[row]
+                self._username_ids[row] = username_id
+                self._lastname_ids[row] = lastname_id
+                self._index_names(row)
+                # Después de internar los nuevos: un nombre que no cambia no llega a liberarse
+                self._release_names(*old_ids)
+                return
+            if self._free_rows:
+                row = self._free_rows.pop()
+                self._dnis[row] = packed
+                self._username_ids[row] = username_id
+                self._lastname_ids[row] = lastname_id
+            else:
+                row = len(self._dnis)
+                self._dnis.append(packed)
+                self._username_ids.append(username_id)
+                self._lastname_ids.append(lastname_id)
+            self._index.insert(packed, row, self._dnis)
+            self._count += 1
+            if self._dni_index is not None:
+                self._dni_index.add(packed)
+            self._index_names(row)
+
+    def _name_keys(self, row: int):
+        strings = self._names.strings
+        packed = self._dnis[row]
+        return ((self._lastname_index, (normalize_text(strings[self._lastname_ids[row]]), packed)),
+                (self._username_index, (normalize_text(strings[self._username_ids[row]]), packed)))
+
+    def _release_names(self, username_id: int, lastname_id: int) -> None:
+        self._names.release(username_id)
+        self._names.release(lastname_id)
+
+    def _index_names(self, row: int) -> None:
+        for index, key in self._name_keys(row):
+            if index is not None:
+                index.add(key)
+
+    def _unindex_names(self, row: int) -> None:
+        for index, key in self._name_keys(row):
+            if index is not None:
+                index.discard(key)
+
+    def save(self, user: User) -> User:
+        self._put(user._username, user._lastname, user._dni)
+        return user
+
+    def get(self, dni: str) -> Optional[User]:
+        with self._lock:
+            row = self._find(dni)
+            return self._row_user(row) if row >= 0 else None
+
+    def delete(self, dni: str) -> None:
+        with self._lock:
+            row = self._find(dni)
+            if row < 0:
+                return
+            packed = self._dnis[row]
+            self._unindex_names(row)
+            self._release_names(self._username_ids[row], self._lastname_ids[row])
+            self._index.remove(packed, self._dnis)
+            if self._dni_index is not None:
+                self._dni_index.discard(packed)
+            # La fila queda libre para reutilizarse (DNI -1 no coincide con ninguna clave)
+            self._dnis[row] = -1
+            self._free_rows.append(row)
+            self._count -= 1
+
+    def update(self, dni: str, new_username: str, new_last_name: str) -> Optional[User]:
+        with self._lock:
+            if self._find(dni) < 0:
+                return None
+            updated_user = User(new_username, new_last_name, dni)
+            self._put(new_username, new_last_name, dni)
+        return updated_user
+
+    def _live_rows(self) -> Iterator[int]:
+        dnis = self._dnis
+        return (row for row in range(len(dnis)) if dnis[row] >= 0)
+
+    def list(self, offset: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None,
+             lastname_prefix: Optional[str] = None, username_contains: Optional[str] = None) -> UserPage:
+        if not (offset or limit is not None or cursor or lastname_prefix or username_contains):
+            with self._lock:
+                return UserPage(self._row_user(row) for row in self._live_rows())
+        with self._lock:
+            if self._dni_index is None:
+                self._dni_index = SortedKeyIndex(self._dnis[row] for row in self._live_rows())
+            start = None
+            if cursor:
+                start = pack_dni(cursor)
+                if start is None:
+                    raise ValueError(f"Cursor no válido: {cursor}")
+            skip = 0 if lastname_prefix or username_contains else max(offset, 0)
+            rows = (self._index.find(packed, self._dnis)
+                    for packed in self._dni_index.iter_from(start, inclusive=False, offset=skip))
+            return paginate(rows, self._row_user, offset - skip, limit, lastname_prefix, username_contains,
+                            self._row_fields)
+
+    def _row_fields(self, row: int) -> tuple:
+        strings = self._names.strings
+        return strings[self._username_ids[row]], strings[self._lastname_ids[row]], unpack_dni(self._dnis[row])
+
+    def iter_users(self) -> Iterator[User]:
+        with self._lock:
+            rows = list(self._live_rows())
+        for row in rows:
+            # La fila pudo borrarse (y reutilizarse) desde la copia: se lee bajo el cerrojo
+            with self._lock:
+                user = self._row_user(row) if self._dnis[row] >= 0 else None
+            if user is not None:
+                yield user
+
+    def search(self, lastname_prefix: Optional[str] = None, username_prefix: Optional[str] = None,
+               limit: Optional[int] = None) -> List[User]:
+        lastname_prefix = normalize_text(lastname_prefix or '')
+        username_prefix = normalize_text(username_prefix or '')
+        with self._lock:
+            if self._lastname_index is None:
+                self._lastname_index = SortedKeyIndex(
+                    (normalize_text(self._names.strings[self._lastname_ids[row]]), self._dnis[row])
+                    for row in self._live_rows())
+                self._username_index = SortedKeyIndex(
+                    (normalize_text(self._names.strings[self._username_ids[row]]), self._dnis[row])
+                    for row in self._live_rows())
+            if lastname_prefix:
+                keys, other_prefix, other_column = (self._lastname_index.iter_prefix(lastname_prefix),
+                                                    username_prefix, self._username_ids)
+            else:
+                keys, other_prefix, other_column = (self._username_index.iter_prefix(username_prefix),
+                                                    lastname_prefix, self._lastname_ids)
+            found = []
+            for _, packed in keys:
+                row = self._index.find(packed, self._dnis)
+                if other_prefix and not normalize_text(self._names.strings[other_column[row]]).startswith(other_prefix):
+                    continue
+                found.append(self._row_user(row))
+                if limit is not None and len(found) >= limit:
+                    break
+        return found
+
+    def get_many(self, dnis: Iterable[str]) -> Dict[str, User]:
+        found = {}
+        with self._lock:
+            for dni in dnis:
+                row = self._find(dni)
+                if row >= 0:
+                    found[dni] = self._row_user(row)
+        return found
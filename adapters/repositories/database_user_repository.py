@@ -0,0 +1,162 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+from use_cases import UserPage, UserRepositoryInterface
+from use_cases.user_page import normalize_text, paginate, validate_page_params
+from entities import User
+from external.database import SQLiteConnectionPool
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS users (
+        dni TEXT PRIMARY KEY,
+        username TEXT NOT NULL,
+        lastname TEXT NOT NULL,
+        username_norm TEXT NOT NULL,
+        lastname_norm TEXT NOT NULL
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS idx_users_lastname ON users (lastname_norm, dni)",
+    "CREATE INDEX IF NOT EXISTS idx_users_username ON users (username_norm, dni)",
+)
+
+# Texto SQL constante: sqlite3 reutiliza la sentencia preparada de su caché por conexión
+SQL_UPSERT = ("INSERT OR REPLACE INTO users (dni, username, lastname, username_norm, lastname_norm) "
+              "VALUES (?, ?, ?, ?, ?)")
+SQL_GET = "SELECT username, lastname, dni FROM users WHERE dni = ?"
+SQL_EXISTS = "SELECT 1 FROM users WHERE dni = ?"
+SQL_DELETE = "DELETE FROM users WHERE dni = ?"
+SQL_UPDATE = "UPDATE users SET username = ?, lastname = ?, username_norm = ?, lastname_norm = ? WHERE dni = ?"
+SQL_LIST_AFTER = "SELECT username, lastname, dni FROM users WHERE dni > ? ORDER BY dni LIMIT ?"
+ITER_PAGE_SIZE = 1000
+GET_MANY_CHUNK = 500
+# Cota superior para búsquedas por prefijo con rangos sobre el índice
+PREFIX_UPPER_BOUND = '\U0010ffff'
+
+
+class DatabaseUserRepository(UserRepositoryInterface):
+    def __init__(self, database: str = 'users.db', pool_size: int = 4, pool: Optional[SQLiteConnectionPool] = None):
+        self.pool = pool or SQLiteConnectionPool(database, size=pool_size)
+        with self.pool.transaction() as connection:
+            for statement in SCHEMA:
+                connection.execute(statement)
+
+    def close(self):
+        self.pool.close()
+
+    def save(self, user: User) -> User:
+        with self.pool.connection() as connection:
+            connection.execute(SQL_UPSERT, _row(user._username, user._lastname, user._dni))
+        return user
+
+    def get(self, dni: str) -> Optional[User]:
+        with self.pool.connection() as connection:
+            row = connection.execute(SQL_GET, (dni,)).fetchone()
+        return _to_user(row) if row else None
+
+    def exists(self, dni: str) -> bool:
+        with self.pool.connection() as connection:
+            return connection.execute(SQL_EXISTS, (dni,)).fetchone() is not None
+
+    def delete(self, dni: str) -> None:
+        with self.pool.connection() as connection:
+            connection.execute(SQL_DELETE, (dni,))
+
+    def update(self, dni: str, new_username: str, new_last_name: str) -> Optional[User]:
+        # Comprobación y escritura en la misma transacción: un borrado concurrente no puede colarse entre ambas
+        with self.pool.transaction() as connection:
+            if connection.execute(SQL_EXISTS, (dni,)).fetchone() is None:
+                return None
+            # Se validan los nuevos datos antes de persistirlos (si fallan, la transacción se deshace)
+            updated_user = User(new_username, new_last_name, dni)
+            cursor = connection.execute(SQL_UPDATE, (new_username, new_last_name, normalize_text(new_username),
+                                                     normalize_text(new_last_name), dni))
+            if cursor.rowcount != 1:
+                return None
+        return updated_user
+
+    def list(self, offset: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None,
+             lastname_prefix: Optional[str] = None, username_contains: Optional[str] = None) -> UserPage:
+        validate_page_params(offset, limit)
+        conditions, params = [], []
+        if cursor:
+            conditions.append("dni > ?")
+            params.append(cursor)
+        if lastname_prefix:
+            prefix = normalize_text(lastname_prefix)
+            conditions += ["lastname_norm >= ?", "lastname_norm < ?"]
+            params += [prefix, prefix + PREFIX_UPPER_BOUND]
+        if username_contains:
+            conditions.append("instr(username_norm, ?) > 0")
+            params.append(normalize_text(username_contains))
+        query = "SELECT username, lastname, dni FROM users"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        # Se pide una fila de más para saber si existe una página siguiente
+        query += " ORDER BY dni LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else limit + 1, offset]
+        with self.pool.connection() as connection:
+            rows = connection.execute(query, params).fetchall()
+        return paginate(rows, _to_user, limit=limit)
+
+    def iter_users(self) -> Iterator[User]:
+        # Páginas por clave (dni > último): la conexión vuelve al pool entre página y página,
+        # así que un consumidor lento no acapara el pool. Cada página ve los cambios ya confirmados
+        last_dni = ''
+        while True:
+            with self.pool.connection() as connection:
+                rows = connection.execute(SQL_LIST_AFTER, (last_dni, ITER_PAGE_SIZE)).fetchall()
+            for row in rows:
+                yield _to_user(row)
+            if len(rows) < ITER_PAGE_SIZE:
+                return
+            last_dni = rows[-1][2]
+
+    def search(self, lastname_prefix: Optional[str] = None, username_prefix: Optional[str] = None,
+               limit: Optional[int] = None) -> List[User]:
+        conditions, params = [], []
+        order = "dni"
+        for column, prefix in (('lastname_norm', lastname_prefix), ('username_norm', username_prefix)):
+            if prefix:
+                prefix = normalize_text(prefix)
+                conditions += [f"{column} >= ?", f"{column} < ?"]
+                params += [prefix, prefix + PREFIX_UPPER_BOUND]
+                if order == "dni":
+                    order = f"{column}, dni"
+        query = "SELECT username, lastname, dni FROM users"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY {order} LIMIT ?"
+        params.append(-1 if limit is None else limit)
+        with self.pool.connection() as connection:
+            return [_to_user(row) for row in connection.execute(query, params)]
+
+    def save_many(self, users: Iterable[User]) -> List[User]:
+        # Un único executemany dentro de una transacción: el lote entra completo o no entra
+        users = list(users)
+        with self.pool.transaction() as connection:
+            connection.executemany(SQL_UPSERT, (_row(u._username, u._lastname, u._dni) for u in users))
+        return users
+
+    def get_many(self, dnis: Iterable[str]) -> Dict[str, User]:
+        dnis = list(dict.fromkeys(dnis))
+        found = {}
+        with self.pool.connection() as connection:
+            for start in range(0, len(dnis), GET_MANY_CHUNK):
+                chunk = dnis[start:start + GET_MANY_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                query = f"SELECT username, lastname, dni FROM users WHERE dni IN ({placeholders})"
+                for row in connection.execute(query, chunk):
+                    found[row[2]] = _to_user(row)
+        return found
+
+    def delete_many(self, dnis: Iterable[str]) -> int:
+        with self.pool.transaction() as connection:
+            before = connection.total_changes
+            connection.executemany(SQL_DELETE, ((dni,) for dni in dict.fromkeys(dnis)))
+            return connection.total_changes - before
+
+
+def _row(username: str, lastname: str, dni: str) -> tuple:
+    return dni, username, lastname, normalize_text(username), normalize_text(lastname)
+
+
+def _to_user(row: tuple) -> User:
+    # Las filas ya se validaron al guardarse: no se revalida el DNI
+    return User.from_trusted(row[0], row[1], row[2])
@@ -0,0 +1,118 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueos advisory entre procesos
+    fcntl = None
+
+
+class ReadWriteLock:
+    """Cerrojo lectores/escritor dentro del proceso.
+
+    Varios lectores pueden entrar a la vez; el escritor entra solo. Los
+    escritores en espera tienen prioridad para no quedar bloqueados por un
+    flujo continuo de lectores. La parte de escritura es reentrante y el hilo
+    que escribe también puede leer.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        me = threading.get_ident()
+        with self._condition:
+            counted = self._writer != me
+            if counted:
+                while self._writer is not None or self._waiting_writers:
+                    self._condition.wait()
+                self._readers += 1
+        try:
+            yield
+        finally:
+            if counted:
+                with self._condition:
+                    self._readers -= 1
+                    if not self._readers:
+                        self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._writer_depth += 1
+            else:
+                self._waiting_writers += 1
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+                self._waiting_writers -= 1
+                self._writer = me
+                self._writer_depth = 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer_depth -= 1
+                if not self._writer_depth:
+                    self._writer = None
+                    self._condition.notify_all()
+
+
+class InterProcessFileLock:
+    """Bloqueo advisory (flock) sobre un archivo .lock compartido entre procesos.
+
+    Es reentrante y debe usarse con el cerrojo de escritura del proceso tomado,
+    que es quien serializa a los hilos.
+    """
+
+    def __init__(self, path: str):
+        if fcntl is None:
+            raise RuntimeError("El bloqueo entre procesos requiere fcntl (sistemas POSIX)")
+        self.path = path
+        self._fd = None
+        self._depth = 0
+        self._exclusive = False
+
+    def _acquire(self, exclusive: bool) -> None:
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if self._depth == 0:
+            fcntl.flock(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            self._exclusive = exclusive
+        elif exclusive and not self._exclusive:
+            raise RuntimeError("No se puede promocionar un bloqueo compartido a exclusivo")
+        self._depth += 1
+
+    def _release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    @contextmanager
+    def shared(self) -> Iterator[None]:
+        self._acquire(exclusive=False)
+        try:
+            yield
+        finally:
+            self._release()
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        self._acquire(exclusive=True)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -1,50 +1,438 @@
-import json
-from typing import List, Optional
-from use_cases import UserRepositoryInterface
+import atexit
+import logging
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from use_cases import UserPage, UserRepositoryInterface
+from use_cases.user_page import normalize_text, paginate
 from entities import User
+from .file_locks import InterProcessFileLock, ReadWriteLock
+from .user_journal import UserJournal, apply_records, batch_record, delete_record, put_record, record_dnis
+from .serializers import get_serializer
+from .sorted_index import SortedKeyIndex
+from .user_snapshot import load_snapshot, read_generation, set_aside_damaged_generations, write_snapshot
+
+logger = logging.getLogger(__name__)
 
 class FileUserRepository(UserRepositoryInterface):
-    def __init__(self, file_path: str = 'users.json'):
+    def __init__(self, file_path: str = 'users.json', journal: bool = False, fsync: bool = False,
+                 compact_threshold: int = 16 * 1024 * 1024, background_compaction: bool = False,
+                 keep_generations: int = 1, process_safe: bool = False, refresh_interval: float = 0.0,
+                 write_behind: bool = False, flush_interval: float = 1.0, flush_after: int = 1000,
+                 serializer: Optional[str] = None, snapshot_format: str = 'rows'):
+        if write_behind and process_safe:
+            # Recargar lo que escriben otros procesos descartaría los cambios aún no volcados
+            raise ValueError("write_behind no es compatible con process_safe")
         self.file_path = file_path
+        self.keep_generations = keep_generations
+        self.compact_threshold = compact_threshold
+        self.background_compaction = background_compaction
+        self.refresh_interval = refresh_interval
+        # Serializador JSON (orjson/msgspec si están instalados) y formato del snapshot
+        self.serializer = get_serializer(serializer)
+        self.snapshot_format = snapshot_format
+        # Bytes de snapshot escritos por este proceso (métrica)
+        self.bytes_written = 0
+        # Veces que se han incorporado escrituras de otros procesos
+        self.reloads = 0
+        self._rwlock = ReadWriteLock()
+        self._compaction_lock = threading.Lock()
+        self._compaction_thread = None
+        # Modo multiproceso: flock sobre <archivo>.lock y recarga de lo que escriben otros procesos
+        self._file_lock = InterProcessFileLock(self.file_path + '.lock') if process_safe else None
+        self._known_state = None
+        self._last_check = 0.0
+        # Modo journal: snapshot + log de mutaciones que se reproduce al arrancar
+        self.journal = None
+        if journal:
+            self.journal = UserJournal(self.file_path + '.journal', fsync=fsync, serializer=self.serializer)
+        with self._exclusive(refresh=False):
+            self._load(repair=True)
+        # Modo write-behind: las mutaciones se aplican en memoria y se vuelcan al
+        # disco cada flush_interval segundos o al acumular flush_after registros
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.flush_after = flush_after
+        self._unflushed: List[dict] = []
+        self._mutation_seq = 0
+        self._flushed_seq = 0
+        self._commit_condition = threading.Condition()
+        self._closed = threading.Event()
+        self._flush_thread = None
+        if write_behind:
+            if flush_interval > 0:
+                self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+                self._flush_thread.start()
+            atexit.register(_close_at_exit, weakref.ref(self))
+
+    def _load(self, repair: bool):
+        # Si el snapshot está dañado se recupera la última generación válida;
+        # si no queda ninguna se lanza CorruptSnapshotError en lugar de empezar vacío
+        users, self.generation, self.recovered_from = load_snapshot(
+            self.file_path, self.keep_generations, self.serializer)
+        if repair and self.recovered_from is not None:
+            set_aside_damaged_generations(self.file_path, self.recovered_from)
+        if self.journal is not None:
+            # Otro proceso puede haber rotado el log: el próximo append lo reabre
+            self.journal.close()
+            self.journal.replay(users, repair=repair)
+        self.users = users
+        # Índices ordenados (DNI para paginar, apellido y nombre normalizados para
+        # buscar por prefijo); se construyen al primer uso y después se mantienen
+        self._dni_index = None
+        self._lastname_index = None
+        self._username_index = None
+        self._known_state = self._disk_state()
+
+    def _disk_state(self) -> tuple:
         try:
-            with open(self.file_path, 'r') as file:
-                self.users = json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            self.users = {}
+            stat = os.stat(self.file_path)
+            snapshot = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            snapshot = None
+        return snapshot, self.journal.identity() if self.journal is not None else None
+
+    def _refresh(self, repair: bool):
+        # Incorpora lo que otros procesos hayan escrito desde la última vez.
+        # Se llama con el cerrojo de escritura y el flock (compartido o exclusivo) tomados.
+        state = self._disk_state()
+        if state == self._known_state:
+            return
+        self.reloads += 1
+        (known_snapshot, known_journal), (snapshot, journal) = self._known_state, state
+        snapshot_changed = snapshot != known_snapshot and read_generation(self.file_path) != self.generation
+        journal_replaced = self.journal is not None and (
+            (known_journal is not None and (journal is None or journal[0] != known_journal[0]))
+            or (journal is not None and journal[1] < self.journal.offset)
+        )
+        if snapshot_changed or journal_replaced:
+            self._load(repair)
+            return
+        if self.journal is not None:
+            # Mismo snapshot y mismo log: solo se aplican los registros nuevos
+            records = self.journal.read_new(repair)
+            previous = {dni: self.users.get(dni) for dni in record_dnis(records)}
+            apply_records(self.users, records)
+            self._update_indexes(previous)
+        self._known_state = self._disk_state()
+
+    @property
+    def data_version(self) -> Tuple[int, int, int]:
+        """Cambia con cada escritura: (generación, posición del journal, mutaciones sin volcar)."""
+        return self.generation, self.journal.offset if self.journal is not None else 0, len(self._unflushed)
+
+    def refresh(self) -> None:
+        """En modo multiproceso, incorpora lo que hayan escrito otros procesos."""
+        self._maybe_refresh()
+
+    def _maybe_refresh(self):
+        if self._file_lock is None:
+            return
+        if self.refresh_interval:
+            now = time.monotonic()
+            if now - self._last_check < self.refresh_interval:
+                return
+            self._last_check = now
+        if self._disk_state() != self._known_state:
+            with self._rwlock.write(), self._file_lock.shared():
+                self._refresh(repair=False)
+
+    @contextmanager
+    def _exclusive(self, refresh: bool = True):
+        # Cerrojo de escritura del proceso y, en modo multiproceso, flock exclusivo
+        # con el estado en memoria puesto al día antes de mutarlo
+        with self._rwlock.write():
+            if self._file_lock is None:
+                yield
+                return
+            with self._file_lock.exclusive():
+                if refresh:
+                    self._refresh(repair=True)
+                try:
+                    yield
+                finally:
+                    self._known_state = self._disk_state()
+
+    @contextmanager
+    def _reading(self):
+        self._maybe_refresh()
+        with self._rwlock.read():
+            yield
+
+    def _persist(self, users: Optional[dict] = None):
+        self.generation += 1
+        self.bytes_written += write_snapshot(self.file_path, self.users if users is None else users,
+                                             self.generation, self.keep_generations, self.serializer,
+                                             self.snapshot_format)
+
+    def _apply(self, records: List[dict]):
+        # Aplica las mutaciones en memoria y las persiste como una unidad;
+        # si la persistencia falla se deshacen los cambios en memoria
+        with self._exclusive():
+            previous = {record['dni']: self.users.get(record['dni']) for record in records}
+            apply_records(self.users, records)
+            try:
+                self._commit(records)
+            except BaseException:
+                for dni, user_data in previous.items():
+                    if user_data is None:
+                        self.users.pop(dni, None)
+                    else:
+                        self.users[dni] = user_data
+                raise
+            self._update_indexes(previous)
+
+    def _update_indexes(self, previous: Dict[str, Optional[dict]]):
+        for dni, old_data in previous.items():
+            new_data = self.users.get(dni)
+            if self._dni_index is not None:
+                if old_data is None and new_data is not None:
+                    self._dni_index.add(dni)
+                elif old_data is not None and new_data is None:
+                    self._dni_index.discard(dni)
+            for field, index in (('lastname', self._lastname_index), ('username', self._username_index)):
+                if index is None:
+                    continue
+                if old_data is not None:
+                    index.discard((normalize_text(old_data[field]), dni))
+                if new_data is not None:
+                    index.add((normalize_text(new_data[field]), dni))
+
+    def _name_index(self, field: str) -> SortedKeyIndex:
+        attribute = f'_{field}_index'
+        if getattr(self, attribute) is None:
+            setattr(self, attribute, SortedKeyIndex(
+                (normalize_text(data[field]), dni) for dni, data in self.users.items()
+            ))
+        return getattr(self, attribute)
+
+    def _commit(self, records: List[dict]):
+        if self.write_behind:
+            self._unflushed.extend(records)
+            self._mutation_seq += 1
+            if len(self._unflushed) >= self.flush_after:
+                try:
+                    self._flush_locked()
+                except BaseException:
+                    # _apply deshace este lote en memoria: tampoco debe quedar pendiente
+                    del self._unflushed[-len(records):]
+                    self._mutation_seq -= 1
+                    raise
+            return
+        self._write(records)
+
+    def _write(self, records: List[dict]):
+        # Sin journal se reescribe el archivo completo; con journal solo se añade al log
+        if self.journal is None:
+            self._persist()
+            return
+        self.journal.append(records if len(records) == 1 else [batch_record(records)])
+        if self.journal.size >= self.compact_threshold:
+            if self.background_compaction:
+                self._start_background_compaction()
+            elif self._compaction_lock.acquire(blocking=False):
+                # Si otro hilo ya está compactando no se le espera
+                try:
+                    self._compact()
+                finally:
+                    self._compaction_lock.release()
+
+    def _flush_locked(self):
+        if not self._unflushed:
+            return
+        self._write(self._unflushed)
+        self._unflushed = []
+        with self._commit_condition:
+            self._flushed_seq = self._mutation_seq
+            self._commit_condition.notify_all()
+
+    def flush(self):
+        """Vuelca al disco las mutaciones pendientes del modo write-behind."""
+        with self._exclusive():
+            self._flush_locked()
+
+    def wait_for_commit(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que las mutaciones hechas hasta ahora estén en disco.
+
+        Devuelve False si vence el timeout antes del siguiente volcado.
+        """
+        with self._commit_condition:
+            target = self._mutation_seq
+            return self._commit_condition.wait_for(lambda: self._flushed_seq >= target, timeout)
+
+    def _flush_loop(self):
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                # Los cambios siguen pendientes: se reintenta en el siguiente intervalo
+                logger.exception("Error al volcar el repositorio %s", self.file_path)
+
+    def compact(self):
+        """Vuelca el estado actual a un snapshot y descarta el journal ya aplicado."""
+        with self._compaction_lock:
+            self._compact()
 
-    def _persist(self):
-        with open(self.file_path, 'w') as file:
-            json.dump(self.users, file, indent=4, ensure_ascii=False)
+    def _compact(self):
+        if self.journal is None or self._file_lock is not None:
+            # En modo multiproceso toda la compactación se hace con el flock exclusivo
+            with self._exclusive():
+                if self.journal is None:
+                    self._persist()
+                    return
+                users = dict(self.users)
+                self.journal.rotate()
+                self._persist(users)
+                self.journal.discard_rotated()
+            return
+        with self._rwlock.write():
+            # Los registros de usuario nunca se mutan in situ, basta una copia superficial
+            users = dict(self.users)
+            self.journal.rotate()
+        self._persist(users)
+        self.journal.discard_rotated()
+
+    def _start_background_compaction(self):
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+        self._compaction_thread = threading.Thread(target=self.compact, daemon=True)
+        self._compaction_thread.start()
+
+    def close(self):
+        if self.write_behind and not self._closed.is_set():
+            self._closed.set()
+            if self._flush_thread is not None:
+                self._flush_thread.join()
+            self.flush()
+        if self._compaction_thread is not None:
+            self._compaction_thread.join()
+        if self.journal is not None:
+            self.journal.close()
+        if self._file_lock is not None:
+            self._file_lock.close()
+
+    def __enter__(self) -> 'FileUserRepository':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
 
     def save(self, user: User) -> User:
-        self.users[user._dni] = {
-            'username': user._username,
-            'lastname': user._lastname,
-            'dni': user._dni
-        }
-        self._persist()
+        self._apply([put_record(user._username, user._lastname, user._dni)])
         return user
-    
+
     def get(self, dni: str) -> Optional[User]:
+        # Consultar el dict es atómico: no hace falta el cerrojo de lectura
+        self._maybe_refresh()
         user_data = self.users.get(dni)
         if user_data:
-            return User(user_data['username'], user_data['lastname'], user_data['dni'])
+            return _to_user(user_data)
         return None
-    
+
+    def exists(self, dni: str) -> bool:
+        self._maybe_refresh()
+        return dni in self.users
+
     def delete(self, dni: str) -> None:
-        if dni in self.users:
-            del self.users[dni]
-            self._persist()
+        with self._exclusive():
+            if dni in self.users:
+                self._apply([delete_record(dni)])
 
     def update(self, dni: str, new_username: str, new_last_name: str) -> Optional[User]:
-        user_data = self.users.get(dni)
-        if not user_data:
-            return None
-        user_data['username'] = new_username
-        user_data['lastname'] = new_last_name
-        self.users[dni] = user_data
-        self._persist()
-        return User(user_data['username'], user_data['lastname'], user_data['dni'])
-
-    def list(self) -> List[User]:
-        return [User(data['username'], data['lastname'], data['dni']) for data in self.users.values()]
\ No newline at end of file
+        with self._exclusive():
+            if not self.users.get(dni):
+                return None
+            # Se validan los nuevos datos antes de persistirlos
+            updated_user = User(new_username, new_last_name, dni)
+            self._apply([put_record(new_username, new_last_name, dni)])
+        return updated_user
+
+    def list(self, offset: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None,
+             lastname_prefix: Optional[str] = None, username_contains: Optional[str] = None) -> UserPage:
+        if not (offset or limit is not None or cursor or lastname_prefix or username_contains):
+            with self._reading():
+                return UserPage(map(_to_user, self.users.values()))
+        self._maybe_refresh()
+        # Crear el índice perezoso modifica el estado: se hace con el cerrojo de escritura
+        with self._rwlock.write():
+            if self._dni_index is None:
+                self._dni_index = SortedKeyIndex(self.users)
+        with self._rwlock.read():
+            # Sin filtros el offset se salta por bloques en el índice
+            skip = 0 if lastname_prefix or username_contains else max(offset, 0)
+            dnis = self._dni_index.iter_from(cursor, inclusive=False, offset=skip)
+            # Solo se crean objetos User para los registros de la página
+            records = (self.users[dni] for dni in dnis)
+            return paginate(records, _to_user, offset - skip, limit, lastname_prefix, username_contains, _fields)
+
+    def iter_users(self) -> Iterator[User]:
+        # Se copian solo las referencias para tolerar escrituras concurrentes durante el recorrido
+        with self._reading():
+            records = list(self.users.values())
+        for data in records:
+            yield _to_user(data)
+
+    def search(self, lastname_prefix: Optional[str] = None, username_prefix: Optional[str] = None,
+               limit: Optional[int] = None) -> List[User]:
+        lastname_prefix = normalize_text(lastname_prefix or '')
+        username_prefix = normalize_text(username_prefix or '')
+        # Se recorre el índice del prefijo principal (O(log N + k)) y se filtra por el otro
+        field, prefix, other_field, other_prefix = (
+            ('lastname', lastname_prefix, 'username', username_prefix) if lastname_prefix
+            else ('username', username_prefix, 'lastname', lastname_prefix)
+        )
+        self._maybe_refresh()
+        with self._rwlock.write():
+            index = self._name_index(field)
+        found = []
+        with self._rwlock.read():
+            for _, dni in index.iter_prefix(prefix):
+                user_data = self.users[dni]
+                if other_prefix and not normalize_text(user_data[other_field]).startswith(other_prefix):
+                    continue
+                found.append(_to_user(user_data))
+                if limit is not None and len(found) >= limit:
+                    break
+        return found
+
+    def save_many(self, users: Iterable[User]) -> List[User]:
+        # Un solo persist por lote: o se escribe el lote completo o no se escribe nada
+        users = list(users)
+        if users:
+            self._apply([put_record(user._username, user._lastname, user._dni) for user in users])
+        return users
+
+    def get_many(self, dnis: Iterable[str]) -> Dict[str, User]:
+        self._maybe_refresh()
+        found = {}
+        for dni in dnis:
+            user_data = self.users.get(dni)
+            if user_data:
+                found[dni] = _to_user(user_data)
+        return found
+
+    def delete_many(self, dnis: Iterable[str]) -> int:
+        with self._exclusive():
+            records = [delete_record(dni) for dni in dict.fromkeys(dnis) if dni in self.users]
+            if records:
+                self._apply(records)
+        return len(records)
+
+
+def _close_at_exit(reference: weakref.ref):
+    repository = reference()
+    if repository is not None:
+        repository.close()
+
+
+def _fields(user_data: dict) -> tuple:
+    return user_data['username'], user_data['lastname'], user_data['dni']
+
+
+def _to_user(user_data: dict) -> User:
+    # Los registros almacenados ya se validaron al guardarse: no se revalida el DNI
+    return User.from_trusted(user_data['username'], user_data['lastname'], user_data['dni'])
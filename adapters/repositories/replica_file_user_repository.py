@@ -0,0 +1,280 @@
+import heapq
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+from use_cases import ReadOnlyRepositoryError, UserPage, UserRepositoryInterface
+from use_cases.user_page import paginate
+from entities import User
+from .file_user_repository import _fields, _to_user
+from .serializers import get_serializer
+from .sorted_index import SortedKeyIndex
+from .user_journal import UserJournal
+from .user_snapshot import load_snapshot, read_generation
+
+logger = logging.getLogger(__name__)
+
+# El delta se funde en una base nueva cuando supera esta fracción de la base (o MERGE_MIN registros)
+MERGE_RATIO = 8
+MERGE_MIN = 4096
+
+
+@dataclass
+class ReplicaStats:
+    polls: int = 0
+    # Recargas que solo aplicaron los registros nuevos del journal
+    delta_reloads: int = 0
+    # Recargas completas por una generación de snapshot nueva o un journal rotado
+    full_reloads: int = 0
+    records_applied: int = 0
+    # Segundos desde que el escritor modificó el archivo hasta que el cambio fue visible
+    last_staleness: float = 0.0
+    max_staleness: float = 0.0
+    # CPU (del hilo que recarga) de la última recarga y acumulada
+    last_reload_cpu: float = 0.0
+    reload_cpu: float = 0.0
+
+
+class _Base:
+    """Usuarios de una carga completa; no se modifica nunca, solo se sustituye."""
+
+    def __init__(self, users: Dict[str, dict]):
+        self.users = users
+        self._index: Optional[SortedKeyIndex] = None
+
+    def index(self) -> SortedKeyIndex:
+        # Si dos hilos lo construyen a la vez, uno de los dos índices se descarta
+        if self._index is None:
+            self._index = SortedKeyIndex(self.users)
+        return self._index
+
+
+class _State:
+    # delta: DNI -> registro, o None si se borró después de cargar la base
+    __slots__ = ('base', 'delta')
+
+    def __init__(self, base: _Base, delta: Dict[str, Optional[dict]]):
+        self.base = base
+        self.delta = delta
+
+    def get(self, dni: str) -> Optional[dict]:
+        delta = self.delta
+        if dni in delta:
+            return delta[dni]
+        return self.base.users.get(dni)
+
+    def __len__(self) -> int:
+        base = self.base.users
+        return len(base) + sum((data is not None) - (dni in base) for dni, data in self.delta.items())
+
+    def records(self) -> Iterator[dict]:
+        delta = self.delta
+        for dni, data in self.base.users.items():
+            if dni not in delta:
+                yield data
+        for data in delta.values():
+            if data is not None:
+                yield data
+
+    def sorted_dnis(self, cursor: Optional[str]) -> Iterator[str]:
+        delta = self.delta
+        base = (dni for dni in self.base.index().iter_from(cursor, inclusive=False) if dni not in delta)
+        changed = sorted(dni for dni, data in delta.items() if data is not None and (cursor is None or dni > cursor))
+        return heapq.merge(base, changed)
+
+
+class ReplicaFileUserRepository(UserRepositoryInterface):
+    """Réplica de solo lectura de los archivos de un FileUserRepository.
+
+    Sondea mtime/tamaño de users.json y de su journal (cada poll_interval
+    segundos en un hilo, o al llamar a refresh()). Los registros añadidos al
+    journal se aplican como un delta sobre la última carga; solo una
+    generación de snapshot nueva o un journal rotado obligan a releer todo.
+    Cada recarga construye un estado nuevo y lo publica con una asignación,
+    así que las lecturas nunca esperan ni ven un lote a medias.
+
+    Las mutaciones lanzan ReadOnlyRepositoryError; la búsqueda por prefijo
+    recorre todos los usuarios (la réplica no mantiene índices de nombres).
+    """
+
+    def __init__(self, file_path: str = 'users.json', poll_interval: float = 1.0, keep_generations: int = 1,
+                 serializer: Optional[str] = None, clock=time.time):
+        self.file_path = file_path
+        self.keep_generations = keep_generations
+        self.poll_interval = poll_interval
+        self.serializer = get_serializer(serializer)
+        self._clock = clock
+        self.journal = UserJournal(file_path + '.journal', serializer=self.serializer)
+        self._stats = ReplicaStats()
+        # Solo un hilo recarga a la vez; los lectores no toman este cerrojo
+        self._reload_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._load()
+        self._watch_thread = None
+        if poll_interval > 0:
+            self._watch_thread = threading.Thread(target=self._watch_loop, daemon=True)
+            self._watch_thread.start()
+
+    @property
+    def stats(self) -> ReplicaStats:
+        with self._reload_lock:
+            return ReplicaStats(**vars(self._stats))
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def _disk_state(self) -> tuple:
+        try:
+            stat = os.stat(self.file_path)
+            snapshot = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            snapshot = None
+        return snapshot, self.journal.identity()
+
+    def _consumed_state(self, snapshot, journal) -> tuple:
+        # Del journal se recuerda hasta dónde se ha leído, no su tamaño: lo que se
+        # añada mientras se lee (o una línea a medio escribir) se detecta en el próximo sondeo
+        return snapshot, None if journal is None else (journal[0], self.journal.offset)
+
+    def _load(self) -> None:
+        # El estado en disco se toma antes de leer: si cambia durante la lectura, el próximo sondeo lo recoge
+        snapshot, journal = self._disk_state()
+        users, self.generation, _ = load_snapshot(self.file_path, self.keep_generations, self.serializer)
+        # Sin reparar: la réplica nunca trunca los archivos del escritor
+        self.journal.replay(users, repair=False)
+        self._known_state = self._consumed_state(snapshot, journal)
+        self._state = _State(_Base(users), {})
+
+    @property
+    def data_version(self) -> Tuple[int, int, int]:
+        """Cambia con cada cambio incorporado: (generación, posición del journal, 0)."""
+        return self.generation, self.journal.offset, 0
+
+    def refresh(self) -> bool:
+        """Incorpora los cambios del escritor; devuelve True si había alguno."""
+        with self._reload_lock:
+            self._stats.polls += 1
+            state = self._disk_state()
+            if state == self._known_state:
+                return False
+            cpu_start = time.thread_time()
+            (known_snapshot, known_journal), (snapshot, journal) = self._known_state, state
+            snapshot_changed = snapshot != known_snapshot and read_generation(self.file_path) != self.generation
+            journal_replaced = (
+                (known_journal is not None and (journal is None or journal[0] != known_journal[0]))
+                or (journal is not None and journal[1] < self.journal.offset)
+            )
+            if snapshot_changed or journal_replaced:
+                self._load()
+                self._stats.full_reloads += 1
+                applied = len(self._state)
+            else:
+                records = self.journal.read_new(repair=False)
+                self._known_state = self._consumed_state(snapshot, journal)
+                if not records:
+                    # Solo había una línea a medio escribir (o un snapshot reescrito con la misma generación)
+                    return False
+                self._state = _merge(self._state, records)
+                self._stats.delta_reloads += 1
+                applied = len(records)
+            self._record_reload(applied, cpu_start)
+            return True
+
+    def _record_reload(self, applied: int, cpu_start: float) -> None:
+        stats = self._stats
+        stats.records_applied += applied
+        stats.last_reload_cpu = time.thread_time() - cpu_start
+        stats.reload_cpu += stats.last_reload_cpu
+        # Antigüedad del cambio más reciente cuando se hizo visible
+        modified = max((os.stat(path).st_mtime for path in (self.file_path, self.journal.path)
+                        if os.path.exists(path)), default=self._clock())
+        stats.last_staleness = max(self._clock() - modified, 0.0)
+        stats.max_staleness = max(stats.max_staleness, stats.last_staleness)
+
+    def _watch_loop(self) -> None:
+        while not self._closed.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception:
+                # Snapshot a medio escribir o dañado: se sigue sirviendo el último estado
+                logger.exception("Error al recargar la réplica de %s", self.file_path)
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._watch_thread is not None:
+            self._watch_thread.join()
+
+    def __enter__(self) -> 'ReplicaFileUserRepository':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def get(self, dni: str) -> Optional[User]:
+        user_data = self._state.get(dni)
+        return _to_user(user_data) if user_data else None
+
+    def exists(self, dni: str) -> bool:
+        return self._state.get(dni) is not None
+
+    def get_many(self, dnis) -> Dict[str, User]:
+        state = self._state
+        found = {}
+        for dni in dnis:
+            user_data = state.get(dni)
+            if user_data:
+                found[dni] = _to_user(user_data)
+        return found
+
+    def list(self, offset: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None,
+             lastname_prefix: Optional[str] = None, username_contains: Optional[str] = None) -> UserPage:
+        # Se fija el estado una vez: toda la página sale de la misma versión
+        state = self._state
+        if not (offset or limit is not None or cursor or lastname_prefix or username_contains):
+            return UserPage(map(_to_user, state.records()))
+        records = (state.get(dni) for dni in state.sorted_dnis(cursor))
+        return paginate(records, _to_user, offset, limit, lastname_prefix, username_contains, _fields)
+
+    def iter_users(self) -> Iterator[User]:
+        return map(_to_user, self._state.records())
+
+    def _read_only(self, *args, **kwargs):
+        raise ReadOnlyRepositoryError(f"La réplica de {self.file_path} es de solo lectura")
+
+    save = update = delete = save_many = delete_many = _read_only
+
+
+def _merge(state: _State, records: List[dict]) -> _State:
+    """Estado nuevo con los registros aplicados; el estado recibido no se toca."""
+    if not records:
+        return state
+    delta = dict(state.delta)
+    _apply_overlay(delta, records)
+    base = state.base
+    if len(delta) > max(MERGE_MIN, len(base.users) // MERGE_RATIO):
+        # Copia completa de la base fuera de la vista de los lectores; coste amortizado O(1) por registro
+        users = dict(base.users)
+        for dni, data in delta.items():
+            if data is None:
+                users.pop(dni, None)
+            else:
+                users[dni] = data
+        return _State(_Base(users), {})
+    return _State(base, delta)
+
+
+def _apply_overlay(delta: Dict[str, Optional[dict]], records: List[dict]) -> None:
+    for record in records:
+        op = record['op']
+        if op == 'batch':
+            _apply_overlay(delta, record['records'])
+        elif op == 'put':
+            delta[record['dni']] = {'username': record['username'], 'lastname': record['lastname'],
+                                    'dni': record['dni']}
+        elif op == 'del':
+            delta[record['dni']] = None
+        else:
+            raise ValueError(f"Operación de journal desconocida: {op}")
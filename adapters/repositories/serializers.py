@@ -0,0 +1,118 @@
+import gc
+import importlib
+import json
+from contextlib import contextmanager
+from importlib.util import find_spec
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    # Decodificar millones de contenedores dispara el GC cíclico una y otra vez
+    # sin que haya ciclos que recoger: se pausa mientras dura la carga
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class Serializer:
+    """Codifica y decodifica JSON; las subclases cambian el backend."""
+
+    name = 'json'
+    # Excepciones del backend que indican un documento no válido
+    decode_errors: Tuple[type, ...] = (ValueError, TypeError)
+
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def dumps_line(self, obj) -> bytes:
+        """Un registro en una sola línea, sin saltos: para el journal y los archivos JSONL."""
+        return self.dumps(obj)
+
+    def encode_users(self, users: Dict[str, dict]) -> bytes:
+        # Formato por filas: [[username, lastname, dni], ...] sin repetir las claves de cada registro
+        return self.dumps([[data['username'], data['lastname'], data['dni']] for data in users.values()])
+
+    def decode_rows(self, data) -> List[list]:
+        return self.loads(data)
+
+    def decode_users(self, data) -> Dict[str, dict]:
+        """Decodifica el formato por filas directamente a los registros del repositorio."""
+        with gc_paused():
+            return {dni: {'username': username, 'lastname': lastname, 'dni': dni}
+                    for username, lastname, dni in self.decode_rows(data)}
+
+
+class PrettyJsonSerializer(Serializer):
+    """JSON indentado (formato anterior): legible pero el doble de grande y más lento."""
+
+    name = 'json-pretty'
+
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=4).encode('utf-8')
+
+    def dumps_line(self, obj) -> bytes:
+        # Indentado, un registro ocuparía varias líneas y la lectura del journal lo tomaría por una cola corrupta
+        return Serializer.dumps(self, obj)
+
+
+class OrjsonSerializer(Serializer):
+    name = 'orjson'
+
+    def __init__(self):
+        # El backend se importa al elegirlo, no al importar el módulo
+        self._orjson = importlib.import_module('orjson')
+
+    def dumps(self, obj) -> bytes:
+        return self._orjson.dumps(obj)
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+
+class MsgspecSerializer(Serializer):
+    name = 'msgspec'
+
+    def __init__(self):
+        msgspec = importlib.import_module('msgspec')
+        self.decode_errors = (ValueError, TypeError, msgspec.DecodeError)
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+        # Decodificador con esquema: valida tipos y forma de cada fila al parsear
+        self._rows_decoder = msgspec.json.Decoder(List[Tuple[str, str, str]])
+
+    def dumps(self, obj) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data):
+        return self._decoder.decode(data)
+
+    def decode_rows(self, data) -> List[tuple]:
+        return self._rows_decoder.decode(data)
+
+
+# Backends opcionales registrados solo si están instalados (find_spec no los importa)
+SERIALIZERS = {'json': Serializer, 'json-pretty': PrettyJsonSerializer}
+if find_spec('orjson') is not None:
+    SERIALIZERS['orjson'] = OrjsonSerializer
+if find_spec('msgspec') is not None:
+    SERIALIZERS['msgspec'] = MsgspecSerializer
+
+
+def get_serializer(name: Optional[str] = None) -> Serializer:
+    """Devuelve el serializador pedido; None o 'auto' elige el más rápido instalado."""
+    if isinstance(name, Serializer):
+        return name
+    if name in (None, 'auto'):
+        name = next(candidate for candidate in ('orjson', 'msgspec', 'json') if candidate in SERIALIZERS)
+    try:
+        return SERIALIZERS[name]()
+    except KeyError:
+        raise ValueError(f"Serializador no disponible: {name} (disponibles: {', '.join(SERIALIZERS)})")
@@ -0,0 +1,264 @@
+import heapq
+import json
+import os
+import threading
+import zlib
+from contextlib import nullcontext
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Optional
+from use_cases import UserPage, UserRepositoryInterface
+from use_cases.user_page import normalize_text, paginate, validate_page_params
+from entities import User
+from .file_locks import InterProcessFileLock, ReadWriteLock, fcntl
+from .file_user_repository import FileUserRepository
+from .user_snapshot import _fsync_directory
+
+MANIFEST_NAME = 'manifest.json'
+LOCK_NAME = 'reshard.lock'
+MANIFEST_VERSION = 1
+SHARD_PREFIX = 'shard-'
+
+
+def _epoch_of(file_name: str) -> int:
+    # shard-<época>-<índice>.json
+    return int(file_name[len(SHARD_PREFIX):].split('-', 1)[0])
+
+
+def shard_index(dni: str, shard_count: int) -> int:
+    # crc32 y no hash(): el reparto tiene que ser el mismo en todos los procesos y ejecuciones
+    return zlib.crc32(dni.encode('utf-8')) % shard_count
+
+
+def _dni_key(user: User) -> str:
+    return user._dni
+
+
+class _ShardLayout:
+    """Conjunto de shards de una época: cada shard se abre la primera vez que se usa."""
+
+    def __init__(self, directory: str, epoch: int, shard_count: int, options: dict):
+        self.directory = directory
+        self.epoch = epoch
+        self.shard_count = shard_count
+        self._options = options
+        self._shards: List[Optional[FileUserRepository]] = [None] * shard_count
+        self._lock = threading.Lock()
+
+    def path(self, index: int) -> str:
+        return os.path.join(self.directory, f'{SHARD_PREFIX}{self.epoch:04d}-{index:04d}.json')
+
+    def shard(self, index: int) -> FileUserRepository:
+        shard = self._shards[index]
+        if shard is None:
+            with self._lock:
+                shard = self._shards[index]
+                if shard is None:
+                    shard = self._shards[index] = FileUserRepository(self.path(index), **self._options)
+        return shard
+
+    def shard_for(self, dni: str) -> FileUserRepository:
+        return self.shard(shard_index(dni, self.shard_count))
+
+    def all_shards(self) -> List[FileUserRepository]:
+        return [self.shard(index) for index in range(self.shard_count)]
+
+    def loaded_shards(self) -> List[FileUserRepository]:
+        return [shard for shard in self._shards if shard is not None]
+
+    def group(self, dnis: Iterable[str]) -> Dict[int, List[str]]:
+        groups: Dict[int, List[str]] = {}
+        for dni in dnis:
+            groups.setdefault(shard_index(dni, self.shard_count), []).append(dni)
+        return groups
+
+
+class ShardedFileUserRepository(UserRepositoryInterface):
+    """Repositorio repartido por DNI entre N archivos, cada uno un FileUserRepository.
+
+    Los shards se cargan la primera vez que se accede a ellos y cada mutación
+    solo reescribe el shard de su DNI (coste de persistencia ~1/N del total).
+    El número de shards vive en <directorio>/manifest.json; reshard() lo
+    cambia en caliente: las lecturas siguen sirviéndose mientras se copian los
+    datos y las escrituras esperan al cambio de manifiesto.
+
+    save_many y delete_many son atómicos dentro de cada shard, no entre shards.
+    """
+
+    def __init__(self, directory: str = 'users_shards', shards: int = 16, **shard_options):
+        if shards <= 0:
+            raise ValueError("El número de shards debe ser mayor que cero.")
+        self.directory = directory
+        # Opciones de cada FileUserRepository (journal, fsync, serializer, write_behind...)
+        self.shard_options = shard_options
+        # Las mutaciones comparten la parte de lectura; reshard toma la de escritura
+        self._rwlock = ReadWriteLock()
+        os.makedirs(directory, exist_ok=True)
+        # flock del directorio: un proceso que abre mientras otro hace reshard espera al nuevo manifiesto
+        self._directory_lock = InterProcessFileLock(os.path.join(directory, LOCK_NAME)) if fcntl else None
+        with self._locked_directory():
+            manifest = self._read_manifest()
+            if manifest is None:
+                manifest = {'epoch': 0, 'shards': shards}
+                self._write_manifest(manifest['epoch'], manifest['shards'])
+            self._layout = _ShardLayout(directory, manifest['epoch'], manifest['shards'], shard_options)
+            # Épocas anteriores que un reshard terminado no llegó a borrar. Las posteriores pueden ser
+            # de un reshard en curso en otro proceso: solo las limpia el propio reshard()
+            self._remove_epochs(lambda epoch: epoch >= self._layout.epoch)
+
+    @property
+    def shard_count(self) -> int:
+        return self._layout.shard_count
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.directory, MANIFEST_NAME)
+
+    def _read_manifest(self) -> Optional[dict]:
+        try:
+            with open(self._manifest_path(), 'rb') as file:
+                manifest = json.load(file)
+        except FileNotFoundError:
+            return None
+        if manifest.get('version') != MANIFEST_VERSION:
+            raise ValueError(f"Versión de manifiesto no soportada en {self.directory}: {manifest.get('version')}")
+        return manifest
+
+    def _write_manifest(self, epoch: int, shard_count: int) -> None:
+        path = self._manifest_path()
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump({'version': MANIFEST_VERSION, 'epoch': epoch, 'shards': shard_count, 'hash': 'crc32'}, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+        _fsync_directory(path)
+
+    def _locked_directory(self):
+        return self._directory_lock.exclusive() if self._directory_lock is not None else nullcontext()
+
+    def _remove_epochs(self, keep) -> None:
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(SHARD_PREFIX) and not keep(_epoch_of(entry.name)):
+                os.remove(entry.path)
+
+    def reshard(self, shard_count: int) -> None:
+        """Reparte los usuarios en shard_count shards nuevos sin detener las lecturas."""
+        if shard_count <= 0:
+            raise ValueError("El número de shards debe ser mayor que cero.")
+        with self._rwlock.write(), self._locked_directory():
+            old = self._layout
+            if shard_count == old.shard_count:
+                return
+            # Restos de un reshard interrumpido antes de cambiar el manifiesto: no deben mezclarse con los nuevos
+            self._remove_epochs(lambda epoch: epoch <= old.epoch)
+            new = _ShardLayout(self.directory, old.epoch + 1, shard_count, self.shard_options)
+            buckets: List[List[User]] = [[] for _ in range(shard_count)]
+            for shard in old.all_shards():
+                for user in shard.iter_users():
+                    buckets[shard_index(user._dni, shard_count)].append(user)
+            # Un único persist por shard nuevo; el manifiesto se cambia cuando todos están en disco
+            for index, users in enumerate(buckets):
+                new.shard(index).save_many(users)
+                new.shard(index).flush()
+            self._write_manifest(new.epoch, shard_count)
+            self._layout = new
+            for shard in old.loaded_shards():
+                shard.close()
+            self._remove_epochs(lambda epoch: epoch >= new.epoch)
+
+    def flush(self) -> None:
+        for shard in self._layout.loaded_shards():
+            shard.flush()
+
+    def close(self) -> None:
+        for shard in self._layout.loaded_shards():
+            shard.close()
+        if self._directory_lock is not None:
+            self._directory_lock.close()
+
+    def __enter__(self) -> 'ShardedFileUserRepository':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def __len__(self) -> int:
+        return sum(len(shard.users) for shard in self._layout.all_shards())
+
+    def save(self, user: User) -> User:
+        with self._rwlock.read():
+            return self._layout.shard_for(user._dni).save(user)
+
+    def get(self, dni: str) -> Optional[User]:
+        if type(dni) is not str:
+            return None
+        return self._layout.shard_for(dni).get(dni)
+
+    def exists(self, dni: str) -> bool:
+        return type(dni) is str and self._layout.shard_for(dni).exists(dni)
+
+    def delete(self, dni: str) -> None:
+        if type(dni) is not str:
+            return
+        with self._rwlock.read():
+            self._layout.shard_for(dni).delete(dni)
+
+    def update(self, dni: str, new_username: str, new_last_name: str) -> Optional[User]:
+        if type(dni) is not str:
+            return None
+        with self._rwlock.read():
+            return self._layout.shard_for(dni).update(dni, new_username, new_last_name)
+
+    def list(self, offset: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None,
+             lastname_prefix: Optional[str] = None, username_contains: Optional[str] = None) -> List[User]:
+        shards = self._layout.all_shards()
+        if not (offset or limit is not None or cursor or lastname_prefix or username_contains):
+            return UserPage(chain.from_iterable(shard.list() for shard in shards))
+        validate_page_params(offset, limit)
+        # Cada shard devuelve su parte ya filtrada y ordenada tras el cursor; basta con mezclarlas
+        shard_limit = None if limit is None else offset + limit + 1
+        if limit is None and not (cursor or lastname_prefix or username_contains):
+            # Solo offset: el shard tomaría su camino rápido, en orden de inserción
+            pages = [sorted(shard.list(), key=_dni_key) for shard in shards]
+        else:
+            pages = [shard.list(limit=shard_limit, cursor=cursor, lastname_prefix=lastname_prefix,
+                                username_contains=username_contains) for shard in shards]
+        merged = heapq.merge(*pages, key=_dni_key)
+        return paginate(merged, lambda user: user, offset, limit)
+
+    def iter_users(self) -> Iterator[User]:
+        for shard in self._layout.all_shards():
+            yield from shard.iter_users()
+
+    def search(self, lastname_prefix: Optional[str] = None, username_prefix: Optional[str] = None,
+               limit: Optional[int] = None) -> List[User]:
+        # Cada shard devuelve su parte ordenada por (campo normalizado, dni), como FileUserRepository.search
+        field = '_lastname' if lastname_prefix else '_username'
+        results = [shard.search(lastname_prefix=lastname_prefix, username_prefix=username_prefix, limit=limit)
+                   for shard in self._layout.all_shards()]
+        merged = heapq.merge(*results, key=lambda user: (normalize_text(getattr(user, field)), user._dni))
+        return list(islice(merged, limit))
+
+    def save_many(self, users: Iterable[User]) -> List[User]:
+        users = list(users)
+        with self._rwlock.read():
+            layout = self._layout
+            groups: Dict[int, List[User]] = {}
+            for user in users:
+                groups.setdefault(shard_index(user._dni, layout.shard_count), []).append(user)
+            for index, group in groups.items():
+                layout.shard(index).save_many(group)
+        return users
+
+    def get_many(self, dnis: Iterable[str]) -> Dict[str, User]:
+        layout = self._layout
+        found: Dict[str, User] = {}
+        for index, group in layout.group(dni for dni in dnis if type(dni) is str).items():
+            found.update(layout.shard(index).get_many(group))
+        return found
+
+    def delete_many(self, dnis: Iterable[str]) -> int:
+        with self._rwlock.read():
+            layout = self._layout
+            return sum(layout.shard(index).delete_many(group)
+                       for index, group in layout.group(dni for dni in dnis if type(dni) is str).items())
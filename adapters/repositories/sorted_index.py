@@ -0,0 +1,103 @@
+from bisect import bisect_left, bisect_right
+from typing import Any, Iterable, Iterator, List, Optional
+
+
+class SortedKeyIndex:
+    """Conjunto ordenado de claves repartido en bloques de tamaño acotado.
+
+    Insertar o borrar cuesta O(log N + LOAD) en lugar del O(N) de mover una
+    lista única, y recorrer a partir de una clave cuesta O(log N + k).
+    """
+
+    LOAD = 1000
+
+    def __init__(self, keys: Iterable[Any] = ()):
+        keys = sorted(set(keys))
+        self._chunks: List[list] = [keys[i:i + self.LOAD] for i in range(0, len(keys), self.LOAD)]
+        self._maxes: List[Any] = [chunk[-1] for chunk in self._chunks]
+        self._len = len(keys)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.iter_from()
+
+    def __contains__(self, key: Any) -> bool:
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            return False
+        chunk = self._chunks[pos]
+        index = bisect_left(chunk, key)
+        return index < len(chunk) and chunk[index] == key
+
+    def add(self, key: Any) -> None:
+        if not self._chunks:
+            self._chunks.append([key])
+            self._maxes.append(key)
+            self._len = 1
+            return
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            pos -= 1
+            self._chunks[pos].append(key)
+            self._maxes[pos] = key
+        else:
+            chunk = self._chunks[pos]
+            index = bisect_left(chunk, key)
+            if index < len(chunk) and chunk[index] == key:
+                return
+            chunk.insert(index, key)
+        self._len += 1
+        chunk = self._chunks[pos]
+        if len(chunk) > 2 * self.LOAD:
+            # Dividir el bloque para mantener acotado el coste de insertar
+            self._chunks[pos:pos + 1] = [chunk[:self.LOAD], chunk[self.LOAD:]]
+            self._maxes[pos:pos + 1] = [chunk[self.LOAD - 1], chunk[-1]]
+
+    def discard(self, key: Any) -> bool:
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            return False
+        chunk = self._chunks[pos]
+        index = bisect_left(chunk, key)
+        if index == len(chunk) or chunk[index] != key:
+            return False
+        del chunk[index]
+        self._len -= 1
+        if chunk:
+            self._maxes[pos] = chunk[-1]
+        else:
+            del self._chunks[pos]
+            del self._maxes[pos]
+        return True
+
+    def iter_from(self, start: Optional[Any] = None, inclusive: bool = True, offset: int = 0) -> Iterator[Any]:
+        """Recorre las claves en orden desde start (o desde el principio), saltando offset claves."""
+        if start is None:
+            pos, index = 0, 0
+        else:
+            search = bisect_left if inclusive else bisect_right
+            pos = search(self._maxes, start)
+            if pos == len(self._maxes):
+                return
+            index = search(self._chunks[pos], start)
+        # Saltar bloques enteros sin recorrer sus claves
+        while offset and pos < len(self._chunks):
+            remaining = len(self._chunks[pos]) - index
+            if offset < remaining:
+                index += offset
+                offset = 0
+            else:
+                offset -= remaining
+                pos, index = pos + 1, 0
+        for chunk in self._chunks[pos:]:
+            yield from chunk[index:] if index else chunk
+            index = 0
+
+    def iter_prefix(self, prefix: str) -> Iterator[tuple]:
+        """Claves (texto, ...) cuyo texto empieza por prefix, en O(log N + k)."""
+        for key in self.iter_from((prefix,)):
+            if not key[0].startswith(prefix):
+                return
+            yield key
@@ -0,0 +1,173 @@
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .serializers import Serializer, gc_paused, get_serializer
+
+
+class UserJournal:
+    """Log de escritura anticipada (append-only) para el repositorio de archivos.
+
+    Cada mutación se guarda como una línea JSON compacta:
+        {"op": "put", "dni": ..., "username": ..., "lastname": ...}
+        {"op": "del", "dni": ...}
+        {"op": "batch", "records": [...]}
+    """
+
+    def __init__(self, path: str, fsync: bool = False, serializer: Optional[Serializer] = None):
+        self.path = path
+        self.fsync = fsync
+        self.serializer = serializer or get_serializer()
+        self.offset = 0
+        self._file = None
+
+    @property
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    def replay(self, users: Dict[str, dict], repair: bool = True) -> int:
+        # Aplica el log sobre el snapshot cargado y devuelve el número de registros aplicados
+        applied = 0
+        for path in (self.rotated_path, self.path):
+            with gc_paused():
+                records, offset = self._read_file(path, 0, repair)
+                apply_records(users, records)
+            applied += len(records)
+        # Posición del log principal hasta la que el estado en memoria está al día
+        self.offset = offset
+        return applied
+
+    def read_all(self, repair: bool = True) -> List[dict]:
+        """Lee todos los registros (log rotado y principal) sin aplicarlos."""
+        records = []
+        for path in (self.rotated_path, self.path):
+            file_records, offset = self._read_file(path, 0, repair)
+            records.extend(file_records)
+        self.offset = offset
+        return records
+
+    def read_new(self, repair: bool = False) -> List[dict]:
+        """Lee los registros añadidos al log principal desde la última lectura o escritura."""
+        records, self.offset = self._read_file(self.path, self.offset, repair)
+        return records
+
+    def _read_file(self, path: str, offset: int, repair: bool) -> Tuple[List[dict], int]:
+        records = []
+        loads, decode_errors = self.serializer.loads, self.serializer.decode_errors
+        try:
+            with open(path, 'rb') as file:
+                file.seek(offset)
+                for line in file:
+                    # Escritura incompleta al final del log (caída a mitad de append)
+                    if not line.endswith(b'\n'):
+                        break
+                    try:
+                        records.append(loads(line))
+                    except decode_errors:
+                        break
+                    offset += len(line)
+        except FileNotFoundError:
+            return records, 0
+        if repair and offset < os.path.getsize(path):
+            # Cortamos la cola corrupta para que los siguientes appends no se mezclen con ella
+            with open(path, 'r+b') as file:
+                file.truncate(offset)
+        return records, offset
+
+    def append(self, records: Iterable[dict]) -> None:
+        if self._file is None:
+            self._file = open(self.path, 'ab')
+        dumps = self.serializer.dumps_line
+        data = b''.join(dumps(record) + b'\n' for record in records)
+        offset = self._file.seek(0, os.SEEK_END)
+        try:
+            self._file.write(data)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+        except OSError:
+            # No dejar una línea a medias en mitad del log
+            self.close()
+            with open(self.path, 'r+b') as file:
+                file.truncate(offset)
+            raise
+        self.offset = offset + len(data)
+
+    def identity(self) -> Optional[Tuple[int, int]]:
+        # (inodo, tamaño): un inodo distinto indica que otro proceso rotó el log
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size
+
+    @property
+    def rotated_path(self) -> str:
+        return self.path + '.old'
+
+    def rotate(self) -> None:
+        # Aparta el log actual para compactarlo; los nuevos appends van a un log vacío
+        self.close()
+        self.offset = 0
+        if not os.path.exists(self.path):
+            return
+        if os.path.exists(self.rotated_path):
+            # Quedó un log apartado de una compactación interrumpida: se concatena para no perderlo
+            with open(self.rotated_path, 'ab') as rotated, open(self.path, 'rb') as current:
+                rotated.write(current.read())
+            os.remove(self.path)
+        else:
+            os.replace(self.path, self.rotated_path)
+
+    def discard_rotated(self) -> None:
+        try:
+            os.remove(self.rotated_path)
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def put_record(username: str, lastname: str, dni: str) -> dict:
+    return {'op': 'put', 'dni': dni, 'username': username, 'lastname': lastname}
+
+
+def delete_record(dni: str) -> dict:
+    return {'op': 'del', 'dni': dni}
+
+
+def batch_record(records: List[dict]) -> dict:
+    # Un lote ocupa una sola línea: o se reproduce completo o (si quedó cortado) nada
+    return {'op': 'batch', 'records': records}
+
+
+def apply_record(users: Dict[str, dict], record: dict) -> None:
+    if record['op'] == 'batch':
+        apply_records(users, record['records'])
+    elif record['op'] == 'put':
+        users[record['dni']] = {
+            'username': record['username'],
+            'lastname': record['lastname'],
+            'dni': record['dni']
+        }
+    elif record['op'] == 'del':
+        users.pop(record['dni'], None)
+    else:
+        raise ValueError(f"Operación de journal desconocida: {record['op']}")
+
+
+def apply_records(users: Dict[str, dict], records: List[dict]) -> None:
+    for record in records:
+        apply_record(users, record)
+
+
+def record_dnis(records: Iterable[dict]) -> Iterator[str]:
+    for record in records:
+        if record['op'] == 'batch':
+            yield from record_dnis(record['records'])
+        else:
+            yield record['dni']
@@ -0,0 +1,201 @@
+import logging
+import os
+import shutil
+import zlib
+from typing import Dict, List, Optional, Tuple
+from .serializers import Serializer, get_serializer
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b'#users-snapshot'
+SNAPSHOT_VERSION = 2
+READ_CHUNK_SIZE = 1024 * 1024
+# 'rows': [[username, lastname, dni], ...]; 'object': {dni: {username, lastname, dni}} (formato v1)
+SNAPSHOT_FORMATS = ('rows', 'object')
+
+
+class CorruptSnapshotError(ValueError):
+    """El snapshot (y todas sus generaciones anteriores) está dañado."""
+
+
+def generation_path(path: str, generation_index: int) -> str:
+    # 0 es el snapshot vigente; 1..N son las generaciones anteriores conservadas
+    return path if generation_index == 0 else f"{path}.{generation_index}"
+
+
+def encode_header(generation: int, checksum: int, size: int, snapshot_format: str = 'rows') -> bytes:
+    return b'%s v%d gen=%d crc32=%08x size=%d format=%s\n' % (
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, generation, checksum, size, snapshot_format.encode('ascii'))
+
+
+def parse_header(line: bytes) -> Tuple[int, int, int, str]:
+    """Devuelve (generación, crc32, tamaño, formato); las cabeceras v1 son formato 'object'."""
+    parts = line.split()
+    if len(parts) < 2 or parts[0] != SNAPSHOT_MAGIC or parts[1] not in (b'v1', b'v%d' % SNAPSHOT_VERSION):
+        raise CorruptSnapshotError(f"Cabecera de snapshot no válida: {line[:80]!r}")
+    try:
+        fields = dict(part.split(b'=', 1) for part in parts[2:])
+        snapshot_format = fields.get(b'format', b'object').decode('ascii')
+        if snapshot_format not in SNAPSHOT_FORMATS:
+            raise ValueError(snapshot_format)
+        return int(fields[b'gen']), int(fields[b'crc32'], 16), int(fields[b'size']), snapshot_format
+    except (KeyError, ValueError):
+        raise CorruptSnapshotError(f"Cabecera de snapshot no válida: {line[:80]!r}")
+
+
+def write_snapshot(path: str, users: Dict[str, dict], generation: int, keep_generations: int = 1,
+                   serializer: Optional[Serializer] = None, snapshot_format: str = 'rows') -> int:
+    """Escribe el snapshot de forma atómica: archivo temporal + fsync + rename.
+
+    Devuelve el número de bytes escritos.
+    """
+    serializer = serializer or get_serializer()
+    if snapshot_format == 'rows':
+        body = serializer.encode_users(users)
+    elif snapshot_format == 'object':
+        body = serializer.dumps(users)
+    else:
+        raise ValueError(f"Formato de snapshot desconocido: {snapshot_format}")
+    header = encode_header(generation, zlib.crc32(body), len(body), snapshot_format)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(header)
+        file.write(body)
+        file.flush()
+        os.fsync(file.fileno())
+    _rotate_generations(path, keep_generations)
+    os.replace(tmp_path, path)
+    _fsync_directory(path)
+    return len(header) + len(body)
+
+
+def _rotate_generations(path: str, keep_generations: int) -> None:
+    if keep_generations <= 0 or not os.path.exists(path):
+        return
+    for index in range(keep_generations, 1, -1):
+        older = generation_path(path, index - 1)
+        if os.path.exists(older):
+            os.replace(older, generation_path(path, index))
+    previous = generation_path(path, 1)
+    if os.path.exists(previous):
+        os.remove(previous)
+    # El snapshot vigente nunca desaparece: se enlaza (o copia) antes de reemplazarlo
+    try:
+        os.link(path, previous)
+    except OSError:
+        shutil.copy2(path, previous)
+
+
+def set_aside_damaged_generations(path: str, recovered_from: str) -> None:
+    """Renombra a <archivo>.corrupt las generaciones más recientes que recovered_from.
+
+    Todas están dañadas (load_snapshot las descartó): si siguieran ahí, la
+    próxima rotación movería una de ellas sobre la única generación válida.
+    """
+    index = 0
+    while generation_path(path, index) != recovered_from:
+        candidate = generation_path(path, index)
+        if os.path.exists(candidate):
+            os.replace(candidate, candidate + '.corrupt')
+        index += 1
+    _fsync_directory(path)
+
+
+def _fsync_directory(path: str) -> None:
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def read_generation(path: str) -> Optional[int]:
+    """Lee solo la cabecera para conocer la generación (None si el archivo no existe)."""
+    try:
+        with open(path, 'rb') as file:
+            first_line = file.readline()
+    except FileNotFoundError:
+        return None
+    if not first_line.startswith(SNAPSHOT_MAGIC):
+        return 0
+    try:
+        return parse_header(first_line)[0]
+    except CorruptSnapshotError:
+        return None
+
+
+def read_snapshot(path: str, serializer: Optional[Serializer] = None) -> Tuple[Dict[str, dict], int]:
+    """Lee un snapshot validando el checksum mientras se lee el archivo.
+
+    Devuelve (usuarios, generación). Los archivos JSON sin cabecera (formato
+    anterior) se aceptan como generación 0.
+    """
+    serializer = serializer or get_serializer()
+    with open(path, 'rb') as file:
+        first_line = file.readline()
+        if not first_line.startswith(SNAPSHOT_MAGIC):
+            data = first_line + file.read()
+            # Un archivo vacío es un store vacío, no un snapshot dañado
+            if not data.strip():
+                return {}, 0
+            return _decode(path, serializer.loads, serializer, data, "sin cabecera y con JSON inválido"), 0
+        generation, expected_checksum, expected_size, snapshot_format = parse_header(first_line)
+        # Un único buffer del tamaño anunciado: sin copias al unir trozos
+        body = bytearray(expected_size)
+        view = memoryview(body)
+        checksum = 0
+        size = 0
+        while size < expected_size:
+            read = file.readinto(view[size:size + READ_CHUNK_SIZE])
+            if not read:
+                break
+            checksum = zlib.crc32(view[size:size + read], checksum)
+            size += read
+        if size == expected_size and file.read(1):
+            size += 1
+    if size != expected_size:
+        raise CorruptSnapshotError(f"Snapshot {path} truncado: {size} de {expected_size} bytes")
+    if checksum != expected_checksum:
+        raise CorruptSnapshotError(f"Checksum incorrecto en snapshot {path}")
+    decode = serializer.decode_users if snapshot_format == 'rows' else serializer.loads
+    return _decode(path, decode, serializer, body, "con un cuerpo que no se puede decodificar"), generation
+
+
+def _decode(path: str, decode, serializer: Serializer, data, problem: str) -> Dict[str, dict]:
+    try:
+        return decode(data)
+    except serializer.decode_errors as e:
+        raise CorruptSnapshotError(f"Snapshot {path} {problem}: {e}")
+
+
+def load_snapshot(path: str, keep_generations: int = 1,
+                  serializer: Optional[Serializer] = None) -> Tuple[Dict[str, dict], int, Optional[str]]:
+    """Carga el snapshot vigente o, si está dañado, la última generación válida.
+
+    Devuelve (usuarios, generación, ruta recuperada). La ruta recuperada es None
+    cuando el snapshot vigente era válido. Si ningún archivo existe se devuelve
+    un store vacío; si existen pero todos están dañados se lanza CorruptSnapshotError.
+    """
+    errors: List[str] = []
+    for index in range(keep_generations + 1):
+        candidate = generation_path(path, index)
+        try:
+            users, generation = read_snapshot(candidate, serializer)
+        except FileNotFoundError:
+            continue
+        except CorruptSnapshotError as e:
+            logger.error("Snapshot dañado: %s", e)
+            errors.append(str(e))
+            continue
+        if index > 0:
+            logger.warning("Recuperado el snapshot desde la generación anterior %s", candidate)
+            return users, generation, candidate
+        return users, generation, None
+    if errors:
+        raise CorruptSnapshotError("No hay ninguna generación de snapshot válida: " + "; ".join(errors))
+    return {}, 0, None
@@ -0,0 +1,77 @@
+"""
+Benchmark de throughput con asyncio: C peticiones de alta concurrentes.
+
+Compara el FileUserRepository síncrono envuelto en un hilo por petición
+(AsyncUserRepositoryAdapter) con AsyncFileUserRepository, que agrupa las
+escrituras concurrentes en un único persist. Mide peticiones/s y el número
+de snapshots escritos, además de la latencia máxima de una corrutina de
+control que comprueba que el bucle de eventos no se bloquea.
+
+    python -m benchmarks.bench_async --concurrency 10,100,1000 --base 100000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from adapters.repositories import AsyncFileUserRepository, AsyncUserRepositoryAdapter, FileUserRepository
+from use_cases import AsyncCreateUserUseCase
+from benchmarks.common import Timer, parse_sizes, print_table, synthetic_users, write_users_json
+
+
+async def heartbeat(stop: asyncio.Event, lags: list) -> None:
+    # Retraso máximo del bucle de eventos mientras dura la carga
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - start - 0.001)
+
+
+async def measure(repository, base: int, concurrency: int) -> tuple:
+    use_case = AsyncCreateUserUseCase(repository)
+    stop, lags = asyncio.Event(), []
+    monitor = asyncio.ensure_future(heartbeat(stop, lags))
+    with Timer() as timer:
+        await asyncio.gather(*(use_case.execute(*data) for data in synthetic_users(concurrency, start=base)))
+    stop.set()
+    await monitor
+    return concurrency / timer.elapsed, max(lags, default=0.0) * 1000
+
+
+async def run(path: str, base: int, concurrency: int, coalesced: bool, journal: bool) -> tuple:
+    write_users_json(path, base)
+    if coalesced:
+        repository = AsyncFileUserRepository(path, journal=journal, compact_threshold=1 << 62)
+        sync_repository = repository.repository
+    else:
+        sync_repository = FileUserRepository(path, journal=journal, compact_threshold=1 << 62)
+        repository = AsyncUserRepositoryAdapter(sync_repository)
+    generation = sync_repository.generation
+    throughput, lag_ms = await measure(repository, base, concurrency)
+    persists = sync_repository.generation - generation
+    await repository.close()
+    return throughput, lag_ms, persists
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=parse_sizes, default=parse_sizes('10,100,1000'))
+    parser.add_argument('--base', type=int, default=10000, help='usuarios precargados en el store')
+    parser.add_argument('--journal', action='store_true', help='usar el modo journal en lugar de snapshots')
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'users.json')
+        for concurrency in args.concurrency:
+            for coalesced in (False, True):
+                throughput, lag_ms, persists = asyncio.run(run(path, args.base, concurrency, coalesced,
+                                                               args.journal))
+                rows.append([concurrency, 'agrupado' if coalesced else 'hilo/petición', f"{throughput:.0f}",
+                             persists, f"{lag_ms:.1f}"])
+    print_table(['concurrencia', 'modo', 'req/s', 'snapshots', 'lag máx ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
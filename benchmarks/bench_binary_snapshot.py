@@ -0,0 +1,73 @@
+"""
+Benchmark de arranque en frío y primera consulta: snapshot JSON vs binario (mmap).
+
+Para cada tamaño mide, en un proceso nuevo por medición (caché de páginas
+caliente, intérprete frío), el tiempo de abrir el repositorio, la latencia
+del primer get y la media de gets aleatorios, además del RSS al terminar
+(Linux: se lee de /proc/self/statm).
+
+    python -m benchmarks.bench_binary_snapshot --sizes 100000,1000000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from adapters.repositories.binary_snapshot import convert_json_to_binary
+from adapters.repositories.user_snapshot import write_snapshot
+from benchmarks.common import parse_sizes, print_table, synthetic_users
+
+PROBE = '''
+import json, os, random, sys, time
+from adapters.repositories import BinaryUserRepository, FileUserRepository
+kind, path, size, gets = sys.argv[1], sys.argv[2], int(sys.argv[3]), int(sys.argv[4])
+from benchmarks.common import synthetic_dni
+dnis = [synthetic_dni(i) for i in random.Random(3).choices(range(size), k=gets)]
+start = time.perf_counter()
+repository = BinaryUserRepository(path) if kind == 'binario' else FileUserRepository(path)
+opened = time.perf_counter()
+repository.get(dnis[0])
+first = time.perf_counter()
+for dni in dnis:
+    repository.get(dni)
+done = time.perf_counter()
+# RSS actual (no el pico: ru_maxrss se hereda del proceso padre a través de exec)
+with open('/proc/self/statm') as statm:
+    rss = int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+print(json.dumps({'open': opened - start, 'first': first - opened, 'get': (done - first) / gets, 'rss': rss}))
+'''
+
+
+def probe(kind: str, path: str, size: int, gets: int) -> dict:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, '-c', PROBE, kind, path, str(size), str(gets)], cwd=root,
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=parse_sizes, default=parse_sizes('100000,1000000'))
+    parser.add_argument('--gets', type=int, default=10000)
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            json_path, binary_path = os.path.join(tmp, 'users.json'), os.path.join(tmp, 'users.bin')
+            users = {dni: {'username': u, 'lastname': l, 'dni': dni} for u, l, dni in synthetic_users(size)}
+            write_snapshot(json_path, users, 1)
+            del users
+            convert_json_to_binary(json_path, binary_path)
+            for kind, path in (('json', json_path), ('binario', binary_path)):
+                result = probe(kind, path, size, args.gets)
+                rows.append([size, kind, f"{os.path.getsize(path) / 1e6:.1f}", f"{result['open'] * 1000:.1f}",
+                             f"{result['first'] * 1e6:.1f}", f"{result['get'] * 1e6:.2f}",
+                             f"{result['rss'] / 1e6:.0f}"])
+    print_table(['usuarios', 'formato', 'MB', 'arranque ms', 'primer get µs', 'get µs', 'RSS MB'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark de BloomGuardedUserRepository: latencia de las consultas de DNIs inexistentes.
+
+Para cada repositorio mide exists() de DNIs que no están, sin filtro y con
+él, además de la tasa de falsos positivos observada frente a la estimada y
+la memoria del filtro. La mitad final mide el coste añadido en los DNIs que
+sí existen (filtro + consulta).
+
+    python -m benchmarks.bench_bloom --size 100000 --lookups 20000
+"""
+import argparse
+import os
+import tempfile
+
+from adapters.repositories import BloomGuardedUserRepository, DatabaseUserRepository, FileUserRepository
+from entities import User
+from benchmarks.common import Timer, print_table, synthetic_dni, synthetic_users
+
+
+def repository_factories(tmp: str):
+    return {
+        'file (journal)': lambda: FileUserRepository(os.path.join(tmp, 'users.json'), journal=True,
+                                                     compact_threshold=1 << 62),
+        'sqlite (WAL)': lambda: DatabaseUserRepository(os.path.join(tmp, 'users.db')),
+    }
+
+
+def per_lookup_us(check, dnis) -> float:
+    with Timer() as timer:
+        for dni in dnis:
+            check(dni)
+    return timer.elapsed / len(dnis) * 1e6
+
+
+def run(name: str, factory, size: int, lookups: int, error_rate: float) -> list:
+    repository = factory()
+    repository.save_many(User.from_trusted(*data) for data in synthetic_users(size))
+    # DNIs válidos fuera del rango insertado: todos son negativos
+    missing = [synthetic_dni(size + 1 + index * 7) for index in range(lookups)]
+    present = [synthetic_dni(index * (size // lookups or 1) % size) for index in range(lookups)]
+    with Timer() as build:
+        guarded = BloomGuardedUserRepository(repository, error_rate=error_rate)
+    row = [name, f"{per_lookup_us(repository.exists, missing):.2f}", f"{per_lookup_us(guarded.exists, missing):.2f}",
+           f"{per_lookup_us(repository.exists, present):.2f}", f"{per_lookup_us(guarded.exists, present):.2f}"]
+    stats = guarded.stats
+    row += [f"{stats.observed_false_positive_rate:.4f}", f"{guarded.estimated_false_positive_rate():.4f}",
+            f"{guarded.memory_bytes / 1024:,.0f}", f"{build.elapsed * 1000:.0f}"]
+    guarded.close()
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--lookups', type=int, default=20000)
+    parser.add_argument('--error-rate', type=float, default=0.01)
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, factory in repository_factories(tmp).items():
+            rows.append(run(name, factory, args.size, args.lookups, args.error_rate))
+    print_table(['repositorio', 'µs miss', 'µs miss+bloom', 'µs hit', 'µs hit+bloom',
+                 'FP observada', 'FP estimada', 'KB filtro', 'ms construir'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark de arranque en frío de FileUserRepository (carga del snapshot).
+
+Compara el formato anterior (JSON indentado, cargado con json.load como hacía
+el repositorio original) con los snapshots compactos por filas, para cada
+serializador instalado (json siempre; orjson y msgspec si están disponibles).
+Muestra tamaño del archivo, tiempo de arranque y tiempo de persistir.
+
+    python -m benchmarks.bench_cold_start --sizes 100000,1000000
+"""
+import argparse
+import json
+import os
+import tempfile
+
+from adapters.repositories import FileUserRepository
+from adapters.repositories.serializers import SERIALIZERS, PrettyJsonSerializer
+from adapters.repositories.user_snapshot import write_snapshot
+from benchmarks.common import Timer, parse_sizes, print_table, synthetic_users
+
+
+def load_before(path: str) -> float:
+    # Ruta de carga original: json.load del archivo indentado completo
+    with Timer() as timer:
+        with open(path, encoding='utf-8') as file:
+            file.readline()
+            json.load(file)
+    return timer.elapsed
+
+
+def load_after(path: str, serializer: str) -> tuple:
+    with Timer() as load:
+        repository = FileUserRepository(path, serializer=serializer)
+    with Timer() as persist:
+        repository._persist()
+    return load.elapsed, persist.elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=parse_sizes, default=parse_sizes('100000,1000000'))
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'users.json')
+        for size in args.sizes:
+            users = {dni: {'username': u, 'lastname': l, 'dni': dni} for u, l, dni in synthetic_users(size)}
+            with Timer() as dump:
+                write_snapshot(path, users, 1, serializer=PrettyJsonSerializer(), snapshot_format='object')
+            rows.append([size, 'antes (indent=4)', 'json', f"{os.path.getsize(path) / 1e6:.1f}",
+                         f"{load_before(path):.2f}", f"{dump.elapsed:.2f}"])
+            for name in SERIALIZERS:
+                if name == 'json-pretty':
+                    continue
+                write_snapshot(path, users, 1, serializer=SERIALIZERS[name]())
+                load, persist = load_after(path, name)
+                rows.append([size, 'filas compactas', name, f"{os.path.getsize(path) / 1e6:.1f}",
+                             f"{load:.2f}", f"{persist:.2f}"])
+            del users
+    print_table(['usuarios', 'formato', 'serializador', 'MB', 'arranque s', 'persist s'], rows)
+
+
+if __name__ == '__main__':
+    main()
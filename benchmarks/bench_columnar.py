@@ -0,0 +1,60 @@
+"""
+Benchmark de memoria: dict de dicts (FileUserRepository) frente al almacén por columnas.
+
+    python -m benchmarks.bench_columnar --count 1000000
+"""
+import argparse
+import gc
+import random
+import tracemalloc
+
+from adapters.repositories import ColumnarUserRepository
+from benchmarks.common import Timer, print_table, synthetic_users
+
+
+def traced(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, allocated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=1000000)
+    parser.add_argument('--distinct-names', type=int, default=5000,
+                        help='nombres y apellidos distintos (los datos reales se repiten mucho)')
+    parser.add_argument('--gets', type=int, default=100000)
+    args = parser.parse_args()
+
+    rows = [(f"Nombre{i % args.distinct_names}", f"Apellido{(i * 7) % args.distinct_names}", dni)
+            for i, (_, _, dni) in enumerate(synthetic_users(args.count))]
+
+    def build_dicts():
+        # Mismo layout que FileUserRepository.users tras json.load (cadenas propias por registro)
+        return {dni: {'username': ''.join(u), 'lastname': ''.join(l), 'dni': ''.join(dni)} for u, l, dni in rows}
+
+    def build_columnar():
+        return ColumnarUserRepository.from_records(
+            {'username': u, 'lastname': l, 'dni': dni} for u, l, dni in rows)
+
+    users, dict_bytes = traced(build_dicts)
+    del users
+    columnar, columnar_bytes = traced(build_columnar)
+
+    dnis = random.Random(3).choices([row[2] for row in rows], k=args.gets)
+    with Timer() as get:
+        for dni in dnis:
+            columnar.get(dni)
+    print_table(['layout', 'bytes/usuario', 'MiB total'], [
+        ['dict de dicts', f"{dict_bytes / args.count:.0f}", f"{dict_bytes / 2**20:.1f}"],
+        ['columnar', f"{columnar_bytes / args.count:.0f}", f"{columnar_bytes / 2**20:.1f}"],
+    ])
+    print(f"\nColumnar: {columnar.nbytes / args.count:.1f} bytes/usuario en arrays + índice hash, "
+          f"get {args.gets / get.elapsed:,.0f} ops/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark de concurrencia de FileUserRepository en modo multiproceso.
+
+Lanza P procesos que guardan K usuarios cada uno (DNIs distintos por proceso)
+sobre el mismo archivo con process_safe=True. Al terminar comprueba que el
+store contiene exactamente P*K usuarios (ninguna actualización perdida) y
+muestra el rendimiento agregado en modo snapshot y en modo journal.
+
+    python -m benchmarks.bench_concurrency --processes 1,2,4,8 --writes 200
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+
+from adapters.repositories import FileUserRepository
+from entities import User
+from benchmarks.common import Timer, parse_sizes, print_table, synthetic_users, write_users_json
+
+
+def worker(path: str, journal: bool, start: int, writes: int, ready, go) -> None:
+    repository = FileUserRepository(path, journal=journal, process_safe=True, compact_threshold=1 << 62)
+    users = [User(*data) for data in synthetic_users(writes, start=start)]
+    ready.wait()
+    go.wait()
+    for user in users:
+        repository.save(user)
+    repository.close()
+
+
+def run(path: str, base: int, processes: int, writes: int, journal: bool) -> tuple:
+    write_users_json(path, base)
+    ready = multiprocessing.Barrier(processes + 1)
+    go = multiprocessing.Event()
+    workers = [multiprocessing.Process(target=worker, args=(path, journal, base + i * writes, writes, ready, go))
+               for i in range(processes)]
+    for process in workers:
+        process.start()
+    # Se mide solo la fase de escritura, no el arranque de los procesos
+    ready.wait()
+    with Timer() as timer:
+        go.set()
+        for process in workers:
+            process.join()
+    final = len(FileUserRepository(path, journal=journal).list())
+    lost = base + processes * writes - final
+    return processes * writes / timer.elapsed, lost
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', type=parse_sizes, default=parse_sizes('1,2,4,8'))
+    parser.add_argument('--writes', type=int, default=200, help='escrituras por proceso')
+    parser.add_argument('--base', type=int, default=10000, help='usuarios precargados en el store')
+    args = parser.parse_args()
+
+    rows = []
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        for journal in (False, True):
+            for processes in args.processes:
+                path = os.path.join(tmp, f'users_{journal}_{processes}.json')
+                throughput, lost = run(path, args.base, processes, args.writes, journal)
+                failed = failed or lost != 0
+                rows.append(['journal' if journal else 'snapshot', processes, f"{throughput:.0f}", lost])
+    print_table(['modo', 'procesos', 'writes/s', 'perdidas'], rows)
+    if failed:
+        raise SystemExit("Se han perdido actualizaciones")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark de validación y generación masiva de DNIs.
+
+Valida N DNIs (un porcentaje corrompidos) construyendo User(...) uno a uno,
+con is_valid_dni, con validate_dni_batch sin NumPy y, si está instalado, con
+validate_dni_batch vectorizado (desde una lista y desde un array 'U9').
+Compara también generate_valid_dnis con la generación uno a uno.
+
+    python -m benchmarks.bench_dni_batch --count 10000000 --invalid 0.05
+"""
+import argparse
+import random
+
+from entities import User, generate_valid_dnis, is_valid_dni, validate_dni_batch
+from entities import dni as dni_module
+from benchmarks.common import Timer, print_table, synthetic_dni
+
+
+def corrupt(dnis: list, fraction: float, seed: int = 7) -> list:
+    # Cambia la letra de control de una fracción de los DNIs
+    generator = random.Random(seed)
+    for index in generator.sample(range(len(dnis)), int(len(dnis) * fraction)):
+        dnis[index] = dnis[index][:8] + ('A' if dnis[index][8] != 'A' else 'B')
+    return dnis
+
+
+def validate_with_user(dnis: list) -> int:
+    valid = 0
+    for dni in dnis:
+        try:
+            User('Nombre', 'Apellido', dni)
+            valid += 1
+        except ValueError:
+            pass
+    return valid
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=1000000)
+    parser.add_argument('--invalid', type=float, default=0.05, help='fracción de DNIs con letra errónea')
+    args = parser.parse_args()
+
+    dnis = corrupt(generate_valid_dnis(args.count, seed=1), args.invalid)
+    variants = [
+        ('User(...) en bucle', lambda: validate_with_user(dnis)),
+        ('is_valid_dni en bucle', lambda: sum(map(is_valid_dni, dnis))),
+        ('validate_dni_batch (Python)', lambda: validate_dni_batch(dnis, use_numpy=False).valid_count),
+    ]
+    if dni_module.load_numpy() is not None:
+        array = dni_module.numpy.array(dnis, dtype='U9')
+        variants += [
+            ('validate_dni_batch (NumPy, lista)', lambda: validate_dni_batch(dnis, use_numpy=True).valid_count),
+            ('validate_dni_batch (NumPy, array)', lambda: validate_dni_batch(array, use_numpy=True).valid_count),
+        ]
+    rows = []
+    baseline = None
+    for name, run in variants:
+        with Timer() as timer:
+            valid = run()
+        baseline = baseline or timer.elapsed
+        rows.append([name, f"{valid:,}", f"{timer.elapsed:.2f}", f"{args.count / timer.elapsed:,.0f}",
+                     f"{baseline / timer.elapsed:.1f}x"])
+    print_table(['validación', 'válidos', 'segundos', 'DNIs/s', 'speedup'], rows)
+
+    generators = [
+        ('synthetic_dni uno a uno', lambda: [synthetic_dni(n) for n in range(args.count)]),
+        ('generate_valid_dnis', lambda: generate_valid_dnis(args.count)),
+        ('generate_valid_dnis (seed)', lambda: generate_valid_dnis(args.count, seed=1)),
+    ]
+    if dni_module.load_numpy() is not None:
+        generators.append(('generate_valid_dnis (NumPy)', lambda: generate_valid_dnis(args.count, as_array=True)))
+    rows = []
+    for name, run in generators:
+        with Timer() as timer:
+            run()
+        rows.append([name, f"{timer.elapsed:.2f}", f"{args.count / timer.elapsed:,.0f}"])
+    print()
+    print_table(['generación', 'segundos', 'DNIs/s'], rows)
+
+
+if __name__ == '__main__':
+    main()
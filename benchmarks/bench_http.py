@@ -0,0 +1,102 @@
+"""
+Benchmark de carga de la API HTTP (adapters/controllers).
+
+Arranca el servidor en un hilo sobre un store temporal y lanza C clientes
+concurrentes con conexiones keep-alive (http.client). Para cada endpoint
+mide peticiones/s y latencias p50/p99.
+
+    python -m benchmarks.bench_http --requests 2000 --clients 8 --batch-creates
+"""
+import argparse
+import http.client
+import json
+import os
+import tempfile
+import threading
+
+from adapters.controllers import UserController, make_server
+from adapters.repositories import FileUserRepository
+from benchmarks.common import Timer, print_table, synthetic_users
+
+
+def percentile(latencies: list, fraction: float) -> float:
+    ordered = sorted(latencies)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def run_clients(address: tuple, requests: list, clients: int) -> tuple:
+    """Reparte las peticiones (método, ruta, cuerpo) entre los clientes; devuelve (req/s, latencias)."""
+    latencies = []
+    errors = []
+
+    def client(chunk):
+        connection = http.client.HTTPConnection(*address)
+        local = []
+        for method, path, body in chunk:
+            with Timer() as timer:
+                connection.request(method, path, body)
+                response = connection.getresponse()
+                response.read()
+            local.append(timer.elapsed)
+            if response.status >= 400:
+                errors.append((method, path, response.status))
+        connection.close()
+        latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(requests[i::clients],)) for i in range(clients)]
+    with Timer() as timer:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    if errors:
+        raise RuntimeError(f"{len(errors)} peticiones fallidas, p. ej. {errors[0]}")
+    return len(requests) / timer.elapsed, latencies
+
+
+def endpoint_requests(count: int, bulk_size: int) -> list:
+    users = list(synthetic_users(count))
+    body = lambda u, l, d: json.dumps({'username': u, 'lastname': l, 'dni': d})
+    bulk_users = synthetic_users(count * bulk_size, start=count)
+    bulk = [json.dumps([{'username': u, 'lastname': l, 'dni': d} for u, l, d in
+                        (next(bulk_users) for _ in range(bulk_size))]) for _ in range(count)]
+    return [
+        ('create', [('POST', '/users', body(*user)) for user in users]),
+        ('find', [('GET', f'/users/{dni}', None) for _, _, dni in users]),
+        ('list', [('GET', f'/users?limit=50&cursor={dni}', None) for _, _, dni in users]),
+        ('update', [('PUT', f'/users/{dni}', body(u + 'x', l, dni)) for u, l, dni in users]),
+        ('bulk', [('POST', '/users/bulk', payload) for payload in bulk]),
+        ('delete', [('DELETE', f'/users/{dni}', None) for _, _, dni in users]),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000, help='peticiones por endpoint')
+    parser.add_argument('--clients', type=int, default=8, help='conexiones concurrentes')
+    parser.add_argument('--bulk-size', type=int, default=100, help='usuarios por petición bulk')
+    parser.add_argument('--journal', action='store_true', help='repositorio con journal')
+    parser.add_argument('--batch-creates', action='store_true', help='agrupa las altas concurrentes')
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        repository = FileUserRepository(os.path.join(tmp, 'users.json'), journal=args.journal)
+        server = make_server(UserController(repository, batch_creates=args.batch_creates), port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            for endpoint, requests in endpoint_requests(args.requests, args.bulk_size):
+                throughput, latencies = run_clients(server.server_address, requests, args.clients)
+                rows.append([endpoint, len(requests), f"{throughput:.0f}",
+                             f"{percentile(latencies, 0.50) * 1000:.2f}",
+                             f"{percentile(latencies, 0.99) * 1000:.2f}"])
+        finally:
+            server.shutdown()
+            server.server_close()
+            repository.close()
+    print_table(['endpoint', 'peticiones', 'req/s', 'p50 ms', 'p99 ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
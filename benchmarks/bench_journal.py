@@ -0,0 +1,51 @@
+"""
+Benchmark del modo journal de FileUserRepository.
+
+Mide el coste por escritura (save) con el store ya cargado con N usuarios,
+comparando el modo clásico (reescritura completa) con el modo journal.
+
+    python -m benchmarks.bench_journal --sizes 1000,100000,1000000
+"""
+import argparse
+import os
+import tempfile
+
+from adapters.repositories import FileUserRepository
+from entities import User
+from benchmarks.common import Timer, parse_sizes, print_table, synthetic_users, write_users_json
+
+
+def measure_writes(path: str, size: int, writes: int, journal: bool) -> float:
+    repository = FileUserRepository(path, journal=journal, compact_threshold=1 << 62)
+    new_users = [User(*data) for data in synthetic_users(writes, start=size)]
+    with Timer() as timer:
+        for user in new_users:
+            repository.save(user)
+    repository.close()
+    return timer.elapsed / writes * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=parse_sizes, default=parse_sizes('1000,10000,100000,1000000'))
+    parser.add_argument('--writes', type=int, default=1000, help='escrituras medidas en modo journal')
+    parser.add_argument('--classic-writes', type=int, default=20,
+                        help='escrituras medidas en modo clásico (0 para omitirlo)')
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = os.path.join(tmp, f'users_{size}.json')
+            write_users_json(path, size)
+            journal_us = measure_writes(path, size, args.writes, journal=True)
+            classic_us = '-'
+            if args.classic_writes:
+                write_users_json(path, size)
+                classic_us = f"{measure_writes(path, size, args.classic_writes, journal=False):.1f}"
+            rows.append([size, f"{journal_us:.1f}", classic_us])
+    print_table(['usuarios', 'journal µs/write', 'clásico µs/write'], rows)
+
+
+if __name__ == '__main__':
+    main()
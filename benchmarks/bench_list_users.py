@@ -0,0 +1,42 @@
+"""
+Benchmark de ListUsersUseCase: listado completo frente a la primera página.
+
+    python -m benchmarks.bench_list_users --sizes 1000000 --page-size 50
+"""
+import argparse
+import os
+import tempfile
+
+from adapters.repositories import FileUserRepository
+from use_cases import ListUsersUseCase
+from benchmarks.common import Timer, parse_sizes, print_table, write_users_json
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=parse_sizes, default=parse_sizes('1000,100000,1000000'))
+    parser.add_argument('--page-size', type=int, default=50)
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = os.path.join(tmp, f'users_{size}.json')
+            write_users_json(path, size)
+            list_users = ListUsersUseCase(FileUserRepository(path))
+            with Timer() as full:
+                list_users.execute()
+            # La primera página en frío incluye la construcción del índice de DNIs
+            with Timer() as cold:
+                page = list_users.execute(limit=args.page_size)
+            with Timer() as warm:
+                list_users.execute(limit=args.page_size, cursor=page.next_cursor)
+            with Timer() as filtered:
+                list_users.execute(limit=args.page_size, lastname_prefix='lastname1')
+            rows.append([size, f"{full.elapsed * 1e3:.1f}", f"{cold.elapsed * 1e3:.1f}",
+                         f"{warm.elapsed * 1e3:.3f}", f"{filtered.elapsed * 1e3:.3f}"])
+    print_table(['usuarios', 'completo ms', '1ª página (frío) ms', 'página ms', 'página filtrada ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark de ParallelUserImporter: escalado de la importación JSONL con el nº de procesos.
+
+Genera un JSONL de N usuarios e importa con UserImporter (secuencial) y con
+ParallelUserImporter para cada número de workers. El escritor es único, así
+que la aceleración se satura cuando save_many del repositorio pasa a ser el
+cuello de botella: antes con columnar, que normaliza los nombres para sus
+índices al escribir, que con file.
+
+    python -m benchmarks.bench_parallel_import --size 1000000 --workers 1,2,4,8
+"""
+import argparse
+import json
+import os
+import tempfile
+
+from adapters.bulk import ParallelUserImporter, UserImporter
+from adapters.repositories import ColumnarUserRepository, FileUserRepository
+from benchmarks.common import parse_sizes, print_table, synthetic_users
+
+
+def write_jsonl(path: str, size: int) -> None:
+    with open(path, 'w', encoding='utf-8') as file:
+        file.writelines(json.dumps({'username': username, 'lastname': lastname, 'dni': dni}) + '\n'
+                        for username, lastname, dni in synthetic_users(size))
+
+
+def make_repository(kind: str, directory: str, name: str):
+    if kind == 'file':
+        return FileUserRepository(os.path.join(directory, f'{name}.json'), journal=True, compact_threshold=1 << 62)
+    return ColumnarUserRepository()
+
+
+def run(importer_factory, kind: str, directory: str, name: str, path: str):
+    repository = make_repository(kind, directory, name)
+    try:
+        return importer_factory(repository).import_file(path)
+    finally:
+        close = getattr(repository, 'close', None)
+        if close is not None:
+            close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=200000)
+    parser.add_argument('--workers', type=parse_sizes, default=parse_sizes('1,2,4'))
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--repository', choices=['file', 'columnar'], default='file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'users.jsonl')
+        write_jsonl(path, args.size)
+        sequential = run(lambda repository: UserImporter(repository, chunk_size=args.chunk_size,
+                                                         batch_size=args.batch_size),
+                         args.repository, tmp, 'sequential', path)
+        rows = [['secuencial', f"{sequential.rows_per_sec:,.0f}", '1.00', f"{sequential.elapsed:.2f}"]]
+        for workers in args.workers:
+            report = run(lambda repository: ParallelUserImporter(repository, chunk_size=args.chunk_size,
+                                                                 batch_size=args.batch_size, workers=workers),
+                         args.repository, tmp, f'parallel-{workers}', path)
+            rows.append([f'{workers} workers', f"{report.rows_per_sec:,.0f}",
+                         f"{report.rows_per_sec / sequential.rows_per_sec:.2f}", f"{report.elapsed:.2f}"])
+    print(f"{args.size:,} filas, {os.cpu_count()} CPUs, repositorio {args.repository}")
+    print_table(['modo', 'filas/s', 'aceleración', 's'], rows)
+
+
+if __name__ == '__main__':
+    main()
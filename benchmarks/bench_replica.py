@@ -0,0 +1,82 @@
+"""
+Benchmark de ReplicaFileUserRepository: coste de seguir los cambios frente a reiniciar.
+
+Con N usuarios en un FileUserRepository con journal mide:
+  - la carga completa (lo que costaba ver los cambios reiniciando la réplica),
+  - la CPU de una recarga incremental según cuántos registros nuevos trae,
+  - la staleness: tiempo desde que el escritor guarda hasta que la réplica,
+    sondeando cada --poll-interval segundos, devuelve el usuario.
+
+    python -m benchmarks.bench_replica --size 1000000 --poll-interval 0.05
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from adapters.repositories import FileUserRepository, ReplicaFileUserRepository
+from entities import User
+from benchmarks.common import Timer, parse_sizes, print_table, synthetic_users
+
+
+def measure_reloads(writer, replica, size: int, batches) -> list:
+    rows = []
+    start = size
+    for batch in batches:
+        writer.save_many(User.from_trusted(*data) for data in synthetic_users(batch, start))
+        start += batch
+        with Timer() as timer:
+            replica.refresh()
+        stats = replica.stats
+        rows.append([f'delta {batch:,}', f"{timer.elapsed * 1000:.2f}", f"{stats.last_reload_cpu * 1000:.2f}"])
+    return rows
+
+
+def measure_staleness(path: str, size: int, poll_interval: float, writes: int) -> list:
+    replica = ReplicaFileUserRepository(path, poll_interval=poll_interval)
+    writer = FileUserRepository(path, journal=True, compact_threshold=1 << 62)
+    delays = []
+    try:
+        for index, (username, lastname, dni) in enumerate(synthetic_users(writes, size * 2)):
+            written = time.perf_counter()
+            writer.save(User.from_trusted(username, lastname, dni))
+            while replica.get(dni) is None:
+                time.sleep(0.0005)
+            delays.append(time.perf_counter() - written)
+            # Escrituras desfasadas respecto al sondeo
+            time.sleep(poll_interval * (index % 3) / 3)
+    finally:
+        writer.close()
+        replica.close()
+    return [statistics.median(delays) * 1000, max(delays) * 1000]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--batches', type=parse_sizes, default=parse_sizes('1,100,10000'))
+    parser.add_argument('--poll-interval', type=float, default=0.05)
+    parser.add_argument('--writes', type=int, default=40)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'users.json')
+        writer = FileUserRepository(path, journal=True, compact_threshold=1 << 62)
+        writer.save_many(User.from_trusted(*data) for data in synthetic_users(args.size))
+        writer.compact()
+        cpu_start = time.process_time()
+        with Timer() as load:
+            replica = ReplicaFileUserRepository(path, poll_interval=0)
+        rows = [['carga completa', f"{load.elapsed * 1000:.2f}", f"{(time.process_time() - cpu_start) * 1000:.2f}"]]
+        rows += measure_reloads(writer, replica, args.size, args.batches)
+        writer.close()
+        replica.close()
+        print_table(['recarga', 'ms', 'ms CPU'], rows)
+        median, worst = measure_staleness(path, args.size, args.poll_interval, args.writes)
+    print(f"\nStaleness con sondeo cada {args.poll_interval * 1000:.0f} ms: "
+          f"mediana {median:.1f} ms, máxima {worst:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
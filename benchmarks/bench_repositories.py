@@ -0,0 +1,55 @@
+"""
+Benchmark comparativo de repositorios: inserción, get y list.
+
+    python -m benchmarks.bench_repositories --size 100000 --gets 10000
+"""
+import argparse
+import os
+import random
+import tempfile
+
+from adapters.repositories import DatabaseUserRepository, FileUserRepository
+from entities import User
+from benchmarks.common import Timer, print_table, synthetic_users
+
+
+def repository_factories(tmp: str):
+    return {
+        'file (journal)': lambda: FileUserRepository(os.path.join(tmp, 'users.json'), journal=True,
+                                                     compact_threshold=1 << 62),
+        'sqlite (WAL)': lambda: DatabaseUserRepository(os.path.join(tmp, 'users.db')),
+    }
+
+
+def run(name: str, factory, size: int, gets: int, batch_size: int) -> list:
+    repository = factory()
+    users = [User(*data) for data in synthetic_users(size)]
+    with Timer() as insert:
+        for start in range(0, size, batch_size):
+            repository.save_many(users[start:start + batch_size])
+    dnis = random.Random(7).choices([user._dni for user in users], k=gets)
+    with Timer() as get:
+        for dni in dnis:
+            repository.get(dni)
+    with Timer() as listing:
+        repository.list()
+    repository.close()
+    return [name, f"{size / insert.elapsed:,.0f}", f"{gets / get.elapsed:,.0f}", f"{size / listing.elapsed:,.0f}"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--gets', type=int, default=10000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, factory in repository_factories(tmp).items():
+            rows.append(run(name, factory, args.size, args.gets, args.batch_size))
+    print_table(['repositorio', 'insert/s', 'get/s', 'list filas/s'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark de ShardedFileUserRepository: coste de persistencia por número de shards.
+
+Para N usuarios y cada número de shards mide la latencia media de una
+actualización (modo clásico: cada escritura reescribe su shard completo),
+los bytes escritos por actualización y el tiempo del primer get tras
+reabrir (solo se carga un shard).
+
+    python -m benchmarks.bench_sharding --sizes 100000,1000000 --shards 1,4,16,64
+"""
+import argparse
+import os
+import random
+import tempfile
+
+from adapters.repositories import ShardedFileUserRepository
+from entities import User
+from benchmarks.common import Timer, parse_sizes, print_table, synthetic_users
+
+
+def measure(directory: str, size: int, shards: int, updates: int) -> list:
+    repository = ShardedFileUserRepository(directory, shards=shards)
+    repository.save_many(User.from_trusted(*data) for data in synthetic_users(size))
+    dnis = random.Random(7).choices([dni for _, _, dni in synthetic_users(size)], k=updates)
+    written = sum(shard.bytes_written for shard in repository._layout.loaded_shards())
+    with Timer() as timer:
+        for dni in dnis:
+            repository.update(dni, 'Renamed', 'Lastname')
+    written = sum(shard.bytes_written for shard in repository._layout.loaded_shards()) - written
+    repository.close()
+    with Timer() as cold:
+        ShardedFileUserRepository(directory).get(dnis[0])
+    return [size, shards, f"{timer.elapsed / updates * 1000:.2f}", f"{written / updates / 1024:,.0f}",
+            f"{cold.elapsed * 1000:.1f}"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=parse_sizes, default=parse_sizes('100000'))
+    parser.add_argument('--shards', type=parse_sizes, default=parse_sizes('1,4,16,64'))
+    parser.add_argument('--updates', type=int, default=100)
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            for shards in args.shards:
+                rows.append(measure(os.path.join(tmp, f'{size}-{shards}'), size, shards, args.updates))
+    print_table(['usuarios', 'shards', 'ms/update', 'KB/update', 'primer get ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark del coste de importación (arranque) de los paquetes del proyecto.
+
+Cada objetivo se importa en un intérprete nuevo con `python -X importtime` y
+se suman las entradas de primer nivel que no aparecen al arrancar un
+intérprete vacío (site, encodings...): tiempo acumulado en ms y número de
+módulos cargados. Se toma el mínimo de varias ejecuciones tras un
+calentamiento que deja escritos los .pyc.
+
+    python -m benchmarks.bench_startup --runs 10
+    python -m benchmarks.bench_startup --targets main,adapters.repositories
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from benchmarks.common import print_table
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_TARGETS = ('main', 'entities', 'use_cases', 'adapters.repositories', 'adapters.controllers',
+                   'adapters.bulk', 'adapters.metrics')
+
+
+def _import_times(code: str) -> List[Tuple[int, int, str]]:
+    """(cumulativo µs, profundidad, módulo) de cada línea de -X importtime, en orden."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True, check=True)
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Dos espacios de sangría por nivel de anidamiento
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        entries.append((int(cumulative), depth, name.strip()))
+    return entries
+
+
+def measure(target: str, interpreter_modules: frozenset) -> Tuple[float, int]:
+    """(ms, módulos) que cuesta importar target en un intérprete recién arrancado."""
+    total_us = modules = block = 0
+    for cumulative, depth, name in _import_times(f'import {target}'):
+        # Los hijos se imprimen antes que su padre: cada línea de nivel 0 cierra un bloque
+        block += 1
+        if depth == 0:
+            if name not in interpreter_modules:
+                total_us += cumulative
+                modules += block
+            block = 0
+    return total_us / 1000, modules
+
+
+def interpreter_baseline() -> frozenset:
+    return frozenset(name for _, depth, name in _import_times('pass') if depth == 0)
+
+
+def run(targets, runs: int = 5) -> Dict[str, dict]:
+    """{objetivo: {'ms': mínimo de runs, 'modules': n}} tras una ejecución de calentamiento."""
+    baseline = interpreter_baseline()
+    results = {}
+    for target in targets:
+        measure(target, baseline)
+        samples = [measure(target, baseline) for _ in range(runs)]
+        results[target] = {'ms': round(min(ms for ms, _ in samples), 2),
+                           'modules': min(modules for _, modules in samples)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--targets', default=','.join(DEFAULT_TARGETS), help='módulos separados por comas')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    results = run([target for target in args.targets.split(',') if target], args.runs)
+    print_table(['módulo', 'import ms', 'módulos cargados'],
+                [[target, f"{result['ms']:.1f}", result['modules']] for target, result in results.items()])
+
+
+if __name__ == '__main__':
+    main()
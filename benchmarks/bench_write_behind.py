@@ -0,0 +1,58 @@
+"""
+Benchmark del modo write-behind de FileUserRepository.
+
+Ejecuta W altas seguidas con CreateUserUseCase sobre un store de N usuarios
+y compara el modo clásico (un snapshot por escritura) con el modo
+write-behind (volcado cada intervalo o cada flush_after mutaciones).
+Muestra escrituras/s y cuántos snapshots llegan al disco.
+
+    python -m benchmarks.bench_write_behind --sizes 1000,100000 --writes 5000
+"""
+import argparse
+import os
+import tempfile
+
+from adapters.repositories import FileUserRepository
+from use_cases import CreateUserUseCase
+from benchmarks.common import Timer, parse_sizes, print_table, synthetic_users, write_users_json
+
+
+def measure(path: str, size: int, writes: int, **options) -> tuple:
+    repository = FileUserRepository(path, **options)
+    use_case = CreateUserUseCase(repository)
+    generation = repository.generation
+    with Timer() as timer:
+        for data in synthetic_users(writes, start=size):
+            use_case.execute(*data)
+        # El último volcado forma parte del coste: los datos tienen que acabar en disco
+        repository.close()
+    return writes / timer.elapsed, repository.generation - generation
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=parse_sizes, default=parse_sizes('1000,10000,100000'))
+    parser.add_argument('--writes', type=int, default=5000, help='altas en modo write-behind')
+    parser.add_argument('--classic-writes', type=int, default=50,
+                        help='altas en modo clásico (0 para omitirlo)')
+    parser.add_argument('--flush-interval', type=float, default=0.5)
+    parser.add_argument('--flush-after', type=int, default=1000)
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = os.path.join(tmp, f'users_{size}.json')
+            if args.classic_writes:
+                write_users_json(path, size)
+                throughput, snapshots = measure(path, size, args.classic_writes)
+                rows.append([size, 'clásico', args.classic_writes, f"{throughput:.0f}", snapshots])
+            write_users_json(path, size)
+            throughput, snapshots = measure(path, size, args.writes, write_behind=True,
+                                            flush_interval=args.flush_interval, flush_after=args.flush_after)
+            rows.append([size, 'write-behind', args.writes, f"{throughput:.0f}", snapshots])
+    print_table(['usuarios', 'modo', 'altas', 'altas/s', 'snapshots'], rows)
+
+
+if __name__ == '__main__':
+    main()
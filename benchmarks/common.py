@@ -0,0 +1,53 @@
+import json
+import os
+import time
+from typing import Iterator, List
+
+DNI_LETTERS = 'TRWAGMYFPDXBNJZSQVHLCKE'
+
+
+def synthetic_dni(number: int) -> str:
+    # DNI válido a partir de un número (la letra se calcula con el módulo 23)
+    number %= 100_000_000
+    return f"{number:08d}{DNI_LETTERS[number % 23]}"
+
+
+def synthetic_users(count: int, start: int = 0) -> Iterator[tuple]:
+    for i in range(start, start + count):
+        yield (f"User{i}", f"Lastname{i}", synthetic_dni(i))
+
+
+def write_users_json(path: str, count: int) -> None:
+    # Genera directamente un users.json con el formato del FileUserRepository
+    users = {dni: {'username': u, 'lastname': l, 'dni': dni} for u, l, dni in synthetic_users(count)}
+    with open(path, 'w') as file:
+        json.dump(users, file, ensure_ascii=False)
+
+
+def parse_sizes(value: str) -> List[int]:
+    return [int(v.replace('_', '')) for v in value.split(',') if v]
+
+
+def print_table(headers: List[str], rows: List[list]) -> None:
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print('  '.join(str(h).rjust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print('  '.join(str(c).rjust(w) for c, w in zip(row, widths)))
+
+
+class Timer:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+        return False
+
+
+def remove_quietly(*paths: str) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,214 @@
+"""
+Suite de benchmarks: todos los casos de uso contra todos los repositorios.
+
+Para cada repositorio y tamaño (usuarios con DNI sintéticos válidos) ejecuta
+--ops operaciones de CreateUser, FindUser, ListUsers (páginas de 100 por
+cursor), UpdateUser y DeleteUser, y mide operaciones/s y latencias p50/p95/p99.
+Cada combinación repositorio/tamaño corre en un subproceso propio para medir
+su pico de memoria (RSS) sin que se mezcle con las demás. El resultado se
+guarda en JSON; scripts/dev.py bench lo compara con una línea base.
+
+    python -m benchmarks.suite --sizes 1000,100000,1000000 --output results.json
+    python -m benchmarks.suite --repositories file,sqlite --sizes 1000 --ops 200
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+from itertools import islice
+from typing import Callable, Dict, List
+
+from adapters.repositories import (BinaryUserRepository, CachingUserRepository, ColumnarUserRepository,
+                                   DatabaseUserRepository, FileUserRepository, ShardedFileUserRepository)
+from adapters.repositories.binary_snapshot import write_binary_snapshot
+from entities import User
+from use_cases import (CreateUserUseCase, DeleteUserUseCase, FindUserUseCase, ListUsersUseCase,
+                       UpdateUserUseCase)
+from benchmarks.common import Timer, parse_sizes, print_table, synthetic_users, write_users_json
+
+SUITE_VERSION = 1
+USE_CASES = ('create', 'find', 'list', 'update', 'delete')
+PAGE_SIZE = 100
+# Sin compactar durante la medición: se mide el coste de cada operación, no el de la compactación
+NO_COMPACTION = 1 << 62
+
+
+def _file(path: str, size: int, **options) -> FileUserRepository:
+    write_users_json(path + '.json', size)
+    return FileUserRepository(path + '.json', journal=True, compact_threshold=NO_COMPACTION, **options)
+
+
+def _binary(path: str, size: int) -> BinaryUserRepository:
+    write_binary_snapshot(path + '.bin', synthetic_users(size))
+    return BinaryUserRepository(path + '.bin', compact_threshold=NO_COMPACTION)
+
+
+def _load_in_batches(repository, size: int):
+    users = synthetic_users(size)
+    while True:
+        batch = [User.from_trusted(*data) for data in islice(users, 10000)]
+        if not batch:
+            return repository
+        repository.save_many(batch)
+
+
+def _sqlite(path: str, size: int) -> DatabaseUserRepository:
+    return _load_in_batches(DatabaseUserRepository(path + '.db'), size)
+
+
+def _sharded(path: str, size: int) -> ShardedFileUserRepository:
+    return _load_in_batches(ShardedFileUserRepository(path + '_shards', journal=True,
+                                                      compact_threshold=NO_COMPACTION), size)
+
+
+def _columnar(path: str, size: int) -> ColumnarUserRepository:
+    return ColumnarUserRepository(User.from_trusted(*data) for data in synthetic_users(size))
+
+
+# Repositorios de la suite: nombre -> fábrica(ruta base sin extensión, nº de usuarios iniciales)
+REPOSITORIES: Dict[str, Callable] = {
+    'file': _file,
+    'file-write-behind': lambda path, size: _file(path, size, write_behind=True),
+    'binary': _binary,
+    'sqlite': _sqlite,
+    'sharded': _sharded,
+    'columnar': _columnar,
+    'caching': lambda path, size: CachingUserRepository(_file(path, size)),
+}
+
+
+def percentile(latencies: List[float], fraction: float) -> float:
+    ordered = sorted(latencies)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def peak_memory_mb() -> float:
+    """Pico de RSS del proceso actual en MB (VmHWM en Linux; ru_maxrss en el resto)."""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS lo da en bytes y Linux en KB
+    return maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def _measure(operation: Callable, arguments: list) -> dict:
+    latencies = []
+    with Timer() as total:
+        for argument in arguments:
+            with Timer() as timer:
+                operation(*argument)
+            latencies.append(timer.elapsed)
+    return {'ops': len(arguments), 'ops_per_sec': len(arguments) / total.elapsed,
+            'p50_us': percentile(latencies, 0.50) * 1e6, 'p95_us': percentile(latencies, 0.95) * 1e6,
+            'p99_us': percentile(latencies, 0.99) * 1e6}
+
+
+def run_case(repository_name: str, size: int, ops: int, seed: int = 7) -> List[dict]:
+    """Ejecuta todos los casos de uso sobre un repositorio de `size` usuarios (en este proceso)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        repository = REPOSITORIES[repository_name](os.path.join(tmp, 'users'), size)
+        generator = random.Random(seed)
+        existing = [dni for _, _, dni in synthetic_users(size)]
+        picked = [(dni,) for dni in generator.choices(existing, k=ops)] if existing else []
+        new_users = list(synthetic_users(ops, start=size))
+        cursors = [(existing[generator.randrange(len(existing))] if existing else None,) for _ in range(ops)]
+        list_users = ListUsersUseCase(repository)
+        update_user = UpdateUserUseCase(repository)
+        measurements = {
+            'create': _measure(CreateUserUseCase(repository).execute, new_users),
+            'find': _measure(FindUserUseCase(repository).execute, picked),
+            'list': _measure(lambda cursor: list_users.execute(limit=PAGE_SIZE, cursor=cursor), cursors),
+            'update': _measure(lambda dni: update_user.execute(dni, 'Renamed', 'Lastname'), picked),
+            'delete': _measure(DeleteUserUseCase(repository).execute, [(dni,) for _, _, dni in new_users]),
+        }
+        close = getattr(repository, 'close', None)
+        if close is not None:
+            close()
+    memory = peak_memory_mb()
+    return [dict(repository=repository_name, size=size, use_case=use_case, peak_memory_mb=memory,
+                 **measurements[use_case]) for use_case in USE_CASES]
+
+
+def run_suite(repositories: List[str], sizes: List[int], ops: int) -> dict:
+    """Lanza cada combinación en un subproceso y reúne los resultados."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = []
+    for size in sizes:
+        for name in repositories:
+            output = subprocess.run([sys.executable, '-m', 'benchmarks.suite', '--case', name, str(size),
+                                     '--ops', str(ops)], cwd=root, check=True, capture_output=True, text=True)
+            results.extend(json.loads(output.stdout))
+    return {'version': SUITE_VERSION, 'python': platform.python_version(), 'platform': platform.platform(),
+            'ops': ops, 'results': results}
+
+
+def result_key(result: dict) -> tuple:
+    return result['repository'], result['size'], result['use_case']
+
+
+def compare_results(baseline: dict, current: dict, tolerance: float = 0.25) -> List[str]:
+    """Regresiones de current respecto a baseline: ops/s más bajas o memoria más alta que la tolerancia."""
+    previous = {result_key(result): result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        reference = previous.get(result_key(result))
+        if reference is None:
+            continue
+        label = '{}/{}/{}'.format(*result_key(result))
+        if result['ops_per_sec'] < reference['ops_per_sec'] * (1 - tolerance):
+            regressions.append(f"{label}: {result['ops_per_sec']:,.0f} ops/s "
+                               f"(línea base {reference['ops_per_sec']:,.0f})")
+        if result['peak_memory_mb'] > reference['peak_memory_mb'] * (1 + tolerance):
+            regressions.append(f"{label}: {result['peak_memory_mb']:.1f} MB de pico "
+                               f"(línea base {reference['peak_memory_mb']:.1f} MB)")
+    return regressions
+
+
+def print_results(suite: dict) -> None:
+    print_table(['repositorio', 'usuarios', 'caso de uso', 'ops/s', 'p50 µs', 'p95 µs', 'p99 µs', 'pico MB'],
+                [[r['repository'], r['size'], r['use_case'], f"{r['ops_per_sec']:,.0f}", f"{r['p50_us']:.1f}",
+                  f"{r['p95_us']:.1f}", f"{r['p99_us']:.1f}", f"{r['peak_memory_mb']:.1f}"]
+                 for r in suite['results']])
+
+
+def parse_repositories(value: str) -> List[str]:
+    names = [name for name in value.split(',') if name]
+    unknown = [name for name in names if name not in REPOSITORIES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"repositorios desconocidos: {', '.join(unknown)} "
+                                         f"(disponibles: {', '.join(REPOSITORIES)})")
+    return names
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=parse_sizes, default=parse_sizes('1000,100000,1000000'))
+    parser.add_argument('--repositories', type=parse_repositories, default=list(REPOSITORIES))
+    parser.add_argument('--ops', type=int, default=1000, help='operaciones por caso de uso')
+    parser.add_argument('--output', help='archivo JSON donde guardar los resultados')
+    parser.add_argument('--case', nargs=2, metavar=('REPOSITORIO', 'USUARIOS'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.case:
+        # Modo subproceso: una sola combinación, resultados en JSON por stdout
+        print(json.dumps(run_case(args.case[0], int(args.case[1]), args.ops)))
+        return
+    suite = run_suite(args.repositories, args.sizes, args.ops)
+    print_results(suite)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(suite, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
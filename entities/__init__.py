@@ -1,4 +1,7 @@
 # Entities module
 from .users import User
+from .dni import (DNI_LETTERS, DNI_REASONS, DniBatchResult, generate_valid_dnis, is_valid_dni, validate_dni_batch,
+                  validate_dnis)
 
-__all__ = ['User']
\ No newline at end of file
+__all__ = ['User', 'DNI_LETTERS', 'DNI_REASONS', 'DniBatchResult', 'generate_valid_dnis', 'is_valid_dni',
+           'validate_dni_batch', 'validate_dnis']
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+from itertools import cycle
+
+# typing solo para los comprobadores de tipos: importarlo cuesta más que el resto de entities
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, Iterable, List, Optional, Sequence
+
+# NumPy (validación vectorizada opcional) se importa al primer lote que lo usa, no al importar
+# entities: cuesta más que el resto del paquete y la mayoría de procesos no lo necesitan
+numpy = None
+_numpy_checked = False
+
+# Letra de control del DNI indexada por el resto de dividir el número entre 23
+DNI_LETTERS = 'TRWAGMYFPDXBNJZSQVHLCKE'
+# Tabla resto -> letras aceptadas (mayúscula y minúscula)
+_ACCEPTED_LETTERS = tuple((letter, letter.lower()) for letter in DNI_LETTERS)
+
+# Códigos de motivo de validate_dni_batch (el 0 es un DNI válido)
+DNI_VALID = 0
+DNI_NOT_STRING = 1
+DNI_BAD_LENGTH = 2
+DNI_BAD_NUMBER = 3
+DNI_BAD_LETTER = 4
+DNI_REASONS = ('valid', 'not_string', 'bad_length', 'bad_number', 'bad_letter')
+
+
+def load_numpy():
+    """Importa NumPy la primera vez que se necesita; None si no está instalado."""
+    global numpy, _numpy_checked, _LETTER_CODES, _POWERS_OF_TEN
+    if not _numpy_checked:
+        try:
+            import numpy as module
+        except ImportError:
+            module = None
+        if module is not None:
+            # Código del carácter de la letra mayúscula esperada para cada resto (la minúscula es +32)
+            _LETTER_CODES = module.frombuffer(DNI_LETTERS.encode('ascii'), dtype=module.uint8).astype(module.uint32)
+            _POWERS_OF_TEN = 10 ** module.arange(7, -1, -1, dtype=module.int64)
+        numpy, _numpy_checked = module, True
+    return numpy
+
+
+def is_valid_dni(dni: str) -> bool:
+    # 8 dígitos ASCII + letra de control (isdigit() solo aceptaría también '²' y similares)
+    if type(dni) is not str or len(dni) != 9:
+        return False
+    number = dni[:8]
+    if not (number.isascii() and number.isdigit()):
+        return False
+    return dni[8] in _ACCEPTED_LETTERS[int(number) % 23]
+
+
+def validate_dnis(dnis: Iterable[str]) -> List[bool]:
+    """Valida un lote de DNIs de una vez y devuelve una máscara de validez."""
+    accepted = _ACCEPTED_LETTERS
+    result = []
+    append = result.append
+    for dni in dnis:
+        if type(dni) is str and len(dni) == 9:
+            number = dni[:8]
+            append(number.isascii() and number.isdigit() and dni[8] in accepted[int(number) % 23])
+        else:
+            append(False)
+    return result
+
+
+class DniBatchResult:
+    # Clase simple y no dataclass: dataclasses arrastra inspect, re y ast al importar entities
+    __slots__ = ('mask', 'reasons')
+
+    def __init__(self, mask: Sequence[bool], reasons: Sequence[int]):
+        # Con NumPy mask y reasons son arrays (bool y uint8); sin él, list y array('B')
+        self.mask = mask
+        self.reasons = reasons
+
+    def __repr__(self) -> str:
+        return f"DniBatchResult(mask={self.mask!r}, reasons={self.reasons!r})"
+
+    def __eq__(self, other):
+        if type(other) is not DniBatchResult:
+            return NotImplemented
+        return (self.mask, self.reasons) == (other.mask, other.reasons)
+
+    @property
+    def valid_count(self) -> int:
+        return sum(self.mask) if isinstance(self.mask, list) else int(self.mask.sum())
+
+    def reason_counts(self) -> Dict[str, int]:
+        """Número de DNIs por motivo ('valid', 'bad_letter', ...), solo los que aparecen."""
+        if numpy is not None and isinstance(self.reasons, numpy.ndarray):
+            counts = numpy.bincount(self.reasons, minlength=len(DNI_REASONS)).tolist()
+        else:
+            counts = [0] * len(DNI_REASONS)
+            for reason in self.reasons:
+                counts[reason] += 1
+        return {DNI_REASONS[code]: count for code, count in enumerate(counts) if count}
+
+
+def validate_dni_batch(dnis, use_numpy: Optional[bool] = None) -> DniBatchResult:
+    """Valida un lote de DNIs (secuencia o array de NumPy) con máscara y motivo de cada uno.
+
+    Con NumPy (use_numpy None lo usa si está instalado) la comprobación es
+    aritmética vectorizada sobre la matriz de caracteres; sin él, un bucle
+    sin llamadas por elemento.
+    """
+    if use_numpy is None:
+        use_numpy = load_numpy() is not None
+    elif use_numpy and load_numpy() is None:
+        raise ValueError("La validación vectorizada requiere NumPy")
+    return _validate_numpy(dnis) if use_numpy else _validate_python(dnis)
+
+
+def _validate_python(dnis: Iterable) -> DniBatchResult:
+    # array carga collections.abc: se importa al validar el primer lote, no con entities
+    from array import array
+    accepted = _ACCEPTED_LETTERS
+    mask: List[bool] = []
+    reasons = array('B')
+    add_valid, add_reason = mask.append, reasons.append
+    for dni in dnis:
+        if type(dni) is not str:
+            reason = DNI_NOT_STRING
+        elif len(dni) != 9:
+            reason = DNI_BAD_LENGTH
+        else:
+            number = dni[:8]
+            if not (number.isascii() and number.isdigit()):
+                reason = DNI_BAD_NUMBER
+            elif dni[8] in accepted[int(number) % 23]:
+                reason = DNI_VALID
+            else:
+                reason = DNI_BAD_LETTER
+        add_valid(reason == DNI_VALID)
+        add_reason(reason)
+    return DniBatchResult(mask, reasons)
+
+
+def _validate_numpy(dnis) -> DniBatchResult:
+    is_string = None
+    if isinstance(dnis, numpy.ndarray) and dnis.dtype.kind in 'US':
+        values = dnis.ravel()
+    else:
+        items = dnis if isinstance(dnis, (list, tuple)) else list(dnis)
+        is_string = numpy.fromiter((type(dni) is str for dni in items), dtype=bool, count=len(items))
+        values = numpy.array([dni if type(dni) is str else '' for dni in items], dtype='U10')
+    unit = numpy.uint32 if values.dtype.kind == 'U' else numpy.uint8
+    width = values.dtype.itemsize // numpy.dtype(unit).itemsize
+    if width < 9:
+        values, width = values.astype(f'{values.dtype.kind}9'), 9
+    elif not values.dtype.isnative:
+        values = values.astype(values.dtype.newbyteorder('='))
+    # Matriz (n, ancho) de códigos de carácter sin copiar; los huecos finales son 0
+    codes = values.view(unit).reshape(len(values), width)
+    length_ok = codes[:, 8] != 0
+    if codes.shape[1] > 9:
+        length_ok &= codes[:, 9] == 0
+    # Número y comprobación de dígitos columna a columna: cada paso es una operación sobre todo el lote
+    number = numpy.zeros(len(codes), dtype=numpy.uint32)
+    number_ok = numpy.ones(len(codes), dtype=bool)
+    for column in range(8):
+        # En aritmética sin signo los caracteres por debajo de '0' dan valores enormes
+        digit = codes[:, column] - unit(ord('0'))
+        number_ok &= digit < 10
+        number *= 10
+        number += digit
+    expected = _LETTER_CODES[number % 23]
+    letter = codes[:, 8]
+    letter_ok = (letter == expected) | (letter == expected + 32)
+    # Se asignan de menor a mayor prioridad: prevalece el primer fallo de la validación
+    reasons = numpy.zeros(len(codes), dtype=numpy.uint8)
+    reasons[~letter_ok] = DNI_BAD_LETTER
+    reasons[~number_ok] = DNI_BAD_NUMBER
+    reasons[~length_ok] = DNI_BAD_LENGTH
+    if is_string is not None:
+        reasons[~is_string] = DNI_NOT_STRING
+    return DniBatchResult(reasons == DNI_VALID, reasons)
+
+
+def generate_valid_dnis(count: int, start: int = 0, seed: Optional[int] = None, as_array: bool = False):
+    """Genera count DNIs válidos y distintos para pruebas de carga.
+
+    Sin seed son consecutivos desde start; con seed, números aleatorios sin
+    repetición. as_array devuelve un array 'U9' de NumPy construido sin bucle
+    en Python (listo para validate_dni_batch).
+    """
+    if not 0 <= count <= 100_000_000:
+        raise ValueError("Solo hay 100.000.000 números de DNI distintos")
+    if as_array:
+        if load_numpy() is None:
+            raise ValueError("as_array requiere NumPy")
+        return _generate_numpy(count, start, seed)
+    if seed is not None:
+        # Solo aquí: random no hace falta para importar entities
+        import random
+        return [f"{number:08d}{DNI_LETTERS[number % 23]}"
+                for number in random.Random(seed).sample(range(100_000_000), count)]
+    # Consecutivos: la letra avanza una posición por número, así que basta con rotar la tabla
+    if start + count > 100_000_000:
+        raise ValueError("El rango de DNIs supera 99999999")
+    letters = cycle(DNI_LETTERS[start % 23:] + DNI_LETTERS[:start % 23])
+    return [f"{number:08d}{letter}" for number, letter in zip(range(start, start + count), letters)]
+
+
+def _generate_numpy(count: int, start: int, seed: Optional[int]):
+    if seed is not None:
+        numbers = numpy.random.default_rng(seed).choice(100_000_000, size=count, replace=False)
+    else:
+        if start + count > 100_000_000:
+            raise ValueError("El rango de DNIs supera 99999999")
+        numbers = numpy.arange(start, start + count, dtype=numpy.int64)
+    codes = numpy.empty((count, 9), dtype=numpy.uint32)
+    codes[:, :8] = numbers[:, None] // _POWERS_OF_TEN % 10 + ord('0')
+    codes[:, 8] = _LETTER_CODES[numbers % 23]
+    return codes.view('U9').ravel()
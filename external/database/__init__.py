@@ -1 +1,4 @@
-# Database module
\ No newline at end of file
+# Database module
+from .sqlite_connection_pool import SQLiteConnectionPool
+
+__all__ = ['SQLiteConnectionPool']
@@ -0,0 +1,77 @@
+import itertools
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List
+
+_memory_ids = itertools.count()
+
+
+class SQLiteConnectionPool:
+    """Pool de conexiones sqlite3 seguro entre hilos.
+
+    Cada conexión se abre en modo autocommit (las transacciones se abren
+    explícitamente), con WAL y una caché de sentencias preparadas: sqlite3
+    reutiliza el statement compilado siempre que se ejecute el mismo texto SQL.
+    """
+
+    def __init__(self, database: str, size: int = 4, timeout: float = 30.0, cached_statements: int = 256):
+        if size <= 0:
+            raise ValueError("El tamaño del pool debe ser mayor que cero.")
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        if database == ':memory:':
+            # Una base en memoria compartida para que todas las conexiones vean los mismos datos
+            self.database = f'file:users_memory_{next(_memory_ids)}?mode=memory&cache=shared'
+            self._uri = True
+        else:
+            self.database = database
+            self._uri = database.startswith('file:')
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=size)
+        self._all: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        for _ in range(size):
+            self._pool.put(self._connect())
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.database, timeout=self.timeout, isolation_level=None,
+                                     check_same_thread=False, cached_statements=self.cached_statements,
+                                     uri=self._uri)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute('PRAGMA foreign_keys=ON')
+        with self._lock:
+            self._all.append(connection)
+        return connection
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        try:
+            connection = self._pool.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError("No hay conexiones libres en el pool de SQLite")
+        try:
+            yield connection
+        finally:
+            if connection.in_transaction:
+                connection.rollback()
+            self._pool.put(connection)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        # BEGIN IMMEDIATE toma el bloqueo de escritura al empezar y evita deadlocks entre escritores
+        with self.connection() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield connection
+            except BaseException:
+                connection.rollback()
+                raise
+            connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._all:
+                connection.close()
+            self._all.clear()
@@ -1,4 +1,3 @@
-from adapters.repositories import FileUserRepository
 from use_cases import (
     CreateUserUseCase,
     ListUsersUseCase,
@@ -7,11 +6,21 @@ from use_cases import (
     FindUserUseCase
 )
 
-def main():
+def demo(metrics=None):
+    # Backend y métricas se importan al ejecutar: importar main no carga el repositorio de archivos
+    from adapters.repositories import FileUserRepository
+    from adapters.metrics import InstrumentedUserRepository, instrument_use_case
+
     # Creamos un repositorio real
     repository = FileUserRepository('users.json')
+    if metrics is not None:
+        repository = InstrumentedUserRepository(repository, metrics)
+    # Con métricas, cada caso de uso registra llamadas, latencias y errores por tipo
+    def instrument(use_case):
+        return use_case if metrics is None else instrument_use_case(use_case, metrics)
+
     # Creamos el caso de uso con el repositorio real
-    create_user = CreateUserUseCase(repository)
+    create_user = instrument(CreateUserUseCase(repository))
 
     # Creamos una lista de usuarios para crear con dnis válidos
     users_to_create = [
@@ -29,7 +38,7 @@ def main():
         print(f"Error al crear usuario: {e}")
 
     # Buscar usuario
-    find_user = FindUserUseCase(repository)
+    find_user = instrument(FindUserUseCase(repository))
     try:
         user = find_user.execute('76826889N')
         print(f"Usuario encontrado: {user}")
@@ -37,7 +46,7 @@ def main():
         print(f"Error al encontrar usuario: {e}")
 
     # Listar usuarios
-    list_users = ListUsersUseCase(repository)
+    list_users = instrument(ListUsersUseCase(repository))
     try:
         users = list_users.execute()
         print("Usuarios registrados:")
@@ -47,7 +56,7 @@ def main():
         print(f"Error al listar usuarios: {e}")
 
     # Actualizar usuario
-    update_user = UpdateUserUseCase(repository)
+    update_user = instrument(UpdateUserUseCase(repository))
     try:
         user = update_user.execute('76826889N', 'Agustin', 'Estevez D.')
         print(f"Usuario actualizado: {user}")
@@ -55,12 +64,80 @@ def main():
         print(f"Error al actualizar usuario: {e}")
 
     # Eliminar usuario
-    delete_user = DeleteUserUseCase(repository)
+    delete_user = instrument(DeleteUserUseCase(repository))
     try:
         delete_user.execute('76826889N')
         print("Usuario eliminado.")
     except Exception as e:
         print(f"Error al eliminar usuario: {e}")
 
+    if metrics is not None:
+        print(metrics.export_prometheus(), end='')
+
+def serve(args):
+    # Servidor, feed de cambios y réplica se importan aquí: la demo y --help no pagan su coste de arranque
+    from adapters.controllers import UserController, serve as serve_http
+    from adapters.metrics import MetricsRegistry
+    from adapters.repositories import ChangeFeed, JsonlChangeSink, create_repository
+
+    def controller_factory():
+        metrics = MetricsRegistry() if args.metrics else None
+        if args.replica:
+            # Solo lectura: sigue los archivos que escribe otro proceso y aplica sus cambios
+            repository = create_repository('replica', args.users_file, poll_interval=args.poll_interval)
+            if metrics is not None:
+                metrics.register_callback('users_replica_staleness_seconds',
+                                          'Antigüedad del último cambio del escritor al hacerse visible.',
+                                          lambda: [({}, repository.stats.last_staleness)], metric_type='gauge')
+                metrics.register_callback('users_replica_reload_cpu_seconds_total',
+                                          'CPU dedicada a recargar los cambios del escritor.',
+                                          lambda: [({}, repository.stats.reload_cpu)])
+        else:
+            # Cada worker abre su propio repositorio; con varios workers comparten el archivo con flock
+            repository = create_repository('file', args.users_file, journal=args.journal,
+                                           process_safe=args.workers > 1)
+        change_feed = None
+        if args.changes_log:
+            sink = JsonlChangeSink(args.changes_log)
+            # La numeración continúa donde la dejó el archivo
+            change_feed = ChangeFeed(sinks=[sink], start_seq=sink.last_seq())
+        return UserController(repository, batch_creates=args.batch_creates, metrics=metrics, change_feed=change_feed)
+
+    print(f"🚀 Sirviendo en http://{args.host}:{args.port} con {args.workers} worker(s)")
+    serve_http(controller_factory, args.host, args.port, workers=args.workers)
+
+def main():
+    # Solo al ejecutar como programa: importar main (p. ej. desde los tests) no carga argparse
+    import argparse
+    parser = argparse.ArgumentParser(description="Users Service")
+    subcommands = parser.add_subparsers(dest='command')
+    demo_parser = subcommands.add_parser('demo', help='ejecuta la demo de los casos de uso (por defecto)')
+    demo_parser.add_argument('--metrics', action='store_true', help='mostrar las métricas al terminar')
+    serve_parser = subcommands.add_parser('serve', help='sirve la API HTTP/JSON')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8000)
+    serve_parser.add_argument('--workers', type=int, default=1, help='procesos pre-fork')
+    serve_parser.add_argument('--users-file', default='users.json')
+    serve_parser.add_argument('--journal', action='store_true', help='usar el modo journal del repositorio')
+    serve_parser.add_argument('--batch-creates', action='store_true',
+                              help='agrupar las altas concurrentes en un único persist')
+    serve_parser.add_argument('--metrics', action='store_true', help='instrumentar y exponer GET /metrics')
+    serve_parser.add_argument('--changes-log', help='archivo JSONL de cambios; expone GET /changes?since=N')
+    serve_parser.add_argument('--replica', action='store_true',
+                              help='réplica de solo lectura que sigue los cambios de users.json y su journal')
+    serve_parser.add_argument('--poll-interval', type=float, default=0.5,
+                              help='segundos entre comprobaciones de la réplica')
+    args = parser.parse_args()
+    if args.command == 'serve' and args.changes_log and args.workers > 1:
+        # Cada proceso tendría su propia secuencia de cambios
+        parser.error("--changes-log requiere un único worker")
+    if args.command == 'serve':
+        serve(args)
+    elif getattr(args, 'metrics', False):
+        from adapters.metrics import MetricsRegistry
+        demo(MetricsRegistry())
+    else:
+        demo()
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+bulk_users.py - Importación y exportación masiva de usuarios
+
+Uso (desde la raíz del proyecto):
+    python -m scripts.bulk_users import usuarios.csv --users-file users.json --journal
+    python -m scripts.bulk_users import usuarios.jsonl --workers 0 --chunk-size 20000
+    python -m scripts.bulk_users export usuarios.jsonl --users-file users.json
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from adapters.bulk import ParallelUserImporter, UserExporter, UserImporter
+from adapters.repositories import FileUserRepository
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['import', 'export'])
+    parser.add_argument('path', help='archivo CSV o JSONL')
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help='se deduce de la extensión si se omite')
+    parser.add_argument('--users-file', default='users.json')
+    parser.add_argument('--journal', action='store_true', help='usar el modo journal del repositorio')
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=1,
+                        help='procesos de validación al importar (0 = uno por núcleo, 1 = sin procesos)')
+    args = parser.parse_args()
+
+    repository = FileUserRepository(args.users_file, journal=args.journal)
+    try:
+        if args.command == 'import':
+            if args.workers == 1:
+                importer = UserImporter(repository, chunk_size=args.chunk_size, batch_size=args.batch_size)
+            else:
+                importer = ParallelUserImporter(repository, chunk_size=args.chunk_size, batch_size=args.batch_size,
+                                                workers=args.workers or None)
+            report = importer.import_file(args.path, args.format)
+        else:
+            report = UserExporter(repository, chunk_size=args.chunk_size).export_file(args.path, args.format)
+    finally:
+        repository.close()
+
+    print(f"📦 {args.command}: {report}")
+    for sample in report.error_samples:
+        print(f"   ❌ {sample}")
+    sys.exit(1 if report.errors else 0)
+
+
+if __name__ == '__main__':
+    main()
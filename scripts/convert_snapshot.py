@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+convert_snapshot.py - Convierte users.json al snapshot binario (mmap)
+
+Uso (desde la raíz del proyecto):
+    python -m scripts.convert_snapshot users.json users.bin
+    python -m scripts.convert_snapshot users.json users.bin --verify
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from adapters.repositories.binary_snapshot import BinarySnapshot, convert_json_to_binary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('source', help='snapshot JSON de FileUserRepository')
+    parser.add_argument('target', help='archivo binario de salida')
+    parser.add_argument('--verify', action='store_true', help='comprobar el checksum del archivo generado')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    written = convert_json_to_binary(args.source, args.target)
+    snapshot = BinarySnapshot(args.target)
+    print(f"📦 {len(snapshot)} usuarios, {written} bytes en {time.perf_counter() - start:.2f}s")
+    if args.verify and not snapshot.verify():
+        print("   ❌ checksum incorrecto")
+        sys.exit(1)
+    snapshot.close()
+
+
+if __name__ == '__main__':
+    main()
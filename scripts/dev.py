@@ -5,13 +5,26 @@ dev_pv.py - Script de desarrollo para Python Version Project
 Este script ejecuta validaciones completas del proyecto Python Version,
 incluyendo tests unitarios y validación de archivos del proyecto.
 Diseñado para funcionar desde la raíz del proyecto python_version.
+
+    python scripts/dev.py                       # validaciones y tests
+    python scripts/dev.py bench                 # suite de benchmarks contra la línea base
+    python scripts/dev.py bench --update-baseline
+    python scripts/dev.py startup               # coste de importación contra el presupuesto
+    python scripts/dev.py startup --update-budget
 """
 
+import argparse
+import json
 import subprocess
 import sys
 import os
+import tempfile
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = PROJECT_ROOT / "benchmarks" / "baseline.json"
+DEFAULT_STARTUP_BUDGET = PROJECT_ROOT / "benchmarks" / "startup_budget.json"
+
 def print_banner():
     """Imprime banner del proyecto"""
     print("=" * 70)
@@ -201,8 +214,117 @@ def check_git_status():
     except subprocess.CalledProcessError:
         print("⚠️  No es un repositorio Git o Git no está disponible")
 
+def run_benchmarks(args):
+    """Ejecuta la suite de benchmarks y la compara con la línea base guardada"""
+    print("\n⏱️  Ejecutando suite de benchmarks...")
+    print("-" * 50)
+
+    sys.path.insert(0, str(PROJECT_ROOT))
+    from benchmarks.suite import compare_results, print_results
+
+    baseline_path = Path(args.baseline)
+    if args.results:
+        current = json.loads(Path(args.results).read_text())
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / "results.json"
+            command = [sys.executable, "-m", "benchmarks.suite", "--sizes", args.sizes, "--ops", str(args.ops),
+                       "--output", str(output)]
+            if args.repositories:
+                command += ["--repositories", args.repositories]
+            result = subprocess.run(command, cwd=PROJECT_ROOT, capture_output=True, text=True)
+            if result.returncode != 0:
+                print(f"❌ La suite de benchmarks falló:\n{result.stderr.strip()}")
+                return 1
+            current = json.loads(output.read_text())
+        print_results(current)
+
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(current, indent=2))
+        print(f"\n💾 Línea base guardada en {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        # Sin línea base no hay con qué comparar: no se da por buena la ejecución
+        print(f"\n❌ No existe la línea base {baseline_path}; genérala con --update-baseline")
+        return 1
+
+    regressions = compare_results(json.loads(baseline_path.read_text()), current, args.tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regresiones respecto a {baseline_path} "
+              f"(tolerancia {args.tolerance:.0%}):")
+        for regression in regressions:
+            print(f"   - {regression}")
+        return 1
+    print(f"\n✅ Sin regresiones respecto a {baseline_path} (tolerancia {args.tolerance:.0%})")
+    return 0
+
+def run_startup_check(args):
+    """Mide el coste de importar cada módulo y lo compara con el presupuesto guardado"""
+    print("\n🚀 Midiendo el coste de importación...")
+    print("-" * 50)
+
+    sys.path.insert(0, str(PROJECT_ROOT))
+    from benchmarks.bench_startup import DEFAULT_TARGETS, run
+
+    budget_path = Path(args.budget)
+    budget = json.loads(budget_path.read_text()) if budget_path.exists() else {}
+    current = run(list(budget) or DEFAULT_TARGETS, args.runs)
+
+    if args.update_budget or not budget:
+        # Margen para el ruido entre máquinas (relativo, con un mínimo de 5 ms para los imports
+        # casi gratuitos): el tiempo varía mucho más que el número de módulos, que apenas tiene holgura
+        budget = {target: {"max_ms": round(max(result["ms"] * (1 + args.headroom), result["ms"] + 5), 1),
+                           "max_modules": result["modules"] + max(2, result["modules"] // 20)}
+                  for target, result in current.items()}
+        budget_path.write_text(json.dumps(budget, indent=2) + "\n")
+        print(f"💾 Presupuesto guardado en {budget_path}")
+        return 0
+
+    over = []
+    for target, result in current.items():
+        limits = budget[target]
+        ok = result["ms"] <= limits["max_ms"] and result["modules"] <= limits["max_modules"]
+        print(f"{'✅' if ok else '❌'} {target}: {result['ms']:.1f} ms (máx. {limits['max_ms']}), "
+              f"{result['modules']} módulos (máx. {limits['max_modules']})")
+        if not ok:
+            over.append(target)
+    if over:
+        print(f"\n❌ Fuera de presupuesto: {', '.join(over)}")
+        return 1
+    print(f"\n✅ Importaciones dentro del presupuesto de {budget_path}")
+    return 0
+
+def parse_args():
+    """Analiza la línea de comandos: sin subcomando se ejecutan las validaciones"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command")
+    bench = subparsers.add_parser("bench", help="benchmarks comparados con una línea base")
+    bench.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="JSON con la línea base")
+    bench.add_argument("--results", help="comparar un JSON ya generado en lugar de ejecutar la suite")
+    bench.add_argument("--sizes", default="1000,100000,1000000")
+    bench.add_argument("--repositories", help="lista separada por comas (por defecto, todos)")
+    bench.add_argument("--ops", type=int, default=1000)
+    bench.add_argument("--tolerance", type=float, default=0.25,
+                       help="fracción de empeoramiento admitida antes de fallar")
+    bench.add_argument("--update-baseline", action="store_true", help="guardar los resultados como línea base")
+    startup = subparsers.add_parser("startup", help="coste de importación comparado con un presupuesto")
+    startup.add_argument("--budget", default=str(DEFAULT_STARTUP_BUDGET), help="JSON con el presupuesto")
+    startup.add_argument("--runs", type=int, default=5, help="ejecuciones por módulo (se toma el mínimo)")
+    startup.add_argument("--headroom", type=float, default=0.5,
+                         help="margen de tiempo sobre lo medido al guardar el presupuesto")
+    startup.add_argument("--update-budget", action="store_true", help="guardar lo medido como presupuesto")
+    return parser.parse_args()
+
 def main():
     """Función principal del modo desarrollo"""
+    args = parse_args()
+    if args.command == "bench":
+        print_banner()
+        sys.exit(run_benchmarks(args))
+    if args.command == "startup":
+        print_banner()
+        sys.exit(run_startup_check(args))
+
     print_banner()
     
     # Validar estructura
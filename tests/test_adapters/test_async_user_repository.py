@@ -0,0 +1,125 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from adapters.repositories import AsyncFileUserRepository, AsyncUserRepositoryAdapter, FileUserRepository
+from entities import User
+
+
+def _dni(number: int) -> str:
+    return f"{number:08d}{'TRWAGMYFPDXBNJZSQVHLCKE'[number % 23]}"
+
+
+class TestAsyncFileUserRepository(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, 'users.json')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_concurrent_saves_are_coalesced(self):
+        async def scenario():
+            repository = AsyncFileUserRepository(self.file_path)
+            generation = repository.repository.generation
+            users = [User(f"User{i}", "Async", _dni(i)) for i in range(50)]
+            saved = await asyncio.gather(*(repository.save(user) for user in users))
+            persists = repository.repository.generation - generation
+            await repository.close()
+            return saved, persists
+
+        saved, persists = asyncio.run(scenario())
+        self.assertEqual([u._dni for u in saved], [_dni(i) for i in range(50)])
+        # Las 50 escrituras llegan juntas: se confirman en un único snapshot
+        self.assertEqual(persists, 1)
+        self.assertEqual(len(FileUserRepository(self.file_path).list()), 50)
+
+    def test_operations_in_same_batch_keep_their_order(self):
+        async def scenario():
+            repository = AsyncFileUserRepository(self.file_path, journal=True)
+            results = await asyncio.gather(
+                repository.update(_dni(1), "Nadie", "Nada"),
+                repository.save(User("Ana", "García", _dni(1))),
+                repository.update(_dni(1), "Ana María", "García"),
+                repository.save(User("Luis", "Martín", _dni(2))),
+                repository.delete(_dni(2)),
+            )
+            found = await repository.get(_dni(1)), await repository.get(_dni(2))
+            await repository.close()
+            return results, found
+
+        results, (first, second) = asyncio.run(scenario())
+        self.assertIsNone(results[0])
+        self.assertEqual(results[2]._username, "Ana María")
+        self.assertEqual(first._username, "Ana María")
+        self.assertIsNone(second)
+
+    def test_delete_many_is_ordered_with_queued_writes(self):
+        async def scenario():
+            repository = AsyncFileUserRepository(self.file_path, journal=True)
+            await repository.save(User("Ana", "García", _dni(1)))
+            results = await asyncio.gather(
+                repository.save(User("Luis", "Martín", _dni(2))),
+                repository.delete_many([_dni(1), _dni(2), _dni(3), _dni(1)]),
+                repository.save(User("Ana", "García", _dni(1))),
+            )
+            found = await repository.get_many([_dni(1), _dni(2)])
+            await repository.close()
+            return results, found
+
+        results, found = asyncio.run(scenario())
+        self.assertEqual(results[1], 2)
+        self.assertEqual(list(found), [_dni(1)])
+
+    def test_invalid_update_only_fails_its_request(self):
+        async def scenario():
+            repository = AsyncFileUserRepository(self.file_path)
+            await repository.save(User("Ana", "García", _dni(1)))
+            results = await asyncio.gather(repository.update(_dni(1), "", "García"),
+                                           repository.save(User("Luis", "Martín", _dni(2))),
+                                           return_exceptions=True)
+            page = await repository.list(limit=10)
+            await repository.close()
+            return results, page
+
+        results, page = asyncio.run(scenario())
+        self.assertIsInstance(results[0], ValueError)
+        self.assertEqual([u._dni for u in page], [_dni(1), _dni(2)])
+
+    def test_process_safe_reads_run_off_the_event_loop(self):
+        async def scenario():
+            repository = AsyncFileUserRepository(self.file_path, process_safe=True)
+            await repository.save(User("Ana", "García", _dni(1)))
+            threads = []
+            get, get_many = repository.repository.get, repository.repository.get_many
+            repository.repository.get = lambda dni: threads.append(threading.current_thread()) or get(dni)
+            repository.repository.get_many = lambda dnis: threads.append(threading.current_thread()) or get_many(dnis)
+            found = await repository.get(_dni(1)), await repository.get_many([_dni(1)])
+            await repository.close()
+            return threads, found
+
+        threads, (user, users) = asyncio.run(scenario())
+        self.assertEqual(user._dni, _dni(1))
+        self.assertEqual(list(users), [_dni(1)])
+        self.assertNotIn(threading.main_thread(), threads)
+        self.assertEqual(len(threads), 2)
+
+
+class TestAsyncUserRepositoryAdapter(unittest.TestCase):
+    def test_delegates_to_sync_repository(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            async def scenario():
+                repository = AsyncUserRepositoryAdapter(FileUserRepository(os.path.join(temp_dir, 'users.json')))
+                await repository.save_many([User("Ana", "García", _dni(1)), User("Luis", "Martín", _dni(2))])
+                found = await repository.search(lastname_prefix="mar")
+                deleted = await repository.delete_many([_dni(1), _dni(3)])
+                await repository.close()
+                return found, deleted
+
+            found, deleted = asyncio.run(scenario())
+        self.assertEqual([u._dni for u in found], [_dni(2)])
+        self.assertEqual(deleted, 1)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,72 @@
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from adapters.repositories import BACKENDS, ColumnarUserRepository, create_repository, get_backend, register_backend
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+def loaded_modules(code: str) -> set:
+    # Intérprete nuevo: en el de los tests ya está todo importado
+    result = subprocess.run([sys.executable, '-c', f'{code}\nimport sys\nprint("\\n".join(sys.modules))'],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+
+class TestBackends(unittest.TestCase):
+    def test_get_backend_imports_registered_class(self):
+        self.assertIs(get_backend('columnar'), ColumnarUserRepository)
+
+    def test_unknown_backend_lists_available(self):
+        with self.assertRaises(ValueError) as context:
+            get_backend('redis')
+        self.assertIn('columnar', str(context.exception))
+
+    def test_register_and_create_custom_backend(self):
+        register_backend('memoria', 'adapters.repositories.columnar_user_repository:ColumnarUserRepository')
+        self.addCleanup(BACKENDS.pop, 'memoria')
+        self.assertIsInstance(create_repository('memoria'), ColumnarUserRepository)
+
+    def test_register_rejects_target_without_class(self):
+        with self.assertRaises(ValueError):
+            register_backend('roto', 'adapters.repositories.columnar_user_repository')
+
+    def test_unknown_attribute_raises_attribute_error(self):
+        import adapters.repositories
+        with self.assertRaises(AttributeError):
+            adapters.repositories.NoExiste
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_packages_do_not_import_unused_backends(self):
+        modules = loaded_modules('import adapters.repositories, adapters.controllers, adapters.bulk')
+        for heavy in ('sqlite3', 'asyncio', 'http.server', 'concurrent.futures',
+                      'adapters.repositories.file_user_repository'):
+            self.assertNotIn(heavy, modules)
+
+    def test_selected_backend_imports_only_its_module(self):
+        modules = loaded_modules("from adapters.repositories import get_backend\nget_backend('file')")
+        self.assertIn('adapters.repositories.file_user_repository', modules)
+        self.assertNotIn('sqlite3', modules)
+
+    def test_controller_does_not_import_replica(self):
+        modules = loaded_modules('import adapters.controllers.user_controller')
+        self.assertNotIn('adapters.repositories.replica_file_user_repository', modules)
+
+    def test_entities_and_main_import_only_what_they_need(self):
+        modules = loaded_modules('import entities')
+        for heavy in ('dataclasses', 'inspect', 'random', 'typing'):
+            self.assertNotIn(heavy, modules)
+        modules = loaded_modules('import main')
+        for heavy in ('argparse', 'dataclasses', 'adapters.metrics', 'adapters.repositories.file_user_repository'):
+            self.assertNotIn(heavy, modules)
+
+    def test_optional_dependencies_are_not_imported_eagerly(self):
+        modules = loaded_modules('import main')
+        for optional in ('numpy', 'orjson', 'msgspec', 'http.server'):
+            self.assertNotIn(optional, modules)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import threading
+import unittest
+from adapters.repositories import BinaryUserRepository, FileUserRepository
+from adapters.repositories.binary_snapshot import BinarySnapshot, convert_json_to_binary, write_binary_snapshot
+from adapters.repositories.user_snapshot import CorruptSnapshotError
+from entities import User
+
+ROWS = [("Luis", "Martín", "87654321X"), ("Ana", "García", "12345678Z"), ("José", "Núñez", "00000000T")]
+
+
+class TestBinarySnapshot(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'users.bin')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_records_are_sorted_and_found_by_dni(self):
+        write_binary_snapshot(self.path, ROWS)
+        snapshot = BinarySnapshot(self.path)
+        self.assertEqual(len(snapshot), 3)
+        self.assertEqual([row[2] for row in snapshot.iter_rows()], ["00000000T", "12345678Z", "87654321X"])
+        self.assertEqual(snapshot.find("12345678Z"), ("Ana", "García", "12345678Z"))
+        self.assertIsNone(snapshot.find("12345678A"))
+        self.assertTrue(snapshot.verify())
+        snapshot.close()
+
+    def test_bad_magic_is_rejected(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'{"no": "binario"}' * 4)
+        with self.assertRaises(CorruptSnapshotError):
+            BinarySnapshot(self.path)
+
+    def test_convert_from_json(self):
+        json_path = os.path.join(self.temp_dir.name, 'users.json')
+        repository = FileUserRepository(json_path)
+        repository.save_many(User(*row) for row in ROWS)
+        convert_json_to_binary(json_path, self.path)
+        binary = BinaryUserRepository(self.path)
+        self.assertEqual(binary.get("00000000T")._lastname, "Núñez")
+        self.assertEqual(len(binary), 3)
+        binary.close()
+
+
+class TestBinaryUserRepository(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'users.bin')
+        write_binary_snapshot(self.path, ROWS)
+        self.repository = BinaryUserRepository(self.path)
+
+    def tearDown(self):
+        self.repository.close()
+        self.temp_dir.cleanup()
+
+    def test_changes_overlay_the_snapshot_and_survive_restart(self):
+        self.repository.save(User("Eva", "Pérez", "11111111H"))
+        self.repository.update("12345678Z", "Ana María", "García")
+        self.repository.delete("87654321X")
+        self.repository.close()
+        self.repository = BinaryUserRepository(self.path)
+        self.assertEqual(self.repository.get("12345678Z")._username, "Ana María")
+        self.assertIsNone(self.repository.get("87654321X"))
+        self.assertEqual([u._dni for u in self.repository.list()], ["00000000T", "11111111H", "12345678Z"])
+        self.assertEqual(len(self.repository), 3)
+
+    def test_list_pages_with_cursor(self):
+        self.repository.save(User("Eva", "Pérez", "11111111H"))
+        first = self.repository.list(limit=2)
+        second = self.repository.list(cursor=first.next_cursor, limit=2)
+        self.assertEqual([u._dni for u in first], ["00000000T", "11111111H"])
+        self.assertEqual([u._dni for u in second], ["12345678Z", "87654321X"])
+        self.assertIsNone(second.next_cursor)
+        self.assertEqual([u._dni for u in self.repository.list(lastname_prefix="garcia")], ["12345678Z"])
+
+    def test_compact_rewrites_the_snapshot(self):
+        self.repository.save(User("Eva", "Pérez", "11111111H"))
+        self.repository.delete("00000000T")
+        self.repository.compact()
+        self.assertEqual(self.repository.journal.size, 0)
+        self.assertEqual(len(BinarySnapshot(self.path)), 3)
+        self.assertEqual([u._dni for u in self.repository.list(offset=1, limit=5)], ["12345678Z", "87654321X"])
+
+    def test_reads_during_compaction_see_every_user(self):
+        dnis = [row[2] for row in ROWS]
+        failures = []
+        stop = threading.Event()
+
+        def reader():
+            while not stop.is_set():
+                try:
+                    if any(self.repository.get(dni) is None for dni in dnis):
+                        failures.append('missing')
+                except Exception as e:
+                    failures.append(repr(e))
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        for number in range(30):
+            self.repository.update(dnis[number % len(dnis)], f"Nombre{number}", "Apellido")
+            self.repository.compact()
+        stop.set()
+        thread.join()
+        self.assertEqual(failures, [])
+
+    def test_iter_users_streams_and_survives_compaction(self):
+        self.repository.save(User("Eva", "Pérez", "11111111H"))
+        users = self.repository.iter_users()
+        self.assertNotIsInstance(users, list)
+        first = next(users)
+        # Lo escrito y compactado a mitad del recorrido no altera la vista ya fijada
+        self.repository.delete("87654321X")
+        self.repository.save(User("Luis", "Martín", "99999999R"))
+        self.repository.compact()
+        self.assertEqual([first._dni] + [user._dni for user in users],
+                         ["00000000T", "11111111H", "12345678Z", "87654321X"])
+        self.assertEqual([user._dni for user in self.repository.iter_users()],
+                         ["00000000T", "11111111H", "12345678Z", "99999999R"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,164 @@
+import os
+import tempfile
+import unittest
+from adapters.repositories import BloomFilter, BloomGuardedUserRepository, ColumnarUserRepository, FileUserRepository
+from entities import User, generate_valid_dnis
+
+
+class CountingRepository(ColumnarUserRepository):
+    def __init__(self):
+        super().__init__()
+        self.lookups = 0
+
+    def get(self, dni):
+        self.lookups += 1
+        return super().get(dni)
+
+    def get_many(self, dnis):
+        dnis = list(dnis)
+        self.lookups += len(dnis)
+        return super().get_many(dnis)
+
+
+class TestBloomFilter(unittest.TestCase):
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        dnis = generate_valid_dnis(20000)
+        bloom = BloomFilter(capacity=10000, error_rate=0.01)
+        bloom.update(dnis[:10000])
+        self.assertTrue(all(dni in bloom for dni in dnis[:10000]))
+        false_positives = sum(dni in bloom for dni in dnis[10000:])
+        self.assertLess(false_positives / 10000, 0.02)
+        self.assertLess(bloom.estimated_false_positive_rate(), 0.02)
+        # ~9,6 bits por elemento para un 1 %
+        self.assertLess(bloom.memory_bytes, 10000 * 10 // 8 + 1)
+
+    def test_save_and_load(self):
+        bloom = BloomFilter(capacity=100)
+        bloom.add("12345678Z")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'users.bloom')
+            bloom.save(path)
+            loaded = BloomFilter.load(path)
+            self.assertIn("12345678Z", loaded)
+            self.assertEqual((loaded.bit_count, loaded.hash_count, loaded.count), (bloom.bit_count, bloom.hash_count, 1))
+            with open(path, 'r+b') as file:
+                file.seek(-1, os.SEEK_END)
+                file.write(b'\xff')
+            self.assertIsNone(BloomFilter.load(path))
+            self.assertIsNone(BloomFilter.load(os.path.join(tmp, 'missing.bloom')))
+
+
+class TestBloomGuardedUserRepository(unittest.TestCase):
+    def setUp(self):
+        self.inner = CountingRepository()
+        self.inner.save(User("Ana", "García", "12345678Z"))
+        self.repository = BloomGuardedUserRepository(self.inner)
+
+    def test_negative_lookups_skip_backend(self):
+        self.assertIsNone(self.repository.get("87654321X"))
+        self.assertFalse(self.repository.exists("87654321X"))
+        self.assertIsNone(self.repository.update("87654321X", "Luis", "Martín"))
+        self.repository.delete("87654321X")
+        self.assertEqual(self.repository.get_many(["87654321X"]), {})
+        self.assertEqual(self.inner.lookups, 0)
+        self.assertEqual(self.repository.stats.skipped, 5)
+
+    def test_positive_lookups_reach_backend(self):
+        self.assertEqual(self.repository.get("12345678Z")._username, "Ana")
+        self.assertTrue(self.repository.exists("12345678Z"))
+        self.repository.save(User("Luis", "Martín", "87654321X"))
+        self.assertEqual(set(self.repository.get_many(["12345678Z", "87654321X", "11111111H"])),
+                         {"12345678Z", "87654321X"})
+        self.assertEqual(self.repository.delete_many(["87654321X", "11111111H"]), 1)
+        self.assertIsNone(self.inner.get("87654321X"))
+
+    def test_grows_when_over_capacity(self):
+        dnis = generate_valid_dnis(3000)
+        self.repository.save_many(User("Ana", "García", dni) for dni in dnis)
+        self.assertGreaterEqual(self.repository.bloom.capacity, 3000)
+        self.assertTrue(all(self.repository.exists(dni) for dni in dnis))
+        self.assertEqual(self.repository.stats.rebuilds, 2)
+
+    def test_persisted_filter_is_discarded_after_unsaved_writes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'users.bloom')
+            self.repository = BloomGuardedUserRepository(self.inner, path=path)
+            self.repository.close()
+            self.assertTrue(os.path.exists(path))
+            reopened = BloomGuardedUserRepository(self.inner, path=path)
+            self.assertEqual(reopened.stats.rebuilds, 0)
+            # Alta sin cerrar (caída): el archivo ya no puede usarse
+            reopened.save(User("Luis", "Martín", "87654321X"))
+            self.assertFalse(os.path.exists(path))
+            recovered = BloomGuardedUserRepository(self.inner, path=path)
+            self.assertEqual(recovered.stats.rebuilds, 1)
+            self.assertTrue(recovered.exists("87654321X"))
+
+
+class TestBloomGuardedFileRepository(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.file_path = os.path.join(self.tmp.name, 'users.json')
+        self.bloom_path = os.path.join(self.tmp.name, 'users.bloom')
+
+    def test_direct_writes_to_wrapped_repository_are_not_false_negatives(self):
+        inner = FileUserRepository(self.file_path, journal=True)
+        repository = BloomGuardedUserRepository(inner)
+        self.assertFalse(repository.exists("12345678Z"))
+        # Escritura que no pasa por el decorador: cambia la versión de los datos
+        inner.save(User("Ana", "García", "12345678Z"))
+        self.assertEqual(repository.get("12345678Z")._username, "Ana")
+        self.assertEqual(repository.stats.rebuilds, 2)
+        repository.close()
+
+    def test_writes_from_other_process_are_seen(self):
+        repository = BloomGuardedUserRepository(FileUserRepository(self.file_path, journal=True, process_safe=True))
+        self.assertFalse(repository.exists("12345678Z"))
+        other = FileUserRepository(self.file_path, journal=True, process_safe=True)
+        other.save(User("Ana", "García", "12345678Z"))
+        other.close()
+        self.assertTrue(repository.exists("12345678Z"))
+        repository.close()
+
+    def test_other_process_writes_loaded_during_own_write_reach_the_filter(self):
+        # refresh_interval largo: solo la escritura propia (flock exclusivo) recarga lo ajeno
+        inner = FileUserRepository(self.file_path, journal=True, process_safe=True, refresh_interval=3600)
+        inner.refresh()
+        repository = BloomGuardedUserRepository(inner)
+        other = FileUserRepository(self.file_path, journal=True, process_safe=True)
+        other.save(User("Ana", "García", "12345678Z"))
+        other.close()
+        repository.save(User("Luis", "Martín", "87654321X"))
+        self.assertEqual(inner.reloads, 1)
+        self.assertEqual(repository.get("12345678Z")._username, "Ana")
+        self.assertTrue(repository.exists("87654321X"))
+        repository.close()
+
+    def test_persisted_filter_is_rebuilt_if_data_changed_after_close(self):
+        BloomGuardedUserRepository(FileUserRepository(self.file_path, journal=True), path=self.bloom_path).close()
+        reopened = BloomGuardedUserRepository(FileUserRepository(self.file_path, journal=True), path=self.bloom_path)
+        self.assertEqual(reopened.stats.rebuilds, 0)
+        reopened.close()
+        inner = FileUserRepository(self.file_path, journal=True)
+        inner.save(User("Ana", "García", "12345678Z"))
+        inner.close()
+        recovered = BloomGuardedUserRepository(FileUserRepository(self.file_path, journal=True), path=self.bloom_path)
+        self.assertEqual(recovered.stats.rebuilds, 1)
+        self.assertTrue(recovered.exists("12345678Z"))
+        recovered.close()
+
+    def test_write_behind_pending_writes_change_version(self):
+        inner = FileUserRepository(self.file_path, journal=True, write_behind=True, flush_interval=0)
+        repository = BloomGuardedUserRepository(inner, path=self.bloom_path)
+        inner.save(User("Ana", "García", "12345678Z"))
+        self.assertTrue(repository.exists("12345678Z"))
+        repository.close()
+        reopened = BloomGuardedUserRepository(FileUserRepository(self.file_path, journal=True), path=self.bloom_path)
+        self.assertEqual(reopened.stats.rebuilds, 0)
+        self.assertTrue(reopened.exists("12345678Z"))
+        reopened.close()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
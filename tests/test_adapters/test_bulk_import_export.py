@@ -0,0 +1,81 @@
+import io
+import os
+import tempfile
+import unittest
+from adapters.bulk import ParallelUserImporter, UserExporter, UserImporter
+from adapters.repositories import FileUserRepository
+
+CSV_INPUT = """username,lastname,dni
+Ana,García,12345678Z
+Luis,Martín,87654321A
+John,Doe,76826889N
+"""
+
+JSONL_INPUT = """{"username": "Ana", "lastname": "García", "dni": "12345678Z"}
+
+{"username": "", "lastname": "Martín", "dni": "87654321X"}
+"""
+
+
+class TestBulkImportExport(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repository = FileUserRepository(os.path.join(self.temp_dir.name, 'users.json'), journal=True)
+
+    def tearDown(self):
+        self.repository.close()
+        self.temp_dir.cleanup()
+
+    def test_import_csv_reports_invalid_rows(self):
+        report = UserImporter(self.repository, chunk_size=2, batch_size=1).import_stream(io.StringIO(CSV_INPUT), 'csv')
+        self.assertEqual((report.rows, report.written, report.errors), (3, 2, 1))
+        self.assertTrue(report.error_samples[0].startswith("fila 2:"))
+        self.assertIsNotNone(self.repository.get("76826889N"))
+        self.assertGreater(report.rows_per_sec, 0)
+
+    def test_import_jsonl_skips_blank_lines(self):
+        report = UserImporter(self.repository).import_stream(io.StringIO(JSONL_INPUT), 'jsonl')
+        self.assertEqual((report.rows, report.written, report.errors), (2, 1, 1))
+
+    def test_import_jsonl_reports_unreadable_lines_and_continues(self):
+        data = JSONL_INPUT + '{roto\n["no", "es", "objeto"]\n{"username": "Luis", "lastname": "Martín", "dni": "87654321X"}\n'
+        report = UserImporter(self.repository, chunk_size=2).import_stream(io.StringIO(data), 'jsonl')
+        self.assertEqual((report.rows, report.written, report.errors), (5, 2, 3))
+        self.assertIn("Línea 4 no es JSON válido", report.error_samples[1])
+        self.assertIn("Línea 5 no es un objeto JSON", report.error_samples[2])
+        self.assertIsNotNone(self.repository.get("87654321X"))
+
+    def test_export_roundtrip(self):
+        UserImporter(self.repository).import_stream(io.StringIO(CSV_INPUT), 'csv')
+        path = os.path.join(self.temp_dir.name, 'export.jsonl')
+        report = UserExporter(self.repository, chunk_size=1).export_file(path)
+        self.assertEqual(report.rows, 2)
+        other = FileUserRepository(os.path.join(self.temp_dir.name, 'other.json'))
+        UserImporter(other).import_file(path)
+        self.assertEqual(other.get("12345678Z")._lastname, "García")
+
+    def test_parallel_import_matches_sequential(self):
+        for fmt, data in (('csv', CSV_INPUT), ('jsonl', JSONL_INPUT)):
+            with self.subTest(fmt=fmt):
+                expected = FileUserRepository(os.path.join(self.temp_dir.name, f'sequential-{fmt}.json'))
+                sequential = UserImporter(expected, chunk_size=2, batch_size=1).import_stream(io.StringIO(data), fmt)
+                other = FileUserRepository(os.path.join(self.temp_dir.name, f'parallel-{fmt}.json'))
+                parallel = ParallelUserImporter(other, chunk_size=2, batch_size=1,
+                                                workers=2).import_stream(io.StringIO(data), fmt)
+                self.assertEqual((parallel.rows, parallel.written, parallel.errors),
+                                 (sequential.rows, sequential.written, sequential.errors))
+                self.assertEqual(parallel.error_samples, sequential.error_samples)
+                self.assertEqual(sorted(user._dni for user in other.list()),
+                                 sorted(user._dni for user in expected.list()))
+
+    def test_parallel_import_reports_invalid_json_line(self):
+        data = JSONL_INPUT + '{roto\n{"username": "Luis", "lastname": "Martín", "dni": "87654321X"}\n'
+        report = ParallelUserImporter(self.repository, chunk_size=1, workers=2).import_stream(
+            io.StringIO(data), 'jsonl')
+        self.assertEqual((report.rows, report.written, report.errors), (4, 2, 2))
+        self.assertIn("Línea 4 no es JSON válido", report.error_samples[1])
+        self.assertIsNotNone(self.repository.get("87654321X"))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,78 @@
+import unittest
+from adapters.repositories import CachingUserRepository, ColumnarUserRepository
+from entities import User
+
+
+class CountingRepository(ColumnarUserRepository):
+    def __init__(self):
+        super().__init__()
+        self.gets = 0
+
+    def get(self, dni):
+        self.gets += 1
+        return super().get(dni)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCachingUserRepository(unittest.TestCase):
+    def setUp(self):
+        self.inner = CountingRepository()
+        self.clock = FakeClock()
+        self.repository = CachingUserRepository(self.inner, max_size=2, ttl=10, negative_ttl=1, clock=self.clock)
+        self.inner.save(User("Ana", "García", "12345678Z"))
+
+    def test_hits_and_misses(self):
+        self.assertEqual(self.repository.get("12345678Z")._username, "Ana")
+        self.assertEqual(self.repository.get("12345678Z")._username, "Ana")
+        self.assertEqual(self.inner.gets, 1)
+        stats = self.repository.stats
+        self.assertEqual((stats.hits, stats.misses), (1, 1))
+
+    def test_negative_cache_and_ttl(self):
+        self.assertIsNone(self.repository.get("87654321X"))
+        self.assertIsNone(self.repository.get("87654321X"))
+        self.assertEqual(self.inner.gets, 1)
+        self.assertEqual(self.repository.stats.negative_hits, 1)
+        self.clock.now = 1.5
+        self.assertIsNone(self.repository.get("87654321X"))
+        self.assertEqual(self.inner.gets, 2)
+        self.assertEqual(self.repository.stats.expirations, 1)
+
+    def test_invalidation_on_mutations(self):
+        self.assertIsNone(self.repository.get("87654321X"))
+        self.repository.save(User("Luis", "Martín", "87654321X"))
+        self.assertEqual(self.repository.get("87654321X")._username, "Luis")
+        self.repository.update("87654321X", "Luis", "Pérez")
+        self.assertEqual(self.repository.get("87654321X")._lastname, "Pérez")
+        self.repository.delete("87654321X")
+        self.assertIsNone(self.repository.get("87654321X"))
+
+    def test_lru_eviction(self):
+        self.repository.get("12345678Z")
+        self.repository.get("87654321X")
+        self.repository.get("12345678Z")
+        self.repository.get("76826889N")
+        self.assertEqual(self.repository.stats.evictions, 1)
+        gets = self.inner.gets
+        # 12345678Z se usó más recientemente que 87654321X y sigue en caché
+        self.repository.get("12345678Z")
+        self.assertEqual(self.inner.gets, gets)
+        self.repository.get("87654321X")
+        self.assertEqual(self.inner.gets, gets + 1)
+
+    def test_get_many_uses_cache(self):
+        self.repository.get("12345678Z")
+        found = self.repository.get_many(["12345678Z", "87654321X"])
+        self.assertEqual(list(found), ["12345678Z"])
+        self.assertIsNone(self.repository.get("87654321X"))
+        self.assertEqual(self.repository.stats.negative_hits, 1)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,115 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from adapters.controllers import UserController
+from adapters.repositories import (ChangeFeed, ChangeFeedGapError, ChangeFeedUserRepository, ColumnarUserRepository,
+                                   FileUserRepository, JsonlChangeSink, read_jsonl_changes)
+from entities import User
+
+
+class TestChangeFeed(unittest.TestCase):
+    def test_sequence_and_changes_since(self):
+        feed = ChangeFeed(capacity=10)
+        feed.publish([('put', '12345678Z', 'Ana', 'García'), ('delete', '87654321X', None, None)])
+        self.assertEqual(feed.last_seq, 2)
+        self.assertEqual([(e.seq, e.op, e.dni) for e in feed.changes_since(0)],
+                         [(1, 'put', '12345678Z'), (2, 'delete', '87654321X')])
+        self.assertEqual([e.seq for e in feed.changes_since(1)], [2])
+        self.assertEqual(feed.changes_since(2), [])
+        self.assertEqual([e.seq for e in feed.changes_since(0, limit=1)], [1])
+
+    def test_ring_buffer_reports_gaps(self):
+        feed = ChangeFeed(capacity=3)
+        feed.publish(('put', f'{n:08d}T', 'U', 'L') for n in range(5))
+        self.assertEqual(feed.first_seq, 3)
+        self.assertEqual([e.seq for e in feed.changes_since(2)], [3, 4, 5])
+        with self.assertRaises(ChangeFeedGapError):
+            feed.changes_since(1)
+
+    def test_wait_wakes_up_on_publish(self):
+        feed = ChangeFeed()
+        self.assertFalse(feed.wait(0, timeout=0.01))
+        timer = threading.Timer(0.01, feed.publish, args=([('delete', '12345678Z', None, None)],))
+        timer.start()
+        self.assertTrue(feed.wait(0, timeout=5))
+        timer.join()
+
+    def test_jsonl_sink_and_resume(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'changes.jsonl')
+            sink = JsonlChangeSink(path)
+            feed = ChangeFeed(sinks=[sink])
+            feed.publish([('put', '12345678Z', 'Ana', 'García'), ('delete', '12345678Z', None, None)])
+            feed.close()
+            with open(path, 'ab') as file:
+                file.write(b'{"seq": 3, "op"')
+            sink = JsonlChangeSink(path)
+            self.assertEqual(sink.last_seq(), 2)
+            resumed = ChangeFeed(sinks=[sink], start_seq=sink.last_seq())
+            self.assertEqual(resumed.publish([('put', '87654321X', 'Luis', 'Martín')])[0].seq, 3)
+            resumed.close()
+            self.assertEqual([(e.seq, e.dni) for e in read_jsonl_changes(path, since=1)],
+                             [(2, '12345678Z'), (3, '87654321X')])
+            self.assertEqual(JsonlChangeSink(os.path.join(temp_dir, 'empty.jsonl')).last_seq(), 0)
+
+
+class TestChangeFeedUserRepository(unittest.TestCase):
+    def setUp(self):
+        self.repository = ChangeFeedUserRepository(ColumnarUserRepository())
+
+    def events(self, since=0):
+        return [(e.op, e.dni, e.username) for e in self.repository.changes_since(since)]
+
+    def test_mutations_emit_events(self):
+        self.repository.save(User('Ana', 'García', '12345678Z'))
+        self.repository.update('12345678Z', 'Ana María', 'García')
+        self.repository.delete('12345678Z')
+        self.assertEqual(self.events(), [('put', '12345678Z', 'Ana'), ('put', '12345678Z', 'Ana María'),
+                                         ('delete', '12345678Z', None)])
+
+    def test_missing_users_emit_nothing(self):
+        self.repository.delete('12345678Z')
+        self.assertIsNone(self.repository.update('12345678Z', 'Ana', 'García'))
+        self.assertEqual(self.events(), [])
+
+    def test_batch_operations(self):
+        self.repository.save_many([User('Ana', 'García', '12345678Z'), User('Luis', 'Martín', '87654321X')])
+        self.assertEqual(self.repository.delete_many(['87654321X', '00000000T', '87654321X']), 1)
+        self.assertEqual(self.events(), [('put', '12345678Z', 'Ana'), ('put', '87654321X', 'Luis'),
+                                         ('delete', '87654321X', None)])
+
+    def test_incremental_sync(self):
+        # Un consumidor replica el estado aplicando solo los cambios nuevos
+        replica, seq = {}, 0
+        for n in range(3):
+            self.repository.save(User(f'U{n}', 'L', f"{n:08d}{'TRWAGMYFPDXBNJZSQVHLCKE'[n]}"))
+        self.repository.delete('00000001R')
+        for event in self.repository.changes_since(seq):
+            if event.op == 'put':
+                replica[event.dni] = event.username
+            else:
+                replica.pop(event.dni, None)
+            seq = event.seq
+        self.assertEqual(replica, {user._dni: user._username for user in self.repository.list()})
+
+
+class TestChangesEndpoint(unittest.TestCase):
+    def test_changes_endpoint(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            repository = FileUserRepository(os.path.join(temp_dir, 'users.json'))
+            controller = UserController(repository, change_feed=ChangeFeed(capacity=2))
+            for dni in ('12345678Z', '87654321X', '00000000T'):
+                controller.handle('POST', '/users', {}, json.dumps({'username': 'U', 'lastname': 'L',
+                                                                    'dni': dni}).encode())
+            status, body = controller.handle('GET', '/changes', {'since': '1'}, b'')
+            self.assertEqual(status, 200)
+            self.assertEqual([event['seq'] for event in json.loads(body)['events']], [2, 3])
+            self.assertEqual(json.loads(body)['delivery'], 'at-most-once')
+            self.assertEqual(controller.handle('GET', '/changes', {'since': '0'}, b'')[0], 410)
+            self.assertEqual(controller.handle('GET', '/changes', {'since': 'x'}, b'')[0], 400)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,107 @@
+import sys
+import threading
+import unittest
+from adapters.repositories import ColumnarUserRepository
+from adapters.repositories.columnar_user_repository import pack_dni, unpack_dni
+from entities import User, generate_valid_dnis
+from entities import DNI_LETTERS
+
+
+def synthetic_dni(number: int) -> str:
+    number %= 100_000_000
+    return f"{number:08d}{DNI_LETTERS[number % 23]}"
+
+
+class TestColumnarUserRepository(unittest.TestCase):
+    def setUp(self):
+        self.repository = ColumnarUserRepository()
+
+    def test_pack_roundtrip_keeps_letter_case(self):
+        for dni in ("12345678Z", "12345678z", "00000000T"):
+            self.assertEqual(unpack_dni(pack_dni(dni)), dni)
+        self.assertIsNone(pack_dni("1234567Z"))
+        self.assertIsNone(pack_dni("12345678Ñ"))
+
+    def test_crud(self):
+        self.repository.save(User("Ana", "García", "12345678Z"))
+        self.assertEqual(self.repository.get("12345678Z")._lastname, "García")
+        self.assertIsNone(self.repository.get("87654321X"))
+        self.assertEqual(self.repository.update("12345678Z", "Ana", "López")._lastname, "López")
+        self.assertEqual(self.repository.get("12345678Z")._lastname, "López")
+        self.assertIsNone(self.repository.update("87654321X", "Luis", "Martín"))
+        self.repository.delete("12345678Z")
+        self.assertIsNone(self.repository.get("12345678Z"))
+        self.assertEqual(len(self.repository), 0)
+
+    def test_many_users_with_deletes_and_row_reuse(self):
+        dnis = [synthetic_dni(i * 7919) for i in range(5000)]
+        self.repository.save_many(User(f"U{i}", f"L{i % 10}", dni) for i, dni in enumerate(dnis))
+        self.assertEqual(self.repository.delete_many(dnis[::2]), 2500)
+        self.repository.save(User("Nuevo", "Usuario", "12345678Z"))
+        self.assertEqual(len(self.repository), 2501)
+        self.assertIsNone(self.repository.get(dnis[0]))
+        self.assertEqual(self.repository.get(dnis[1])._username, "U1")
+        self.assertEqual(self.repository.get("12345678Z")._username, "Nuevo")
+        # Los nombres repetidos se guardan una sola vez y los de las filas borradas se liberan
+        # (quedan los 2500 nombres impares, sus 5 apellidos y los del usuario nuevo)
+        self.assertEqual(len(self.repository._names), 2500 + 5 + 2)
+
+    def test_string_table_does_not_grow_under_churn(self):
+        self.repository.save(User("Ana", "García", "12345678Z"))
+        for round_number in range(200):
+            self.repository.update("12345678Z", f"Nombre{round_number}", f"Apellido{round_number}")
+            self.repository.save(User("Temporal", f"Baja{round_number}", "87654321X"))
+            self.repository.delete("87654321X")
+        self.assertEqual(len(self.repository._names), 2)
+        self.assertLessEqual(len(self.repository._names.strings), 6)
+        self.assertEqual(self.repository.get("12345678Z")._lastname, "Apellido199")
+
+    def test_reads_during_resizes_row_reuse_and_name_churn(self):
+        self.repository.save(User("Ana", "García", "12345678Z"))
+        dnis = generate_valid_dnis(20000)
+        stop = threading.Event()
+        misses = []
+
+        def read():
+            while not stop.is_set():
+                user = self.repository.get("12345678Z")
+                if user is None or not user._username.startswith("Nombre") and user._username != "Ana":
+                    misses.append(user)
+                found = self.repository.get_many(["12345678Z"])
+                if "12345678Z" not in found:
+                    misses.append(None)
+
+        # Cambios de hilo muy frecuentes para que el lector caiga en mitad de las escrituras
+        self.addCleanup(sys.setswitchinterval, sys.getswitchinterval())
+        sys.setswitchinterval(1e-6)
+        reader = threading.Thread(target=read)
+        reader.start()
+        try:
+            for round_number, dni in enumerate(dnis):
+                # Altas que redimensionan el índice, bajas que liberan filas y nombres que se liberan
+                self.repository.save(User("Temporal", f"Baja{round_number}", dni))
+                if round_number % 2:
+                    self.repository.delete(dnis[round_number - 1])
+                self.repository.update("12345678Z", f"Nombre{round_number}", f"Apellido{round_number}")
+        finally:
+            stop.set()
+            reader.join()
+        self.assertEqual(misses, [])
+
+    def test_list_and_search(self):
+        self.repository.save_many([
+            User("Agustín", "Estévez Domínguez", "76826889N"),
+            User("María", "López Fernández", "12345678Z"),
+            User("Mario", "Esteban", "87654321X"),
+        ])
+        page = self.repository.list(limit=2)
+        self.assertEqual([u._dni for u in page], ["12345678Z", "76826889N"])
+        self.assertEqual([u._dni for u in self.repository.list(cursor=page.next_cursor, limit=2)], ["87654321X"])
+        self.assertEqual([u._dni for u in self.repository.search(lastname_prefix="estev")], ["76826889N"])
+        self.repository.update("12345678Z", "María", "Estevan")
+        self.assertEqual([u._dni for u in self.repository.search(lastname_prefix="estev")],
+                         ["12345678Z", "76826889N"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import threading
+import unittest
+from adapters.repositories import DatabaseUserRepository
+from entities import User, generate_valid_dnis
+from external.database import SQLiteConnectionPool
+
+
+class TestDatabaseUserRepository(unittest.TestCase):
+    def setUp(self):
+        self.repository = DatabaseUserRepository(':memory:')
+
+    def tearDown(self):
+        self.repository.close()
+
+    def test_save_get_update_delete(self):
+        self.repository.save(User("Ana", "García", "12345678Z"))
+        self.assertEqual(self.repository.get("12345678Z")._lastname, "García")
+        updated = self.repository.update("12345678Z", "Ana María", "García López")
+        self.assertEqual(updated._username, "Ana María")
+        self.assertEqual(self.repository.get("12345678Z")._lastname, "García López")
+        self.assertIsNone(self.repository.update("87654321X", "Luis", "Martín"))
+        self.repository.delete("12345678Z")
+        self.assertIsNone(self.repository.get("12345678Z"))
+
+    def test_iter_users_releases_connection_between_pages(self):
+        repository = DatabaseUserRepository(pool=SQLiteConnectionPool(':memory:', size=1, timeout=0.5))
+        dnis = generate_valid_dnis(2500)
+        repository.save_many(User("U", "L", dni) for dni in dnis)
+        users = repository.iter_users()
+        self.assertEqual(next(users)._dni, dnis[0])
+        # Con un pool de una conexión, otra operación a mitad de la iteración no debe quedarse esperando
+        self.assertIsNotNone(repository.get(dnis[-1]))
+        self.assertEqual([user._dni for user in users], dnis[1:])
+        repository.close()
+
+    def test_invalid_update_is_rolled_back(self):
+        self.repository.save(User("Ana", "García", "12345678Z"))
+        with self.assertRaises(ValueError):
+            self.repository.update("12345678Z", "", "López")
+        self.assertEqual(self.repository.get("12345678Z")._lastname, "García")
+        # La transacción deshecha no deja bloqueada la escritura
+        self.assertEqual(self.repository.update("12345678Z", "Ana", "López")._lastname, "López")
+
+    def test_batch_operations(self):
+        self.repository.save_many([User("Ana", "García", "12345678Z"), User("Luis", "Martín", "87654321X")])
+        self.assertEqual(set(self.repository.get_many(["12345678Z", "87654321X", "76826889N"])),
+                         {"12345678Z", "87654321X"})
+        self.assertEqual(self.repository.delete_many(["12345678Z", "76826889N"]), 1)
+        self.assertEqual([u._dni for u in self.repository.list()], ["87654321X"])
+
+    def test_list_pagination_and_search(self):
+        self.repository.save_many([
+            User("Agustín", "Estévez Domínguez", "76826889N"),
+            User("María", "López Fernández", "12345678Z"),
+            User("Mario", "Esteban", "87654321X"),
+        ])
+        page = self.repository.list(limit=2)
+        self.assertEqual([u._dni for u in page], ["12345678Z", "76826889N"])
+        page = self.repository.list(limit=2, cursor=page.next_cursor)
+        self.assertEqual([u._dni for u in page], ["87654321X"])
+        self.assertIsNone(page.next_cursor)
+        self.assertEqual([u._dni for u in self.repository.list(lastname_prefix="este", username_contains="ARI")],
+                         ["87654321X"])
+        self.assertEqual([u._dni for u in self.repository.search(lastname_prefix="estev")], ["76826889N"])
+
+    def test_file_database_is_shared_between_threads(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            repository = DatabaseUserRepository(os.path.join(temp_dir, 'users.db'), pool_size=2)
+            users = [User("Ana", "García", "12345678Z"), User("Luis", "Martín", "87654321X")]
+            threads = [threading.Thread(target=repository.save, args=(user,)) for user in users]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(len(repository.list()), 2)
+            repository.close()
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from adapters.repositories.file_locks import InterProcessFileLock, ReadWriteLock
+
+
+class TestReadWriteLock(unittest.TestCase):
+    def test_readers_share_the_lock(self):
+        lock = ReadWriteLock()
+        inside = threading.Barrier(2, timeout=2)
+
+        def reader():
+            with lock.read():
+                # Si los lectores se excluyeran la barrera no se alcanzaría
+                inside.wait()
+
+        threads = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertFalse(inside.broken)
+
+    def test_writer_excludes_readers(self):
+        lock = ReadWriteLock()
+        events = []
+
+        def reader():
+            with lock.read():
+                events.append('read')
+
+        with lock.write():
+            thread = threading.Thread(target=reader)
+            thread.start()
+            time.sleep(0.05)
+            events.append('write')
+        thread.join()
+        self.assertEqual(events, ['write', 'read'])
+
+    def test_write_is_reentrant_and_writer_can_read(self):
+        lock = ReadWriteLock()
+        with lock.write():
+            with lock.write():
+                with lock.read():
+                    pass
+        # Tras salir el cerrojo queda libre para otro hilo
+        acquired = []
+
+        def writer():
+            with lock.write():
+                acquired.append(True)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        thread.join(timeout=2)
+        self.assertEqual(acquired, [True])
+
+
+class TestInterProcessFileLock(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'users.json.lock')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_exclusive_is_reentrant(self):
+        lock = InterProcessFileLock(self.path)
+        with lock.exclusive():
+            with lock.exclusive():
+                pass
+            with lock.shared():
+                pass
+        lock.close()
+        self.assertTrue(os.path.exists(self.path))
+
+    def test_shared_cannot_be_promoted(self):
+        lock = InterProcessFileLock(self.path)
+        with lock.shared():
+            with self.assertRaises(RuntimeError):
+                with lock.exclusive():
+                    pass
+        lock.close()
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -1,6 +1,10 @@
+import multiprocessing
+import os
 import tempfile
+import threading
 import unittest
 from adapters.repositories import FileUserRepository
+from adapters.repositories.user_snapshot import CorruptSnapshotError
 from entities import User
 
 
@@ -46,5 +50,251 @@ class TestFileUserRepository(unittest.TestCase):
         self.assertEqual(retrieved_user._lastname, "Ruiz")
         self.assertEqual(retrieved_user._dni, "87654321X")
 
+    def test_corrupt_file_is_reported_instead_of_reset(self):
+        with open(self.temp_file.name, 'w') as file:
+            file.write('{"87654321X": {"username": "Car')
+        with self.assertRaises(CorruptSnapshotError):
+            FileUserRepository(self.temp_file.name)
+
+    def test_recovery_does_not_rotate_the_damaged_snapshot_over_the_good_one(self):
+        for suffix in ('', '.1', '.corrupt'):
+            self.addCleanup(lambda path: os.path.exists(path) and os.remove(path), self.temp_file.name + suffix)
+        self.repository.save(User("Ana", "García", "12345678Z"))
+        self.repository.save(User("Luis", "Martín", "87654321X"))
+
+        def damage():
+            with open(self.temp_file.name, 'r+b') as file:
+                file.truncate(os.path.getsize(self.temp_file.name) - 10)
+
+        damage()
+        recovered = FileUserRepository(self.temp_file.name)
+        self.assertEqual(recovered.recovered_from, self.temp_file.name + '.1')
+        self.assertTrue(os.path.exists(self.temp_file.name + '.corrupt'))
+        recovered.save(User("Eva", "Pérez", "11111111H"))
+        # La generación anterior es la recuperada, no el archivo dañado
+        damage()
+        again = FileUserRepository(self.temp_file.name)
+        self.assertEqual(again.recovered_from, self.temp_file.name + '.1')
+        self.assertEqual(again.get("12345678Z")._username, "Ana")
+
+    def test_save_many_persists_once(self):
+        users = [User("Ana", "García", "12345678Z"), User("Luis", "Martín", "87654321X")]
+        generation = self.repository.generation
+        self.repository.save_many(users)
+        self.assertEqual(self.repository.generation, generation + 1)
+        new_repository = FileUserRepository(self.temp_file.name)
+        self.assertEqual(set(new_repository.get_many(["12345678Z", "87654321X", "76826889N"])),
+                         {"12345678Z", "87654321X"})
+        self.assertEqual(new_repository.delete_many(["12345678Z", "76826889N"]), 1)
+        self.assertIsNone(FileUserRepository(self.temp_file.name).get("12345678Z"))
+
+    def test_failed_batch_is_rolled_back(self):
+        self.repository.save(User("Ana", "García", "12345678Z"))
+        def failing_persist(users=None):
+            raise IOError("disco lleno")
+        self.repository._persist = failing_persist
+        with self.assertRaises(IOError):
+            self.repository.save_many([User("Ana María", "García", "12345678Z"), User("Luis", "Martín", "87654321X")])
+        self.assertEqual(self.repository.get("12345678Z")._username, "Ana")
+        self.assertIsNone(self.repository.get("87654321X"))
+
+    def test_list_pages_follow_dni_order(self):
+        for i in range(10):
+            number = 10000000 + i
+            self.repository.save(User(f"User{i}", f"Apellido{i % 2}", f"{number}{'TRWAGMYFPDXBNJZSQVHLCKE'[number % 23]}"))
+        all_dnis = sorted(self.repository.users)
+        page = self.repository.list(limit=4)
+        self.assertEqual([u._dni for u in page], all_dnis[:4])
+        # Los cambios posteriores se reflejan en el índice de paginación
+        self.repository.delete(all_dnis[4])
+        page = self.repository.list(limit=4, cursor=page.next_cursor)
+        self.assertEqual([u._dni for u in page], all_dnis[5:9])
+        self.assertEqual([u._dni for u in self.repository.list(offset=8)], all_dnis[9:])
+        filtered = self.repository.list(lastname_prefix="apellido1", limit=2)
+        self.assertEqual([u._lastname for u in filtered], ["Apellido1", "Apellido1"])
+        self.assertIsNotNone(filtered.next_cursor)
+
+    def test_search_indexes_follow_mutations(self):
+        self.repository.save(User("Agustín", "Estévez Domínguez", "76826889N"))
+        self.repository.save(User("María", "López Fernández", "12345678Z"))
+        self.assertEqual([u._dni for u in self.repository.search(lastname_prefix="ESTEVEZ")], ["76826889N"])
+        self.repository.update("12345678Z", "María", "Estevan")
+        self.repository.delete("76826889N")
+        self.assertEqual([u._dni for u in self.repository.search(lastname_prefix="estev")], ["12345678Z"])
+        self.assertEqual([u._dni for u in self.repository.search(username_prefix="maria")], ["12345678Z"])
+        self.assertEqual(self.repository.search(lastname_prefix="lopez"), [])
+
+
+class TestFileUserRepositoryJournal(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, 'users.json')
+        self.repository = FileUserRepository(self.file_path, journal=True)
+
+    def tearDown(self):
+        self.repository.close()
+        self.temp_dir.cleanup()
+
+    def test_mutations_are_replayed_on_startup(self):
+        self.repository.save(User("Ana", "García", "12345678Z"))
+        self.repository.save(User("Luis", "Martín", "87654321X"))
+        self.repository.update("12345678Z", "Ana María", "García")
+        self.repository.delete("87654321X")
+        # El snapshot no se ha escrito: todo vive en el journal
+        self.assertFalse(os.path.exists(self.file_path))
+        new_repository = FileUserRepository(self.file_path, journal=True)
+        self.assertEqual(new_repository.get("12345678Z")._username, "Ana María")
+        self.assertIsNone(new_repository.get("87654321X"))
+        new_repository.close()
+
+    def test_pretty_serializer_keeps_journal_one_record_per_line(self):
+        repository = FileUserRepository(self.file_path + '.pretty', journal=True, serializer='json-pretty')
+        repository.save(User("Ana", "García", "12345678Z"))
+        repository.save(User("Luis", "Martín", "87654321X"))
+        repository.close()
+        reopened = FileUserRepository(self.file_path + '.pretty', journal=True, serializer='json-pretty')
+        self.assertEqual(reopened.get("12345678Z")._lastname, "García")
+        self.assertIsNotNone(reopened.get("87654321X"))
+        self.assertGreater(reopened.journal.size, 0)
+        reopened.close()
+
+    def test_compaction_after_threshold(self):
+        self.repository.compact_threshold = 1
+        self.repository.save(User("Ana", "García", "12345678Z"))
+        self.assertTrue(os.path.exists(self.file_path))
+        self.assertEqual(self.repository.journal.size, 0)
+        new_repository = FileUserRepository(self.file_path, journal=True)
+        self.assertIsNotNone(new_repository.get("12345678Z"))
+        new_repository.close()
+
+
+class TestFileUserRepositoryWriteBehind(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, 'users.json')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_writes_are_flushed_together(self):
+        repository = FileUserRepository(self.file_path, write_behind=True, flush_interval=0)
+        for number in range(20):
+            repository.save(User(f"User{number}", "Diferido", _dni(number)))
+        # Nada llega al disco hasta el volcado, pero la lectura ya ve los cambios
+        self.assertFalse(os.path.exists(self.file_path))
+        self.assertEqual(len(repository.list()), 20)
+        repository.flush()
+        self.assertEqual(repository.generation, 1)
+        self.assertEqual(len(FileUserRepository(self.file_path).list()), 20)
+        repository.close()
+
+    def test_flush_after_n_mutations(self):
+        repository = FileUserRepository(self.file_path, journal=True, write_behind=True, flush_interval=0,
+                                        flush_after=5)
+        for number in range(12):
+            repository.save(User(f"User{number}", "Diferido", _dni(number)))
+        self.assertEqual(len(FileUserRepository(self.file_path, journal=True).list()), 10)
+        repository.close()
+        self.assertEqual(len(FileUserRepository(self.file_path, journal=True).list()), 12)
+
+    def test_context_manager_flushes_on_exit(self):
+        with FileUserRepository(self.file_path, write_behind=True, flush_interval=0) as repository:
+            repository.save(User("Ana", "García", _dni(1)))
+        self.assertIsNotNone(FileUserRepository(self.file_path).get(_dni(1)))
+
+    def test_wait_for_commit_returns_after_background_flush(self):
+        repository = FileUserRepository(self.file_path, write_behind=True, flush_interval=0.01)
+        repository.save(User("Ana", "García", _dni(1)))
+        self.assertTrue(repository.wait_for_commit(timeout=5))
+        self.assertIsNotNone(FileUserRepository(self.file_path).get(_dni(1)))
+        repository.close()
+
+    def test_wait_for_commit_times_out_without_flush(self):
+        repository = FileUserRepository(self.file_path, write_behind=True, flush_interval=0)
+        repository.save(User("Ana", "García", _dni(1)))
+        self.assertFalse(repository.wait_for_commit(timeout=0.01))
+        repository.close()
+        self.assertTrue(repository.wait_for_commit(timeout=0))
+
+    def test_not_compatible_with_process_safe(self):
+        with self.assertRaises(ValueError):
+            FileUserRepository(self.file_path, write_behind=True, process_safe=True)
+
+
+def _save_users_in_process(file_path: str, journal: bool, start: int, count: int):
+    repository = FileUserRepository(file_path, journal=journal, process_safe=True)
+    for number in range(start, start + count):
+        repository.save(User(f"User{number}", "Proceso", _dni(number)))
+    repository.close()
+
+
+def _dni(number: int) -> str:
+    return f"{number:08d}{'TRWAGMYFPDXBNJZSQVHLCKE'[number % 23]}"
+
+
+class TestFileUserRepositoryProcessSafe(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, 'users.json')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _pair(self, journal: bool):
+        first = FileUserRepository(self.file_path, journal=journal, process_safe=True)
+        second = FileUserRepository(self.file_path, journal=journal, process_safe=True)
+        self.addCleanup(first.close)
+        self.addCleanup(second.close)
+        return first, second
+
+    def test_instances_see_each_other_writes(self):
+        for journal in (False, True):
+            with self.subTest(journal=journal):
+                first, second = self._pair(journal)
+                first.save(User("Ana", "García", _dni(1)))
+                second.save(User("Luis", "Martín", _dni(2)))
+                # Ninguna escritura pisa a la otra
+                self.assertEqual(len(first.list()), 2)
+                self.assertEqual(second.get(_dni(1))._username, "Ana")
+                second.delete(_dni(1))
+                self.assertIsNone(first.get(_dni(1)))
+                self.assertEqual([u._dni for u in first.search(lastname_prefix="mar")], [_dni(2)])
+
+    def test_compaction_by_another_instance_is_reloaded(self):
+        first, second = self._pair(journal=True)
+        first.save(User("Ana", "García", _dni(1)))
+        self.assertEqual(len(second.list(limit=10)), 1)
+        second.save(User("Luis", "Martín", _dni(2)))
+        second.compact()
+        first.save(User("Eva", "Pérez", _dni(3)))
+        self.assertEqual([u._dni for u in second.list(limit=10)], [_dni(1), _dni(2), _dni(3)])
+        self.assertEqual(len(FileUserRepository(self.file_path, journal=True).list()), 3)
+
+    def test_concurrent_threads_do_not_lose_updates(self):
+        repository = FileUserRepository(self.file_path, journal=True, process_safe=True)
+        self.addCleanup(repository.close)
+        threads = [threading.Thread(target=lambda base=base: [
+            repository.save(User("Hilo", "Prueba", _dni(base + i))) for i in range(50)
+        ]) for base in range(0, 200, 50)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(FileUserRepository(self.file_path, journal=True).list()), 200)
+
+    def test_concurrent_processes_do_not_lose_updates(self):
+        for journal in (False, True):
+            with self.subTest(journal=journal):
+                file_path = os.path.join(self.temp_dir.name, f'users_{journal}.json')
+                processes = [multiprocessing.Process(target=_save_users_in_process,
+                                                     args=(file_path, journal, worker * 1000, 20))
+                             for worker in range(3)]
+                for process in processes:
+                    process.start()
+                for process in processes:
+                    process.join()
+                    self.assertEqual(process.exitcode, 0)
+                self.assertEqual(len(FileUserRepository(file_path, journal=journal).list()), 60)
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,105 @@
+import gc
+import os
+import tempfile
+import time
+import unittest
+from adapters.controllers import UserController
+from adapters.metrics import Histogram, InstrumentedUserRepository, MetricsRegistry, instrument_use_case
+from adapters.repositories import FileUserRepository
+from entities import User
+from use_cases import CreateUserUseCase, FindUserUseCase
+
+
+class TestHistogram(unittest.TestCase):
+    def test_buckets_and_quantiles(self):
+        histogram = Histogram((0.001, 0.01, 0.1))
+        for value in (0.0005, 0.001, 0.005, 0.05, 5.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.cumulative(), [(0.001, 2), (0.01, 3), (0.1, 4), (float('inf'), 5)])
+        self.assertEqual(histogram.count, 5)
+        self.assertAlmostEqual(histogram.quantile(0.4), 0.001)
+        self.assertAlmostEqual(histogram.quantile(0.5), 0.0055)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.registry = MetricsRegistry()
+        self.repository = InstrumentedUserRepository(
+            FileUserRepository(os.path.join(self.temp_dir.name, 'users.json')), self.registry)
+
+    def tearDown(self):
+        self.repository.close()
+        self.temp_dir.cleanup()
+
+    def test_use_case_calls_errors_and_latency(self):
+        create_user = instrument_use_case(CreateUserUseCase(self.repository), self.registry)
+        find_user = instrument_use_case(FindUserUseCase(self.repository), self.registry)
+        create_user.execute('Ana', 'García', '12345678Z')
+        with self.assertRaises(ValueError):
+            create_user.execute('Ana', 'García', '12345678A')
+        with self.assertRaises(ValueError):
+            find_user.execute('87654321X')
+        operations = self.registry.snapshot()['operations']
+        self.assertEqual(operations['CreateUserUseCase.execute']['calls'], 2)
+        self.assertEqual(operations['CreateUserUseCase.execute']['errors'], {'ValueError': 1})
+        self.assertEqual(operations['FindUserUseCase.execute']['errors'], {'ValueError': 1})
+        self.assertEqual(operations['FileUserRepository.save']['calls'], 1)
+        self.assertEqual(operations['FileUserRepository.get']['kind'], 'repository')
+        self.assertGreater(operations['FileUserRepository.save']['latency_sum'], 0)
+
+    def test_bytes_written_and_prometheus_export(self):
+        self.repository.save_many([User('Ana', 'García', '12345678Z'), User('Luis', 'Martín', '87654321X')])
+        written = self.repository.repository.bytes_written
+        self.assertGreater(written, 0)
+        self.assertEqual(self.registry.snapshot()['values']['users_repository_bytes_written_total'],
+                         [({'name': 'FileUserRepository'}, written)])
+        text = self.registry.export_prometheus()
+        self.assertIn('# TYPE users_operation_duration_seconds histogram', text)
+        self.assertIn('users_operation_calls_total{kind="repository",name="FileUserRepository",'
+                      'operation="save_many"} 1', text)
+        self.assertIn('operation="save_many",le="+Inf"} 1', text)
+        self.assertIn(f'users_repository_bytes_written_total{{name="FileUserRepository"}} {written}', text)
+
+    def test_bytes_written_callback_is_registered_once(self):
+        for number in range(3):
+            other = InstrumentedUserRepository(
+                FileUserRepository(os.path.join(self.temp_dir.name, f'other{number}.json')), self.registry)
+            other.close()
+        del other
+        gc.collect()
+        self.assertEqual(len(self.registry._callbacks['users_repository_bytes_written_total'][2]), 1)
+        # Los repositorios descartados ya no se publican
+        self.assertEqual(len(self.registry.snapshot()['values']['users_repository_bytes_written_total']), 1)
+
+    def test_iter_users_times_the_iteration(self):
+        self.repository.save_many([User('Ana', 'García', '12345678Z'), User('Luis', 'Martín', '87654321X')])
+        iter_users = self.repository.repository.iter_users
+
+        def slow_iter_users():
+            for user in iter_users():
+                time.sleep(0.01)
+                yield user
+
+        self.repository.repository.iter_users = slow_iter_users
+        self.assertEqual(len(list(self.repository.iter_users())), 2)
+        operation = self.registry.snapshot()['operations']['FileUserRepository.iter_users']
+        self.assertEqual(operation['calls'], 1)
+        self.assertGreaterEqual(operation['latency_sum'], 0.02)
+
+    def test_disabled_registry_records_nothing(self):
+        self.registry.enabled = False
+        create_user = instrument_use_case(CreateUserUseCase(self.repository), self.registry)
+        self.assertEqual(create_user.execute('Ana', 'García', '12345678Z')._dni, '12345678Z')
+        self.assertEqual(self.registry.snapshot()['operations'], {})
+
+    def test_controller_exposes_metrics(self):
+        controller = UserController(self.repository.repository, metrics=self.registry)
+        controller.handle('GET', '/users/12345678Z', {}, b'')
+        status, content_type, body = controller.respond('GET', '/metrics', {}, b'')
+        self.assertEqual(status, 200)
+        self.assertTrue(content_type.startswith('text/plain'))
+        self.assertIn(b'name="FindUserUseCase",operation="execute",exception="ValueError"} 1', body)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
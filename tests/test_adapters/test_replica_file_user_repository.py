@@ -0,0 +1,94 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+from adapters.controllers import UserController
+from adapters.repositories import FileUserRepository, ReadOnlyRepositoryError, ReplicaFileUserRepository
+from adapters.repositories import replica_file_user_repository
+from entities import User
+
+
+class TestReplicaFileUserRepository(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'users.json')
+        self.writer = FileUserRepository(self.path, journal=True)
+        self.writer.save(User("Ana", "García", "12345678Z"))
+        self.replica = ReplicaFileUserRepository(self.path, poll_interval=0)
+
+    def tearDown(self):
+        self.replica.close()
+        self.writer.close()
+        self.temp_dir.cleanup()
+
+    def test_applies_journal_deltas(self):
+        self.assertEqual(self.replica.get("12345678Z")._username, "Ana")
+        self.assertFalse(self.replica.refresh())
+        self.writer.save(User("Luis", "Martín", "87654321X"))
+        self.writer.delete("12345678Z")
+        self.assertIsNone(self.replica.get("87654321X"))
+        self.assertTrue(self.replica.refresh())
+        self.assertEqual(self.replica.get("87654321X")._lastname, "Martín")
+        self.assertIsNone(self.replica.get("12345678Z"))
+        self.assertEqual(len(self.replica), 1)
+        stats = self.replica.stats
+        self.assertEqual((stats.delta_reloads, stats.full_reloads, stats.records_applied), (1, 0, 2))
+        self.assertGreaterEqual(stats.last_staleness, 0.0)
+
+    def test_snapshot_generation_triggers_full_reload(self):
+        self.writer.save(User("Luis", "Martín", "87654321X"))
+        self.writer.compact()
+        self.assertTrue(self.replica.refresh())
+        self.assertEqual(self.replica.stats.full_reloads, 1)
+        self.assertEqual(sorted(user._dni for user in self.replica.list()), ["12345678Z", "87654321X"])
+
+    def test_incomplete_journal_line_waits_for_the_rest(self):
+        line = b'{"op": "put", "dni": "87654321X", "username": "Luis", "lastname": "Mart\\u00edn"}\n'
+        with open(self.path + '.journal', 'ab') as journal:
+            journal.write(line[:20])
+        self.assertFalse(self.replica.refresh())
+        with open(self.path + '.journal', 'ab') as journal:
+            journal.write(line[20:])
+        self.assertTrue(self.replica.refresh())
+        self.assertEqual(self.replica.get("87654321X")._lastname, "Martín")
+
+    def test_delta_is_merged_and_pages_stay_sorted(self):
+        with mock.patch.object(replica_file_user_repository, 'MERGE_MIN', 2):
+            for dni in ("00000001R", "87654321X", "00000000T"):
+                self.writer.save(User("Otro", "Usuario", dni))
+                self.replica.refresh()
+            self.writer.delete("87654321X")
+            self.replica.refresh()
+        page = self.replica.list(limit=2)
+        self.assertEqual([user._dni for user in page], ["00000000T", "00000001R"])
+        self.assertEqual([user._dni for user in self.replica.list(cursor=page.next_cursor)], ["12345678Z"])
+
+    def test_reads_keep_their_version_during_reload(self):
+        users = self.replica.iter_users()
+        self.writer.save(User("Luis", "Martín", "87654321X"))
+        self.replica.refresh()
+        self.assertEqual([user._dni for user in users], ["12345678Z"])
+
+    def test_mutations_are_rejected(self):
+        with self.assertRaises(ReadOnlyRepositoryError):
+            self.replica.save(User("Luis", "Martín", "87654321X"))
+        with self.assertRaises(ReadOnlyRepositoryError):
+            self.replica.delete("12345678Z")
+        status, _ = UserController(self.replica).handle('DELETE', '/users/12345678Z', {}, b'')
+        self.assertEqual(status, 405)
+
+    def test_watch_thread_picks_up_changes(self):
+        replica = ReplicaFileUserRepository(self.path, poll_interval=0.01)
+        try:
+            self.writer.save(User("Luis", "Martín", "87654321X"))
+            deadline = time.monotonic() + 5
+            while replica.get("87654321X") is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertIsNotNone(replica.get("87654321X"))
+        finally:
+            replica.close()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
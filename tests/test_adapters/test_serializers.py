@@ -0,0 +1,35 @@
+import unittest
+from adapters.repositories.serializers import SERIALIZERS, PrettyJsonSerializer, Serializer, get_serializer
+
+USERS = {
+    "12345678Z": {"username": "Ana", "lastname": "García", "dni": "12345678Z"},
+    "87654321X": {"username": "Luis", "lastname": "Martín", "dni": "87654321X"},
+}
+
+
+class TestSerializers(unittest.TestCase):
+    def test_every_available_serializer_roundtrips_rows(self):
+        for name in SERIALIZERS:
+            with self.subTest(serializer=name):
+                serializer = get_serializer(name)
+                self.assertEqual(serializer.decode_users(serializer.encode_users(USERS)), USERS)
+                self.assertEqual(serializer.loads(serializer.dumps(USERS)), USERS)
+
+    def test_compact_is_smaller_than_pretty(self):
+        compact = Serializer().encode_users(USERS)
+        pretty = PrettyJsonSerializer().dumps(USERS)
+        self.assertNotIn(b' ', compact)
+        self.assertLess(len(compact) * 2, len(pretty))
+
+    def test_malformed_rows_raise_decode_error(self):
+        serializer = get_serializer('json')
+        with self.assertRaises(serializer.decode_errors):
+            serializer.decode_users(b'[["Ana", "Garc\\u00eda"]]')
+
+    def test_auto_and_unknown_names(self):
+        self.assertIn(get_serializer('auto').name, SERIALIZERS)
+        with self.assertRaises(ValueError):
+            get_serializer('yaml')
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
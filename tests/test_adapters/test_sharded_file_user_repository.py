@@ -0,0 +1,154 @@
+import os
+import tempfile
+import threading
+import unittest
+from adapters.repositories import (ColumnarUserRepository, DatabaseUserRepository, FileUserRepository,
+                                   ShardedFileUserRepository)
+from adapters.repositories.sharded_file_user_repository import shard_index
+from entities import User, generate_valid_dnis
+
+
+def make_users(count: int, start: int = 0) -> list:
+    return [User(f"User{n}", f"Lastname{n}", dni) for n, dni in enumerate(generate_valid_dnis(count, start), start)]
+
+
+class TestShardedFileUserRepository(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp_dir.name, 'shards')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def shard_files(self) -> list:
+        return sorted(name for name in os.listdir(self.directory) if name.endswith('.json') and name != 'manifest.json')
+
+    def test_crud_and_persistence(self):
+        repository = ShardedFileUserRepository(self.directory, shards=4)
+        repository.save(User("Ana", "García", "12345678Z"))
+        repository.save(User("Luis", "Martín", "87654321X"))
+        self.assertEqual(repository.update("12345678Z", "Ana María", "García")._username, "Ana María")
+        repository.delete("87654321X")
+        self.assertIsNone(repository.get("87654321X"))
+        reopened = ShardedFileUserRepository(self.directory, shards=99)
+        # El número de shards lo fija el manifiesto, no el argumento
+        self.assertEqual(reopened.shard_count, 4)
+        self.assertEqual(reopened.get("12345678Z")._username, "Ana María")
+        self.assertEqual(len(reopened), 1)
+
+    def test_writes_only_touch_their_shard(self):
+        repository = ShardedFileUserRepository(self.directory, shards=8)
+        user = make_users(1)[0]
+        repository.save(user)
+        self.assertEqual(self.shard_files(), [f'shard-0000-{shard_index(user._dni, 8):04d}.json'])
+
+    def test_shards_load_lazily(self):
+        repository = ShardedFileUserRepository(self.directory, shards=8)
+        repository.save_many(make_users(100))
+        reopened = ShardedFileUserRepository(self.directory)
+        reopened.get(make_users(1)[0]._dni)
+        self.assertEqual(len(reopened._layout.loaded_shards()), 1)
+
+    def test_list_pages_in_dni_order_across_shards(self):
+        users = make_users(50)
+        repository = ShardedFileUserRepository(self.directory, shards=5)
+        repository.save_many(users)
+        expected = sorted(user._dni for user in users)
+        self.assertEqual(sorted(user._dni for user in repository.list()), expected)
+        seen, cursor = [], None
+        while True:
+            page = repository.list(limit=7, cursor=cursor)
+            seen += [user._dni for user in page]
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        self.assertEqual(seen, expected)
+        self.assertEqual([user._dni for user in repository.list(offset=3, limit=4)], expected[3:7])
+        filtered = repository.list(limit=100, lastname_prefix="lastname1")
+        self.assertEqual({user._lastname for user in filtered}, {f"Lastname{n}" for n in [1] + list(range(10, 20))})
+
+    def test_list_with_offset_only_is_in_dni_order(self):
+        users = make_users(50)
+        repository = ShardedFileUserRepository(self.directory, shards=5)
+        repository.save_many(users)
+        expected = sorted(user._dni for user in users)
+        self.assertEqual([user._dni for user in repository.list(offset=1)], expected[1:])
+
+    def test_search_matches_other_backends(self):
+        users = [User(f"Ana{n % 3}", f"García{n % 7:02d}", dni) for n, dni in enumerate(generate_valid_dnis(60))]
+        sharded = ShardedFileUserRepository(self.directory, shards=5)
+        others = [FileUserRepository(os.path.join(self.temp_dir.name, 'users.json')), ColumnarUserRepository(),
+                  DatabaseUserRepository(os.path.join(self.temp_dir.name, 'users.db'))]
+        for repository in [sharded] + others:
+            repository.save_many(users)
+        queries = [{'lastname_prefix': 'garcia', 'limit': 3}, {'lastname_prefix': 'garcia0', 'limit': 10},
+                   {'username_prefix': 'ana', 'limit': 5}, {'lastname_prefix': 'garcia', 'username_prefix': 'ana1'}]
+        for query in queries:
+            expected = [user._dni for user in sharded.search(**query)]
+            for repository in others:
+                with self.subTest(query=query, backend=type(repository).__name__):
+                    self.assertEqual([user._dni for user in repository.search(**query)], expected)
+        others[0].close()
+        others[2].close()
+
+    def test_batch_operations(self):
+        users = make_users(30)
+        repository = ShardedFileUserRepository(self.directory, shards=3)
+        repository.save_many(users)
+        dnis = [user._dni for user in users[:10]]
+        self.assertEqual(set(repository.get_many(dnis + ["00000000T"])), set(dnis))
+        self.assertEqual(repository.delete_many(dnis + [None]), 10)
+        self.assertEqual(len(repository), 20)
+        self.assertEqual(len(repository.search(lastname_prefix="lastname2")), 10)
+
+    def test_reshard_keeps_users_and_removes_old_files(self):
+        users = make_users(200)
+        repository = ShardedFileUserRepository(self.directory, shards=2)
+        repository.save_many(users)
+        repository.reshard(7)
+        self.assertEqual(repository.shard_count, 7)
+        self.assertTrue(all(name.startswith('shard-0001-') for name in self.shard_files()))
+        reopened = ShardedFileUserRepository(self.directory)
+        self.assertEqual(reopened.shard_count, 7)
+        self.assertEqual(len(reopened), 200)
+        self.assertTrue(all(reopened.get(user._dni) for user in users))
+
+    def test_reads_and_writes_during_reshard(self):
+        users = make_users(500)
+        repository = ShardedFileUserRepository(self.directory, shards=4, journal=True)
+        repository.save_many(users)
+        errors = []
+
+        def worker():
+            try:
+                for user in make_users(100, start=1000):
+                    repository.save(user)
+                    if repository.get(users[0]._dni) is None:
+                        errors.append('lectura perdida')
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        repository.reshard(16)
+        thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(ShardedFileUserRepository(self.directory, journal=True)), 600)
+
+    def test_opening_does_not_remove_a_newer_epoch_in_progress(self):
+        repository = ShardedFileUserRepository(self.directory, shards=2)
+        repository.save_many(make_users(20))
+        # Shard de la época siguiente escrito por un reshard que aún no ha cambiado el manifiesto
+        in_progress = os.path.join(self.directory, 'shard-0001-0000.json')
+        FileUserRepository(in_progress).save_many(make_users(5, start=500))
+        ShardedFileUserRepository(self.directory).close()
+        self.assertTrue(os.path.exists(in_progress))
+        # Si ese reshard se interrumpió, el siguiente descarta sus restos en lugar de mezclarlos
+        repository.reshard(1)
+        self.assertEqual(len(repository), 20)
+        self.assertEqual(len(ShardedFileUserRepository(self.directory)), 20)
+        repository.close()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,45 @@
+import random
+import unittest
+from adapters.repositories.sorted_index import SortedKeyIndex
+
+
+class TestSortedKeyIndex(unittest.TestCase):
+    def setUp(self):
+        # Bloques pequeños para ejercitar las divisiones y borrados de bloques
+        self.index = SortedKeyIndex()
+        self.index.LOAD = 4
+
+    def test_add_discard_keeps_order(self):
+        keys = list(range(200))
+        random.Random(1).shuffle(keys)
+        for key in keys:
+            self.index.add(key)
+        self.index.add(10)
+        self.assertEqual(list(self.index), list(range(200)))
+        for key in range(0, 200, 2):
+            self.assertTrue(self.index.discard(key))
+        self.assertFalse(self.index.discard(0))
+        self.assertEqual(list(self.index), list(range(1, 200, 2)))
+        self.assertEqual(len(self.index), 100)
+        self.assertIn(51, self.index)
+        self.assertNotIn(50, self.index)
+
+    def test_iter_from_key_and_offset(self):
+        for key in range(0, 100, 5):
+            self.index.add(key)
+        self.assertEqual(list(self.index.iter_from(50))[:2], [50, 55])
+        self.assertEqual(list(self.index.iter_from(50, inclusive=False))[:2], [55, 60])
+        self.assertEqual(list(self.index.iter_from(52))[:1], [55])
+        self.assertEqual(list(self.index.iter_from(offset=17)), [85, 90, 95])
+        self.assertEqual(list(self.index.iter_from(50, offset=9)), [95])
+        self.assertEqual(list(self.index.iter_from(96)), [])
+
+    def test_iter_prefix(self):
+        for key in [("garcia", "1"), ("garcia", "2"), ("garrido", "3"), ("gomez", "4"), ("ga", "5")]:
+            self.index.add(key)
+        self.assertEqual([dni for _, dni in self.index.iter_prefix("gar")], ["1", "2", "3"])
+        self.assertEqual(len(list(self.index.iter_prefix("g"))), 5)
+        self.assertEqual(list(self.index.iter_prefix("h")), [])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,176 @@
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from adapters.controllers import UserController, make_server
+from adapters.repositories import FileUserRepository
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+class TestUserController(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repository = FileUserRepository(os.path.join(self.temp_dir.name, 'users.json'), journal=True)
+        self.controller = UserController(self.repository)
+
+    def tearDown(self):
+        self.repository.close()
+        self.temp_dir.cleanup()
+
+    def request(self, method, path, body=None, query=None):
+        data = b'' if body is None else json.dumps(body).encode('utf-8')
+        status, payload = self.controller.handle(method, path, query or {}, data)
+        return status, json.loads(payload) if payload else None
+
+    def test_crud_endpoints(self):
+        status, user = self.request('POST', '/users', {'username': 'Ana', 'lastname': 'García', 'dni': '12345678Z'})
+        self.assertEqual((status, user['dni']), (201, '12345678Z'))
+        self.assertEqual(self.request('GET', '/users/12345678Z')[1]['lastname'], 'García')
+        status, user = self.request('PUT', '/users/12345678Z', {'username': 'Ana María', 'lastname': 'García'})
+        self.assertEqual((status, user['username']), (200, 'Ana María'))
+        self.assertEqual(self.request('DELETE', '/users/12345678Z'), (204, None))
+        self.assertEqual(self.request('GET', '/users/12345678Z')[0], 404)
+
+    def test_list_with_paging(self):
+        self.request('POST', '/users/bulk', [{'username': 'Ana', 'lastname': 'García', 'dni': '12345678Z'},
+                                            {'username': 'Luis', 'lastname': 'Martín', 'dni': '87654321X'}])
+        status, page = self.request('GET', '/users', query={'limit': '1'})
+        self.assertEqual(status, 200)
+        self.assertEqual([u['dni'] for u in page['users']], ['12345678Z'])
+        self.assertEqual(page['next_cursor'], '12345678Z')
+
+    def test_errors(self):
+        self.assertEqual(self.request('POST', '/users', {'username': 'Ana', 'lastname': 'García',
+                                                         'dni': '12345678A'})[0], 422)
+        self.assertEqual(self.request('POST', '/users', {'username': 'Ana'})[0], 422)
+        self.assertEqual(self.controller.handle('POST', '/users', {}, b'{no json')[0], 400)
+        self.assertEqual(self.request('PUT', '/users/12345678Z', {'username': 'Ana', 'lastname': 'García'})[0], 404)
+        self.assertEqual(self.request('GET', '/users', query={'limit': '0'})[0], 400)
+        self.assertEqual(self.request('PATCH', '/users/12345678Z')[0], 405)
+        self.assertEqual(self.request('GET', '/groups')[0], 404)
+
+    def test_bulk_reports_row_errors(self):
+        status, result = self.request('POST', '/users/bulk', [
+            {'username': 'Ana', 'lastname': 'García', 'dni': '12345678Z'},
+            {'username': 'Luis', 'lastname': 'Martín', 'dni': '87654321A'},
+        ])
+        self.assertEqual(status, 200)
+        self.assertEqual(result['created'], 1)
+        self.assertEqual([error['row'] for error in result['errors']], [1])
+
+    def test_unexpected_repository_error_returns_json_500(self):
+        def fail(dni):
+            raise OSError("disco lleno")
+        self.repository.get = fail
+        with self.assertLogs('adapters.controllers.user_controller', 'ERROR'):
+            status, payload = self.request('GET', '/users/12345678Z')
+        self.assertEqual(status, 500)
+        self.assertIn('error', payload)
+
+    def test_concurrent_creates_are_batched(self):
+        controller = UserController(self.repository, batch_creates=True)
+        calls = []
+        save_many = self.repository.save_many
+        self.repository.save_many = lambda users: calls.append(len(users)) or save_many(users)
+        dnis = [f"{n:08d}{'TRWAGMYFPDXBNJZSQVHLCKE'[n % 23]}" for n in range(40)]
+        threads = [threading.Thread(target=controller.handle, args=(
+            'POST', '/users', {}, json.dumps({'username': 'U', 'lastname': 'L', 'dni': dni}).encode()))
+            for dni in dnis]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sum(calls), 40)
+        self.assertEqual(len(self.repository.list()), 40)
+
+
+class TestHttpServer(unittest.TestCase):
+    def test_keep_alive_roundtrip(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            repository = FileUserRepository(os.path.join(temp_dir, 'users.json'))
+            server = make_server(UserController(repository), port=0)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            connection = http.client.HTTPConnection(*server.server_address)
+            connection.request('POST', '/users', json.dumps({'username': 'Ana', 'lastname': 'García',
+                                                             'dni': '12345678Z'}))
+            created = connection.getresponse()
+            created.read()
+            # Segunda petición por la misma conexión
+            connection.request('GET', '/users/12345678Z')
+            found = connection.getresponse()
+            body = json.loads(found.read())
+            connection.close()
+            server.shutdown()
+            server.server_close()
+        self.assertEqual(created.status, 201)
+        self.assertEqual(found.status, 200)
+        self.assertEqual(body['username'], 'Ana')
+
+    def test_malformed_content_length_returns_json_400(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            repository = FileUserRepository(os.path.join(temp_dir, 'users.json'))
+            server = make_server(UserController(repository), port=0)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            connection = http.client.HTTPConnection(*server.server_address)
+            connection.putrequest('POST', '/users')
+            connection.putheader('Content-Length', 'abc')
+            connection.endheaders()
+            response = connection.getresponse()
+            body = json.loads(response.read())
+            connection.close()
+            server.shutdown()
+            server.server_close()
+        self.assertEqual(response.status, 400)
+        self.assertIn('Content-Length', body['error'])
+
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "El modo pre-fork requiere os.fork")
+    def test_sigterm_closes_worker_repositories(self):
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            port = probe.getsockname()[1]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'users.json')
+            # write-behind sin volcado periódico: el alta solo llega al disco si el worker cierra el repositorio
+            code = ("from adapters.controllers import UserController, serve\n"
+                    "from adapters.repositories import FileUserRepository\n"
+                    f"serve(lambda: UserController(FileUserRepository({path!r}, write_behind=True, flush_interval=0)),"
+                    f" port={port}, workers=2)")
+            process = subprocess.Popen([sys.executable, '-c', code], cwd=PROJECT_ROOT)
+            try:
+                deadline = time.monotonic() + 10
+                while True:
+                    try:
+                        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+                        connection.request('POST', '/users', json.dumps({'username': 'Ana', 'lastname': 'García',
+                                                                         'dni': '12345678Z'}))
+                        status = connection.getresponse().status
+                        connection.close()
+                        break
+                    except ConnectionRefusedError:
+                        if time.monotonic() > deadline:
+                            raise
+                        time.sleep(0.05)
+                process.send_signal(signal.SIGTERM)
+                self.assertEqual(process.wait(timeout=10), 0)
+            finally:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+            self.assertEqual(status, 201)
+            self.assertEqual(FileUserRepository(path).get('12345678Z')._username, 'Ana')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
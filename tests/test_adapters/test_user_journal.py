@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+from adapters.repositories.user_journal import UserJournal, delete_record, put_record
+
+
+class TestUserJournal(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'users.json.journal')
+        self.journal = UserJournal(self.path)
+
+    def tearDown(self):
+        self.journal.close()
+        self.temp_dir.cleanup()
+
+    def test_append_and_replay(self):
+        self.journal.append([put_record("Ana", "García", "12345678Z")])
+        self.journal.append([put_record("Luis", "Martín", "87654321X"), delete_record("12345678Z")])
+        self.journal.close()
+        users = {}
+        applied = UserJournal(self.path).replay(users)
+        self.assertEqual(applied, 3)
+        self.assertEqual(list(users), ["87654321X"])
+        self.assertEqual(users["87654321X"]["lastname"], "Martín")
+
+    def test_replay_ignores_torn_tail(self):
+        self.journal.append([put_record("Ana", "García", "12345678Z")])
+        self.journal.close()
+        # Simular una caída a mitad de escritura del último registro
+        with open(self.path, 'a') as file:
+            file.write('{"op": "put", "dni": "8765')
+        users = {}
+        journal = UserJournal(self.path)
+        self.assertEqual(journal.replay(users), 1)
+        # La cola corrupta se recorta y los nuevos registros quedan legibles
+        journal.append([put_record("Luis", "Martín", "87654321X")])
+        journal.close()
+        users = {}
+        self.assertEqual(UserJournal(self.path).replay(users), 2)
+
+    def test_rotate_keeps_pending_records(self):
+        self.journal.append([put_record("Ana", "García", "12345678Z")])
+        self.journal.rotate()
+        self.journal.append([put_record("Luis", "Martín", "87654321X")])
+        self.journal.rotate()
+        self.assertFalse(os.path.exists(self.path))
+        users = {}
+        self.journal.replay(users)
+        self.assertEqual(set(users), {"12345678Z", "87654321X"})
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,75 @@
+import json
+import os
+import tempfile
+import unittest
+import zlib
+from adapters.repositories.user_snapshot import (
+    CorruptSnapshotError, load_snapshot, read_snapshot, write_snapshot
+)
+
+USERS_V1 = {"12345678Z": {"username": "Ana", "lastname": "García", "dni": "12345678Z"}}
+USERS_V2 = {**USERS_V1, "87654321X": {"username": "Luis", "lastname": "Martín", "dni": "87654321X"}}
+
+
+class TestUserSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'users.json')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_write_and_read_roundtrip(self):
+        write_snapshot(self.path, USERS_V1, generation=7)
+        users, generation = read_snapshot(self.path)
+        self.assertEqual(users, USERS_V1)
+        self.assertEqual(generation, 7)
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    def test_object_format_and_v1_header_are_readable(self):
+        write_snapshot(self.path, USERS_V2, generation=3, snapshot_format='object')
+        self.assertEqual(read_snapshot(self.path), (USERS_V2, 3))
+        # Cabecera v1 (cuerpo indentado, sin campo format) del formato anterior
+        body = json.dumps(USERS_V1, indent=4, ensure_ascii=False).encode('utf-8')
+        with open(self.path, 'wb') as file:
+            file.write(b'#users-snapshot v1 gen=5 crc32=%08x size=%d\n' % (zlib.crc32(body), len(body)))
+            file.write(body)
+        self.assertEqual(read_snapshot(self.path), (USERS_V1, 5))
+
+    def test_legacy_json_without_header(self):
+        with open(self.path, 'w') as file:
+            json.dump(USERS_V1, file, indent=4, ensure_ascii=False)
+        self.assertEqual(read_snapshot(self.path), (USERS_V1, 0))
+
+    def test_corrupt_snapshot_falls_back_to_previous_generation(self):
+        write_snapshot(self.path, USERS_V1, generation=1)
+        write_snapshot(self.path, USERS_V2, generation=2)
+        # Simular una escritura rota: se pierde la cola del archivo
+        with open(self.path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.path) - 10)
+        users, generation, recovered_from = load_snapshot(self.path)
+        self.assertEqual(users, USERS_V1)
+        self.assertEqual(generation, 1)
+        self.assertEqual(recovered_from, self.path + '.1')
+
+    def test_bit_flip_is_detected_by_checksum(self):
+        write_snapshot(self.path, USERS_V1, generation=1)
+        with open(self.path, 'rb') as file:
+            data = bytearray(file.read())
+        data[data.index(b'Ana')] = ord('B')
+        with open(self.path, 'wb') as file:
+            file.write(data)
+        with self.assertRaises(CorruptSnapshotError):
+            read_snapshot(self.path)
+
+    def test_all_generations_corrupt_raises(self):
+        with open(self.path, 'w') as file:
+            file.write('{"12345678Z": {"username": "An')
+        with self.assertRaises(CorruptSnapshotError):
+            load_snapshot(self.path)
+
+    def test_missing_snapshot_is_empty_store(self):
+        self.assertEqual(load_snapshot(self.path), ({}, 0, None))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,54 @@
+import unittest
+from entities import generate_valid_dnis, is_valid_dni, validate_dni_batch, validate_dnis
+from entities import dni as dni_module
+
+SAMPLES = ["12345678Z", "12345678z", "12345678A", "", None, 12345678, "1234567²Z", "123456789Z", "ABCDEFGHZ"]
+SAMPLE_REASONS = [0, 0, 4, 2, 1, 1, 3, 2, 3]
+
+class TestDni(unittest.TestCase):
+    def test_valid_dnis(self):
+        self.assertTrue(is_valid_dni("12345678Z"))
+        self.assertTrue(is_valid_dni("12345678z"))
+        self.assertTrue(is_valid_dni("00000000T"))
+
+    def test_invalid_dnis(self):
+        self.assertFalse(is_valid_dni("12345678A"))
+        self.assertFalse(is_valid_dni("1234567Z"))
+        self.assertFalse(is_valid_dni("1234567²Z"))
+        self.assertFalse(is_valid_dni(None))
+
+    def test_validate_batch(self):
+        self.assertEqual(validate_dnis(["12345678Z", "12345678A", "", 12345678, "87654321X"]),
+                         [True, False, False, False, True])
+
+    def test_batch_mask_and_reasons(self):
+        result = validate_dni_batch(SAMPLES, use_numpy=False)
+        self.assertEqual(list(result.reasons), SAMPLE_REASONS)
+        self.assertEqual(list(result.mask), [True, True] + [False] * 7)
+        self.assertEqual(result.valid_count, 2)
+        self.assertEqual(result.reason_counts(), {'valid': 2, 'not_string': 2, 'bad_length': 2,
+                                                  'bad_number': 2, 'bad_letter': 1})
+
+    @unittest.skipIf(dni_module.load_numpy() is None, "NumPy no instalado")
+    def test_batch_numpy_matches_python(self):
+        numpy = dni_module.load_numpy()
+        result = validate_dni_batch(SAMPLES, use_numpy=True)
+        self.assertEqual(result.reasons.tolist(), SAMPLE_REASONS)
+        generated = generate_valid_dnis(1000, seed=5, as_array=True)
+        self.assertEqual(validate_dni_batch(generated).valid_count, 1000)
+        self.assertEqual(validate_dni_batch(generated.astype('S9')).valid_count, 1000)
+        self.assertEqual(validate_dni_batch(numpy.array(['12345678Z', '12345678A'])).mask.tolist(), [True, False])
+
+    def test_generate_valid_dnis(self):
+        sequential = generate_valid_dnis(50, start=99_999_950)
+        self.assertEqual(sequential[0], '99999950' + 'TRWAGMYFPDXBNJZSQVHLCKE'[99_999_950 % 23])
+        self.assertTrue(all(validate_dnis(sequential)))
+        shuffled = generate_valid_dnis(1000, seed=1)
+        self.assertEqual(shuffled, generate_valid_dnis(1000, seed=1))
+        self.assertEqual(len(set(shuffled)), 1000)
+        self.assertTrue(all(validate_dnis(shuffled)))
+        with self.assertRaises(ValueError):
+            generate_valid_dnis(100, start=99_999_950)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -20,5 +20,17 @@ class TestUser(unittest.TestCase):
         with self.assertRaises(ValueError):
             User("Alice", "Smith", "")
 
+    def test_invalid_dni_letter(self):
+        with self.assertRaises(ValueError):
+            User("Alice", "Smith", "12345678A")
+
+    def test_user_has_no_instance_dict(self):
+        user = User("Alice", "Smith", "12345678Z")
+        self.assertFalse(hasattr(user, '__dict__'))
+
+    def test_from_trusted_skips_validation(self):
+        user = User.from_trusted("Alice", "Smith", "12345678Z")
+        self.assertEqual(str(user), "Alice Smith - DNI: 12345678Z")
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,68 @@
+import asyncio
+import unittest
+from typing import Optional
+from use_cases import (AsyncCreateUserUseCase, AsyncDeleteUserUseCase, AsyncFindUserUseCase,
+                       AsyncListUsersUseCase, AsyncSearchUsersUseCase, AsyncUpdateUserUseCase,
+                       AsyncUserRepositoryInterface)
+from entities import User
+
+class InMemoryAsyncUserRepository(AsyncUserRepositoryInterface):
+    def __init__(self):
+        self.users = {}
+
+    async def save(self, user: User) -> User:
+        self.users[user._dni] = user
+        return user
+
+    async def get(self, dni: str) -> Optional[User]:
+        return self.users.get(dni)
+
+    async def delete(self, dni: str) -> None:
+        self.users.pop(dni, None)
+
+    async def list(self, offset: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None,
+                   lastname_prefix: Optional[str] = None, username_contains: Optional[str] = None) -> list:
+        return list(self.users.values())
+
+    async def update(self, dni: str, new_username: str, new_last_name: str) -> Optional[User]:
+        if not self.users.get(dni):
+            return None
+        updated_user = User(new_username, new_last_name, dni)
+        self.users[dni] = updated_user
+        return updated_user
+
+
+class TestAsyncUserUseCases(unittest.TestCase):
+    def setUp(self):
+        self.repository = InMemoryAsyncUserRepository()
+
+    def test_create_find_update_delete(self):
+        async def scenario():
+            await AsyncCreateUserUseCase(self.repository).execute("Ana", "García", "12345678Z")
+            updated = await AsyncUpdateUserUseCase(self.repository).execute("12345678Z", "Ana María", "García")
+            found = await AsyncFindUserUseCase(self.repository).execute("12345678Z")
+            await AsyncDeleteUserUseCase(self.repository).execute("12345678Z")
+            return updated, found, await AsyncListUsersUseCase(self.repository).execute()
+
+        updated, found, remaining = asyncio.run(scenario())
+        self.assertEqual(updated._username, "Ana María")
+        self.assertEqual(found._username, "Ana María")
+        self.assertEqual(remaining, [])
+
+    def test_errors_match_sync_use_cases(self):
+        with self.assertRaises(ValueError):
+            asyncio.run(AsyncCreateUserUseCase(self.repository).execute("Ana", "García", "12345678A"))
+        with self.assertRaises(ValueError):
+            asyncio.run(AsyncFindUserUseCase(self.repository).execute("99999999R"))
+        with self.assertRaises(ValueError):
+            asyncio.run(AsyncDeleteUserUseCase(self.repository).execute("99999999R"))
+        with self.assertRaises(ValueError):
+            asyncio.run(AsyncSearchUsersUseCase(self.repository).execute())
+
+    def test_default_search_ignores_accents(self):
+        asyncio.run(self.repository.save(User("María", "López Fernández", "12345678Z")))
+        users = asyncio.run(AsyncSearchUsersUseCase(self.repository).execute(lastname_prefix="lopez"))
+        self.assertEqual([u._dni for u in users], ["12345678Z"])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,97 @@
+import unittest
+from typing import Optional
+from use_cases import BulkCreateUsersUseCase, UserRepositoryInterface
+from entities import User
+
+class InMemoryUserRepository(UserRepositoryInterface):
+    def __init__(self):
+        self.users = {}
+        self.batches = []
+
+    def save(self, user: User) -> User:
+        self.users[user._dni] = user
+        return user
+
+    def get(self, dni: str) -> User:
+        return self.users.get(dni)
+
+    def delete(self, dni: str) -> None:
+        if dni in self.users:
+            del self.users[dni]
+
+    def list(self) -> list[User]:
+        return list(self.users.values())
+
+    def update(self, dni: str, new_username: str, new_last_name: str) -> Optional[User]:
+        if not self.users.get(dni):
+            return None
+        # Crear nuevo objeto User (inmutabilidad)
+        updated_user = User(new_username, new_last_name, dni)
+        self.users[dni] = updated_user
+        return updated_user
+
+    def save_many(self, users):
+        users = list(users)
+        # Simular un fallo de persistencia en los lotes que contienen a "Fallo"
+        if any(user._username == "Fallo" for user in users):
+            raise IOError("disco lleno")
+        self.batches.append(len(users))
+        for user in users:
+            self.users[user._dni] = user
+        return users
+
+
+class TestBulkCreateUsersUseCase(unittest.TestCase):
+    def setUp(self):
+        self.repository = InMemoryUserRepository()
+        self.use_case = BulkCreateUsersUseCase(self.repository, batch_size=2)
+
+    def test_create_users_in_batches(self):
+        rows = [
+            ("Ana", "García", "12345678Z"),
+            ("Luis", "Martín", "87654321X"),
+            ("John", "Doe", "76826889N"),
+        ]
+        result = self.use_case.execute(rows)
+        self.assertEqual(result.created, 3)
+        self.assertEqual(result.errors, [])
+        self.assertEqual(self.repository.batches, [2, 1])
+
+    def test_invalid_rows_are_reported_without_stopping(self):
+        rows = [
+            ("Ana", "García", "12345678Z"),
+            ("", "Martín", "87654321X"),
+            ("John", "Doe", "12345678A"),
+            ("Ana", "Copia", "12345678Z"),
+            ("John", "Doe", "76826889N"),
+        ]
+        result = self.use_case.execute(rows)
+        self.assertEqual(result.created, 2)
+        self.assertEqual([error.row for error in result.errors], [1, 2, 3])
+        self.assertIsNotNone(self.repository.get("76826889N"))
+
+    def test_failed_batch_is_not_written(self):
+        rows = [
+            ("Ana", "García", "12345678Z"),
+            ("Fallo", "Martín", "87654321X"),
+            ("John", "Doe", "76826889N"),
+        ]
+        result = self.use_case.execute(rows)
+        self.assertEqual(result.created, 1)
+        self.assertEqual([error.row for error in result.errors], [0, 1])
+        self.assertIsNone(self.repository.get("12345678Z"))
+        self.assertIsNotNone(self.repository.get("76826889N"))
+    def test_reject_existing_users(self):
+        self.repository.save(User("Ana", "García", "12345678Z"))
+        use_case = BulkCreateUsersUseCase(self.repository, batch_size=2, reject_existing=True)
+        result = use_case.execute([
+            ("Ana", "Copia", "12345678Z"),
+            ("Luis", "Martín", "87654321X"),
+        ])
+        self.assertEqual(result.created, 1)
+        self.assertEqual([(error.row, error.dni) for error in result.errors], [(0, "12345678Z")])
+        self.assertEqual(self.repository.get("12345678Z")._lastname, "García")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
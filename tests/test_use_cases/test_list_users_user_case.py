@@ -1,6 +1,7 @@
 import unittest
 from typing import Optional
 from use_cases import ListUsersUseCase, UserRepositoryInterface
+from use_cases.user_page import paginate
 from entities import User
 
 class InMemoryUserRepository(UserRepositoryInterface):
@@ -18,8 +19,12 @@ class InMemoryUserRepository(UserRepositoryInterface):
         if dni in self.users:
             del self.users[dni]
 
-    def list(self) -> list[User]:
-        return list(self.users.values())
+    def list(self, offset=0, limit=None, cursor=None, lastname_prefix=None, username_contains=None) -> list[User]:
+        if not (offset or limit is not None or cursor or lastname_prefix or username_contains):
+            return list(self.users.values())
+        users = sorted((u for u in self.users.values() if cursor is None or u._dni > cursor), key=lambda u: u._dni)
+        return paginate(users, lambda u: u, offset, limit, lastname_prefix, username_contains,
+                        lambda u: (u._username, u._lastname, u._dni))
     
     def update(self, dni: str, new_username: str, new_last_name: str) -> Optional[User]:
         if not self.users.get(dni):
@@ -53,5 +58,23 @@ class TestListUsersUseCase(unittest.TestCase):
         # 2. Verificar que la lista está vacía
         self.assertEqual(len(users), 0)
 
+    def test_list_users_paginated_with_cursor(self):
+        for user in [User("Alice", "Smith", "12345678Z"), User("Bob", "Johnson", "87654321X"),
+                     User("Carol", "Smithers", "76826889N")]:
+            self.use_case.repository.save(user)
+        first_page = self.use_case.execute(limit=2)
+        self.assertEqual([u._dni for u in first_page], ["12345678Z", "76826889N"])
+        self.assertEqual(first_page.next_cursor, "76826889N")
+        second_page = self.use_case.execute(limit=2, cursor=first_page.next_cursor)
+        self.assertEqual([u._dni for u in second_page], ["87654321X"])
+        self.assertIsNone(second_page.next_cursor)
+
+    def test_list_users_filtered(self):
+        for user in [User("Alice", "Smith", "12345678Z"), User("Bob", "Johnson", "87654321X"),
+                     User("Carol", "Smithers", "76826889N")]:
+            self.use_case.repository.save(user)
+        users = self.use_case.execute(lastname_prefix="smith", username_contains="AR")
+        self.assertEqual([u._dni for u in users], ["76826889N"])
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
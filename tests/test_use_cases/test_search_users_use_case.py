@@ -0,0 +1,54 @@
+import unittest
+from typing import Optional
+from use_cases import SearchUsersUseCase, UserRepositoryInterface
+from entities import User
+
+class InMemoryUserRepository(UserRepositoryInterface):
+    def __init__(self):
+        self.users = {}
+
+    def save(self, user: User) -> User:
+        self.users[user._dni] = user
+        return user
+
+    def get(self, dni: str) -> User:
+        return self.users.get(dni)
+
+    def delete(self, dni: str) -> None:
+        if dni in self.users:
+            del self.users[dni]
+
+    def list(self) -> list[User]:
+        return list(self.users.values())
+
+    def update(self, dni: str, new_username: str, new_last_name: str) -> Optional[User]:
+        if not self.users.get(dni):
+            return None
+        # Crear nuevo objeto User (inmutabilidad)
+        updated_user = User(new_username, new_last_name, dni)
+        self.users[dni] = updated_user
+        return updated_user
+
+
+class TestSearchUsersUseCase(unittest.TestCase):
+    def setUp(self):
+        self.repository = InMemoryUserRepository()
+        self.use_case = SearchUsersUseCase(self.repository)
+        self.repository.save(User("Agustín", "Estévez Domínguez", "76826889N"))
+        self.repository.save(User("María", "López Fernández", "12345678Z"))
+        self.repository.save(User("Mario", "Esteban", "87654321X"))
+
+    def test_search_by_lastname_prefix_ignores_accents(self):
+        users = self.use_case.execute(lastname_prefix="estev")
+        self.assertEqual([u._dni for u in users], ["76826889N"])
+
+    def test_search_by_both_prefixes(self):
+        users = self.use_case.execute(lastname_prefix="Este", username_prefix="mar")
+        self.assertEqual([u._dni for u in users], ["87654321X"])
+
+    def test_search_without_criteria(self):
+        with self.assertRaises(ValueError):
+            self.use_case.execute()
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -1,16 +1,35 @@
 # Use cases module
-from .user_repository_interface import UserRepositoryInterface
+from .user_repository_interface import ReadOnlyRepositoryError, UserRepositoryInterface
 from .create_user_use_case import CreateUserUseCase
 from .delete_user_use_case import DeleteUserUseCase
 from .find_user_use_case import FindUserUseCase
 from .list_users_use_case import ListUsersUseCase
 from .update_user_use_case import UpdateUserUseCase
+from .search_users_use_case import SearchUsersUseCase
+from .user_page import UserPage
+from .bulk_create_users_use_case import BulkCreateUsersUseCase, BulkCreateResult, BulkRowError
+from .async_user_repository_interface import AsyncUserRepositoryInterface
+from .async_user_use_cases import (AsyncCreateUserUseCase, AsyncDeleteUserUseCase, AsyncFindUserUseCase,
+                                   AsyncListUsersUseCase, AsyncSearchUsersUseCase, AsyncUpdateUserUseCase)
 
 __all__ = [
     'UserRepositoryInterface',
+    'ReadOnlyRepositoryError',
     'CreateUserUseCase',
     'DeleteUserUseCase',
     'FindUserUseCase',
     'ListUsersUseCase',
-    'UpdateUserUseCase'
+    'UpdateUserUseCase',
+    'BulkCreateUsersUseCase',
+    'BulkCreateResult',
+    'BulkRowError',
+    'UserPage',
+    'SearchUsersUseCase',
+    'AsyncUserRepositoryInterface',
+    'AsyncCreateUserUseCase',
+    'AsyncDeleteUserUseCase',
+    'AsyncFindUserUseCase',
+    'AsyncListUsersUseCase',
+    'AsyncSearchUsersUseCase',
+    'AsyncUpdateUserUseCase'
 ]
\ No newline at end of file
@@ -0,0 +1,62 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional
+from entities import User
+from .user_page import normalize_text
+
+class AsyncUserRepositoryInterface(ABC):
+    """Versión asyncio de UserRepositoryInterface: mismas operaciones, corrutinas."""
+
+    @abstractmethod
+    async def save(self, user: User) -> User:
+        pass
+
+    @abstractmethod
+    async def get(self, dni: str) -> Optional[User]:
+        pass
+
+    @abstractmethod
+    async def delete(self, dni: str) -> None:
+        pass
+
+    @abstractmethod
+    async def update(self, dni: str, new_username: str, new_last_name: str) -> Optional[User]:
+        pass
+
+    @abstractmethod
+    async def list(self, offset: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None,
+                   lastname_prefix: Optional[str] = None, username_contains: Optional[str] = None) -> List[User]:
+        pass
+
+    # Operaciones por lotes: por defecto recorren las operaciones individuales
+    async def save_many(self, users: Iterable[User]) -> List[User]:
+        return [await self.save(user) for user in users]
+
+    async def get_many(self, dnis: Iterable[str]) -> Dict[str, User]:
+        found = {}
+        for dni in dnis:
+            user = await self.get(dni)
+            if user:
+                found[dni] = user
+        return found
+
+    async def delete_many(self, dnis: Iterable[str]) -> int:
+        deleted = 0
+        for dni in dnis:
+            if await self.get(dni):
+                await self.delete(dni)
+                deleted += 1
+        return deleted
+
+    async def search(self, lastname_prefix: Optional[str] = None, username_prefix: Optional[str] = None,
+                     limit: Optional[int] = None) -> List[User]:
+        # Búsqueda por prefijo recorriendo list(); los repositorios con índices deben sobrescribirla
+        lastname_prefix = normalize_text(lastname_prefix or '')
+        username_prefix = normalize_text(username_prefix or '')
+        found = []
+        for user in await self.list():
+            if (normalize_text(user._lastname).startswith(lastname_prefix)
+                    and normalize_text(user._username).startswith(username_prefix)):
+                found.append(user)
+                if limit is not None and len(found) >= limit:
+                    break
+        return found
@@ -0,0 +1,74 @@
+from typing import List, Optional
+from entities import User
+from .async_user_repository_interface import AsyncUserRepositoryInterface
+
+# Versiones asyncio de los casos de uso CRUD: misma validación y mismos errores
+# que las síncronas, pero esperando al repositorio en lugar de bloquear el bucle.
+
+
+class AsyncCreateUserUseCase:
+    def __init__(self, repository: AsyncUserRepositoryInterface):
+        self.repository = repository
+
+    async def execute(self, username: str, lastname: str, dni: str) -> User:
+        user = User(username, lastname, dni)
+        return await self.repository.save(user)
+
+
+class AsyncFindUserUseCase:
+    def __init__(self, repository: AsyncUserRepositoryInterface):
+        self.repository = repository
+
+    async def execute(self, dni: str) -> User:
+        user = await self.repository.get(dni)
+        if not user:
+            raise ValueError(f"Usuario con DNI {dni} no encontrado")
+        return user
+
+
+class AsyncListUsersUseCase:
+    def __init__(self, repository: AsyncUserRepositoryInterface):
+        self.repository = repository
+
+    async def execute(self, offset: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None,
+                      lastname_prefix: Optional[str] = None, username_contains: Optional[str] = None) -> List[User]:
+        if not (offset or limit is not None or cursor or lastname_prefix or username_contains):
+            return await self.repository.list()
+        return await self.repository.list(offset=offset, limit=limit, cursor=cursor,
+                                          lastname_prefix=lastname_prefix, username_contains=username_contains)
+
+
+class AsyncUpdateUserUseCase:
+    def __init__(self, user_repository: AsyncUserRepositoryInterface):
+        self.user_repository = user_repository
+
+    async def execute(self, dni: str, new_username: str, new_last_name: str) -> Optional[User]:
+        updated_user = await self.user_repository.update(dni, new_username, new_last_name)
+        if not updated_user:
+            raise ValueError(f"Usuario con DNI {dni} no encontrado para actualizar")
+        return updated_user
+
+
+class AsyncDeleteUserUseCase:
+    def __init__(self, repository: AsyncUserRepositoryInterface):
+        self.repository = repository
+
+    async def execute(self, dni: str) -> None:
+        user = await self.repository.get(dni)
+        if not user:
+            raise ValueError(f"Usuario con DNI {dni} no encontrado para eliminar")
+        await self.repository.delete(dni)
+
+
+class AsyncSearchUsersUseCase:
+    def __init__(self, repository: AsyncUserRepositoryInterface):
+        self.repository = repository
+
+    async def execute(self, lastname_prefix: Optional[str] = None, username_prefix: Optional[str] = None,
+                      limit: Optional[int] = None) -> List[User]:
+        if not lastname_prefix and not username_prefix:
+            raise ValueError("Debe indicarse un prefijo de apellido o de nombre para buscar")
+        if limit is not None and limit <= 0:
+            raise ValueError("El límite debe ser mayor que cero.")
+        return await self.repository.search(lastname_prefix=lastname_prefix, username_prefix=username_prefix,
+                                            limit=limit)
@@ -0,0 +1,116 @@
+from typing import Iterable, List, Optional, Sequence
+from entities import User
+from .user_repository_interface import UserRepositoryInterface
+
+
+# Clases simples y no dataclasses: dataclasses arrastra inspect, re y ast al importar use_cases
+class BulkRowError:
+    __slots__ = ('row', 'dni', 'error')
+
+    def __init__(self, row: int, dni: str, error: str):
+        self.row = row
+        self.dni = dni
+        self.error = error
+
+    def __repr__(self) -> str:
+        return f"BulkRowError(row={self.row!r}, dni={self.dni!r}, error={self.error!r})"
+
+    def __eq__(self, other):
+        if type(other) is not BulkRowError:
+            return NotImplemented
+        return (self.row, self.dni, self.error) == (other.row, other.dni, other.error)
+
+
+class BulkCreateResult:
+    __slots__ = ('created', 'errors')
+
+    def __init__(self, created: int = 0, errors: Optional[List[BulkRowError]] = None):
+        self.created = created
+        self.errors = [] if errors is None else errors
+
+    def __repr__(self) -> str:
+        return f"BulkCreateResult(created={self.created!r}, errors={self.errors!r})"
+
+    def __eq__(self, other):
+        if type(other) is not BulkCreateResult:
+            return NotImplemented
+        return (self.created, self.errors) == (other.created, other.errors)
+
+
+class BulkCreateUsersUseCase:
+    def __init__(self, repository: UserRepositoryInterface, batch_size: int = 1000,
+                 detect_duplicates: bool = True, reject_existing: bool = False):
+        if batch_size <= 0:
+            raise ValueError("El tamaño de lote debe ser mayor que cero.")
+        self.repository = repository
+        self.batch_size = batch_size
+        self.detect_duplicates = detect_duplicates
+        # Con reject_existing las filas cuyo DNI ya está en el repositorio se rechazan
+        # en lugar de sobrescribirlo (una consulta get_many por lote)
+        self.reject_existing = reject_existing
+
+    def execute(self, rows: Iterable[Sequence[str]]) -> BulkCreateResult:
+        # Cada fila es (username, lastname, dni). Los errores de una fila no detienen el lote.
+        result = BulkCreateResult()
+        seen_dnis = set()
+        batch: List[User] = []
+        batch_rows: List[int] = []
+        for index, row in enumerate(rows):
+            user = self._validate(index, row, seen_dnis, result)
+            if user is None:
+                continue
+            batch.append(user)
+            batch_rows.append(index)
+            if len(batch) >= self.batch_size:
+                self._commit(batch, batch_rows, result)
+                batch, batch_rows = [], []
+        if batch:
+            self._commit(batch, batch_rows, result)
+        return result
+
+    def execute_validated(self, users: Sequence[User], rows: Sequence[int],
+                          result: Optional[BulkCreateResult] = None) -> BulkCreateResult:
+        # Usuarios ya validados en otro sitio (p. ej. en procesos de importación en paralelo);
+        # rows es el número de fila de cada uno para los errores de lote
+        result = BulkCreateResult() if result is None else result
+        for start in range(0, len(users), self.batch_size):
+            self._commit(list(users[start:start + self.batch_size]), list(rows[start:start + self.batch_size]),
+                         result)
+        return result
+
+    def _validate(self, index: int, row: Sequence[str], seen_dnis: set, result: BulkCreateResult):
+        dni = row[2] if len(row) > 2 else ''
+        try:
+            user = User(*row)
+        except (TypeError, ValueError) as e:
+            result.errors.append(BulkRowError(index, dni, str(e)))
+            return None
+        if self.detect_duplicates:
+            if dni in seen_dnis:
+                result.errors.append(BulkRowError(index, dni, f"DNI {dni} duplicado en la importación"))
+                return None
+            seen_dnis.add(dni)
+        return user
+
+    def _commit(self, batch: List[User], batch_rows: List[int], result: BulkCreateResult) -> None:
+        if self.reject_existing:
+            existing = self.repository.get_many(user._dni for user in batch)
+            if existing:
+                kept, kept_rows = [], []
+                for index, user in zip(batch_rows, batch):
+                    if user._dni in existing:
+                        result.errors.append(BulkRowError(index, user._dni, f"El DNI {user._dni} ya existe"))
+                    else:
+                        kept.append(user)
+                        kept_rows.append(index)
+                batch, batch_rows = kept, kept_rows
+                if not batch:
+                    return
+        # El lote se confirma como unidad: si falla, ninguna de sus filas queda escrita
+        try:
+            self.repository.save_many(batch)
+        except Exception as e:
+            for index, user in zip(batch_rows, batch):
+                result.errors.append(BulkRowError(index, user._dni, f"Error al guardar el lote: {e}"))
+            return
+        result.created += len(batch)
@@ -7,7 +7,6 @@ class DeleteUserUseCase:
         self.repository = repository
 
     def execute(self, dni: str) -> None:
-        user = self.repository.get(dni)
-        if not user:
+        if not self.repository.exists(dni):
             raise ValueError(f"Usuario con DNI {dni} no encontrado para eliminar")
         self.repository.delete(dni)
\ No newline at end of file
@@ -1,3 +1,4 @@
+from typing import List, Optional
 from entities import User
 from .user_repository_interface import UserRepositoryInterface
 
@@ -5,5 +6,9 @@ class ListUsersUseCase:
     def __init__(self, repository: UserRepositoryInterface):
         self.repository = repository
 
-    def execute(self) -> list[User]:
-        return self.repository.list()
\ No newline at end of file
+    def execute(self, offset: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None,
+                lastname_prefix: Optional[str] = None, username_contains: Optional[str] = None) -> List[User]:
+        if not (offset or limit is not None or cursor or lastname_prefix or username_contains):
+            return self.repository.list()
+        return self.repository.list(offset=offset, limit=limit, cursor=cursor,
+                                    lastname_prefix=lastname_prefix, username_contains=username_contains)
@@ -0,0 +1,16 @@
+from typing import List, Optional
+from entities import User
+from .user_repository_interface import UserRepositoryInterface
+
+class SearchUsersUseCase:
+    def __init__(self, repository: UserRepositoryInterface):
+        self.repository = repository
+
+    def execute(self, lastname_prefix: Optional[str] = None, username_prefix: Optional[str] = None,
+                limit: Optional[int] = None) -> List[User]:
+        if not lastname_prefix and not username_prefix:
+            raise ValueError("Debe indicarse un prefijo de apellido o de nombre para buscar")
+        if limit is not None and limit <= 0:
+            raise ValueError("El límite debe ser mayor que cero.")
+        return self.repository.search(lastname_prefix=lastname_prefix, username_prefix=username_prefix,
+                                      limit=limit)
@@ -0,0 +1,57 @@
+import unicodedata
+from itertools import islice
+from typing import Callable, Iterable, Optional, TypeVar
+from entities import User
+
+T = TypeVar('T')
+
+
+class UserPage(list):
+    """Página de usuarios: es una lista de User con el cursor de la página siguiente.
+
+    next_cursor es el DNI del último usuario de la página, o None si no hay más.
+    """
+
+    def __init__(self, users: Iterable[User] = (), next_cursor: Optional[str] = None):
+        super().__init__(users)
+        self.next_cursor = next_cursor
+
+
+def validate_page_params(offset: int = 0, limit: Optional[int] = None) -> None:
+    if offset < 0:
+        raise ValueError("El offset no puede ser negativo.")
+    if limit is not None and limit <= 0:
+        raise ValueError("El límite debe ser mayor que cero.")
+
+
+def normalize_text(value: str) -> str:
+    # Comparación sin mayúsculas ni acentos: "Estévez" y "estevez" son equivalentes
+    decomposed = unicodedata.normalize('NFKD', value)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def paginate(records: Iterable[T], to_user: Callable[[T], User], offset: int = 0, limit: Optional[int] = None,
+             lastname_prefix: Optional[str] = None, username_contains: Optional[str] = None,
+             fields: Callable[[T], tuple] = lambda record: record) -> UserPage:
+    """Filtra y pagina registros ya ordenados por DNI (y posicionados tras el cursor).
+
+    fields(record) devuelve (username, lastname, dni). Solo se llama a to_user
+    para los registros que forman parte de la página.
+    """
+    validate_page_params(offset, limit)
+    if lastname_prefix or username_contains:
+        lastname_prefix = normalize_text(lastname_prefix or '')
+        username_contains = normalize_text(username_contains or '')
+
+        def matches(record):
+            username, lastname, _ = fields(record)
+            return (normalize_text(lastname).startswith(lastname_prefix)
+                    and username_contains in normalize_text(username))
+
+        records = filter(matches, records)
+    # Se pide un registro de más para saber si existe una página siguiente
+    stop = None if limit is None else offset + limit + 1
+    selected = list(islice(records, offset, stop))
+    has_more = limit is not None and len(selected) > limit
+    users = [to_user(record) for record in (selected[:limit] if has_more else selected)]
+    return UserPage(users, users[-1]._dni if has_more else None)
@@ -1,6 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 from entities import User
+from .user_page import normalize_text
+
+
+class ReadOnlyRepositoryError(PermissionError):
+    """Mutación sobre un repositorio de solo lectura (p. ej. una réplica)."""
+
 
 class UserRepositoryInterface(ABC):
     @abstractmethod
@@ -20,5 +26,55 @@ class UserRepositoryInterface(ABC):
         pass
 
     @abstractmethod
-    def list(self) -> List[User]:
-        pass
\ No newline at end of file
+    def list(self, offset: int = 0, limit: Optional[int] = None, cursor: Optional[str] = None,
+             lastname_prefix: Optional[str] = None, username_contains: Optional[str] = None) -> List[User]:
+        # Sin argumentos devuelve todos los usuarios. Con paginación o filtros
+        # devuelve una UserPage ordenada por DNI: cursor es el DNI tras el que
+        # empieza la página y offset se aplica después del cursor.
+        pass
+
+    # Operaciones por lotes: las implementaciones por defecto recorren las
+    # operaciones individuales; los repositorios que puedan persistir el lote
+    # de una vez (y de forma atómica) deben sobrescribirlas.
+    def save_many(self, users: Iterable[User]) -> List[User]:
+        return [self.save(user) for user in users]
+
+    def get_many(self, dnis: Iterable[str]) -> Dict[str, User]:
+        found = {}
+        for dni in dnis:
+            user = self.get(dni)
+            if user:
+                found[dni] = user
+        return found
+
+    def exists(self, dni: str) -> bool:
+        # Comprobación de existencia sin necesidad de construir el User
+        return self.get(dni) is not None
+
+    def delete_many(self, dnis: Iterable[str]) -> int:
+        deleted = 0
+        for dni in dnis:
+            if self.get(dni):
+                self.delete(dni)
+                deleted += 1
+        return deleted
+
+    def iter_users(self) -> Iterator[User]:
+        # Recorrido perezoso para exportaciones; por defecto delega en list()
+        return iter(self.list())
+
+    def search(self, lastname_prefix: Optional[str] = None, username_prefix: Optional[str] = None,
+               limit: Optional[int] = None) -> List[User]:
+        # Búsqueda por prefijo sin distinguir mayúsculas ni acentos. La versión
+        # por defecto recorre todos los usuarios; los repositorios con índices
+        # secundarios deben sobrescribirla.
+        lastname_prefix = normalize_text(lastname_prefix or '')
+        username_prefix = normalize_text(username_prefix or '')
+        found = []
+        for user in self.iter_users():
+            if (normalize_text(user._lastname).startswith(lastname_prefix)
+                    and normalize_text(user._username).startswith(username_prefix)):
+                found.append(user)
+                if limit is not None and len(found) >= limit:
+                    break
+        return found